@@ -0,0 +1,89 @@
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from jyotisha.panchaanga.spatio_temporal import City, periodical, get_rise_set_ephemeris
+from jyotisha.panchaanga.spatio_temporal.periodical import Panchaanga
+from jyotisha.panchaanga.temporal import time, ComputationSystem
+from jyotisha.panchaanga.temporal.zodiac.timeline import AngaTimeline
+from jyotisha.util import default_if_none
+from sanskrit_data.schema import common
+from timebudget import timebudget
+
+
+class BatchPanchaanga(common.JsonObject):
+  """Panchaangas of many cities over the same period.
+
+  Tithi, nakshatra, yoga and karana boundaries, solar month transitions (sankraanti-s) and new moons don't depend on the location. So these are computed once, in an AngaTimeline shared by the panchaangas of all cities (see Panchaanga and DailyPanchaanga.set_carried_over_attributes) - as are jupiter transits (see ecliptic.get_jupiter_transits) and the sun and moon longitude approximations used in finding sunrise, sunset etc. (see City.get_rise_set_table). Per city, only sunrise, sunset etc., kaala-s, eclipses (whose visibility is local) and festivals are computed.
+
+  Results agree with those of separately computed panchaangas, to the precision of the root finding (boundaries sought over different periods differ in their last bits).
+  """
+  # Month transitions and new moons are sought up to ~37 days before a day and ~32 days after it (see DailyPanchaanga.set_carried_over_attributes).
+  MONTH_LOOKUP_MARGIN_DAYS = 40
+  # Local day starts are within a day of the UTC ones, whichever the timezone.
+  TIMEZONE_MARGIN_DAYS = 1
+
+  def __init__(self, cities, start_date, end_date, computation_system: ComputationSystem = None, num_processes=None):
+    """
+
+    :param cities: City list - self.panchaangas are in the same order.
+    :param start_date: Date or "YYYY-MM-DD" string.
+    :param end_date: Date or "YYYY-MM-DD" string.
+    :param num_processes: If more than 1, panchaangas of different cities are computed in a pool of so many processes.
+    """
+    super(BatchPanchaanga, self).__init__()
+    self.computation_system = default_if_none(computation_system, ComputationSystem.DEFAULT)
+    self.start_date = periodical._get_date(start_date)
+    self.end_date = periodical._get_date(end_date)
+    self._anga_timeline = self._compute_anga_timeline()
+    self._rise_set_ephemeris = self._compute_rise_set_ephemeris()
+    self.panchaangas = self._compute_panchaangas(cities=cities, num_processes=num_processes)
+
+  def _get_padded_period(self):
+    """
+    
+    :return: (jd of the first day, number of days) - of the days computed for each panchaanga, including the padding days (see Panchaanga._set_period and Panchaanga.compute_angas).
+    """
+    jd_first_day = time.utc_gregorian_to_jd(self.start_date) - Panchaanga.PRIOR_PADDING_DAYS
+    jd_last_day = time.utc_gregorian_to_jd(self.end_date) + Panchaanga.POSTERIOR_PADDING_DAYS - 1
+    return (jd_first_day, int(jd_last_day - jd_first_day) + 1)
+
+  @timebudget
+  def _compute_anga_timeline(self):
+    (jd_first_day, num_days) = self._get_padded_period()
+    jd_start = jd_first_day - BatchPanchaanga.MONTH_LOOKUP_MARGIN_DAYS
+    jd_end = jd_first_day + num_days + BatchPanchaanga.MONTH_LOOKUP_MARGIN_DAYS
+    return AngaTimeline(jd_start=jd_start, jd_end=jd_end, ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_types=AngaTimeline.ANGA_TYPES + AngaTimeline.SOLAR_MONTH_ANGA_TYPES)
+
+  @timebudget
+  def _compute_rise_set_ephemeris(self):
+    # Covering the rise-set table of each panchaanga (see Panchaanga._get_rise_set_period and City.get_rise_set_table) - whichever the timezone.
+    (jd_first_day, num_days) = self._get_padded_period()
+    jd_start = Panchaanga._get_rise_set_period(jd_first_day_start=jd_first_day - BatchPanchaanga.TIMEZONE_MARGIN_DAYS, num_days=num_days)["jd_start"]
+    jd_end = Panchaanga._get_rise_set_period(jd_first_day_start=jd_first_day + BatchPanchaanga.TIMEZONE_MARGIN_DAYS, num_days=num_days)["jd_end"]
+    return get_rise_set_ephemeris(jd_start=jd_start - City.RISE_SET_EPHEMERIS_DAYS_BEFORE, jd_end=jd_end + City.RISE_SET_EPHEMERIS_DAYS_AFTER)
+
+  @timebudget
+  def _compute_panchaangas(self, cities, num_processes=None):
+    if num_processes is None or num_processes <= 1:
+      return [Panchaanga(city=city, start_date=self.start_date, end_date=self.end_date, computation_system=self.computation_system, anga_timeline=self._anga_timeline, rise_set_ephemeris=self._rise_set_ephemeris) for city in cities]
+    with ProcessPoolExecutor(max_workers=num_processes) as executor:
+      futures = [periodical._submit_pickled(executor, Panchaanga, city=city, start_date=self.start_date, end_date=self.end_date, computation_system=self.computation_system, anga_timeline=self._anga_timeline, rise_set_ephemeris=self._rise_set_ephemeris) for city in cities]
+      panchaangas = [pickle.loads(future.result()) for future in futures]
+    for panchaanga in panchaangas:
+      panchaanga._anga_timeline = self._anga_timeline
+      panchaanga._rise_set_ephemeris = self._rise_set_ephemeris
+    return panchaangas
+
+  def get_panchaanga(self, city):
+    """
+
+    :param city: City - matched by its name, coordinates and timezone (not just its name, which cities may share).
+    :return: The panchaanga of the city - None if there is none.
+    """
+    city_json = city.to_json_map()
+    return next((panchaanga for panchaanga in self.panchaangas if panchaanga.city.to_json_map() == city_json), None)
+
+
+# Essential for depickling to work.
+common.update_json_class_index(sys.modules[__name__])
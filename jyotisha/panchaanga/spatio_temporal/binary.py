@@ -0,0 +1,307 @@
+"""A compact, versioned binary format for Panchaanga-s - whose daily panchaangas can be loaded lazily (one at a time, as accessed).
+
+Files are uncompressed .npz archives of plain typed arrays (see columns.save_arrays) - no pickle is involved, so loading a file runs no code from it, and files do not depend on module paths. Arrays:
+  - tokens (int32): Records - the panchaanga (less its daily panchaangas) and then each daily panchaanga - each a sequence of tokens (see _RecordEncoder).
+  - floats (float64), ints (int64): The numbers in the records, in order.
+  - token_offsets, float_offsets, int_offsets (int64): Where each record starts in the above (with a final entry for the end).
+The json metadata has the FORMAT_VERSION, the string table (attribute names, class names, festival ids etc.), the anga table and the fingerprint of the festival rules last applied (see Panchaanga.are_festivals_up_to_date).
+
+Only JsonObject-s (of classes looked up by name in common.json_class_index, as with json) and builtin values are stored. Angas, and the city and computation system (shared by all days), are stored as references.
+"""
+import collections
+import collections.abc
+import io
+import numbers
+import zipfile
+
+import numpy
+from sanskrit_data.schema import common
+
+from jyotisha.panchaanga.spatio_temporal import columns
+from jyotisha.panchaanga.temporal.zodiac.angas import Anga
+from jyotisha.util import _make_json_object
+
+FORMAT_NAME = "jyotisha-panchaanga"
+FORMAT_VERSION = 2
+FILE_SUFFIX = ".panchaanga"
+
+# Tokens. Each is followed (in the tokens array) by the tokens noted - and by the values of its contents, if it is a container.
+_NONE = 0
+_TRUE = 1
+_FALSE = 2
+_INT = 3  # Value in the ints array.
+_FLOAT = 4  # Value in the floats array.
+_STR = 5  # String table index.
+_LIST = 6  # Length.
+_TUPLE = 7  # Length.
+_SET = 8  # Length.
+_DICT = 9  # Length - followed by keys and values, alternately.
+_DEFAULT_DICT = 10  # String table index of the default factory name, length - as with _DICT.
+_OBJECT = 11  # String table index of the class name, number of attributes - followed by string table indices of attribute names and values, alternately.
+_ANGA = 12  # Anga table index.
+_SHARED = 13  # Index into _SHARED_OBJECT_NAMES.
+
+_SHARED_OBJECT_NAMES = ("city", "computation_system")
+_DEFAULT_FACTORIES = {"list": list, "set": set}
+
+
+class _RecordEncoder(object):
+  def __init__(self):
+    self.tokens = []
+    self.floats = []
+    self.ints = []
+    self.string_to_id = {}
+    self.anga_to_id = {}
+    self._shared_object_ids = {}
+
+  def set_shared_objects(self, shared_objects):
+    self._shared_object_ids = {id(obj): index for (index, obj) in enumerate(shared_objects)}
+
+  def _get_string_id(self, x):
+    return self.string_to_id.setdefault(x, len(self.string_to_id))
+
+  def encode(self, obj):
+    tokens = self.tokens
+    if obj is None:
+      tokens.append(_NONE)
+    elif obj is True:
+      tokens.append(_TRUE)
+    elif obj is False:
+      tokens.append(_FALSE)
+    elif isinstance(obj, str):
+      tokens.extend((_STR, self._get_string_id(obj)))
+    elif isinstance(obj, numbers.Integral):
+      tokens.append(_INT)
+      self.ints.append(obj)
+    elif isinstance(obj, numbers.Real):
+      tokens.append(_FLOAT)
+      self.floats.append(obj)
+    elif type(obj) is Anga and len(obj.__dict__) == 3:
+      # Only index, anga_type_id and _default_to_none.
+      tokens.extend((_ANGA, self.anga_to_id.setdefault((obj.anga_type_id, obj.index), len(self.anga_to_id))))
+    elif id(obj) in self._shared_object_ids:
+      tokens.extend((_SHARED, self._shared_object_ids[id(obj)]))
+    elif type(obj) in (list, tuple, set, frozenset):
+      tokens.extend((_LIST if type(obj) is list else _TUPLE if type(obj) is tuple else _SET, len(obj)))
+      for item in obj:
+        self.encode(item)
+    elif type(obj) is dict:
+      tokens.extend((_DICT, len(obj)))
+      self._encode_items(obj)
+    elif type(obj) is collections.defaultdict and obj.default_factory in _DEFAULT_FACTORIES.values():
+      tokens.extend((_DEFAULT_DICT, self._get_string_id(obj.default_factory.__name__), len(obj)))
+      self._encode_items(obj)
+    elif isinstance(obj, common.JsonObject):
+      class_name = obj.__class__.__name__
+      if common.json_class_index.get(class_name, None) is not obj.__class__:
+        raise TypeError("Class not in json_class_index", obj.__class__)
+      state = _get_state(obj)
+      tokens.extend((_OBJECT, self._get_string_id(class_name), len(state)))
+      for (key, value) in state.items():
+        tokens.append(self._get_string_id(key))
+        self.encode(value)
+    else:
+      raise TypeError("Can't encode", type(obj))
+
+  def _encode_items(self, obj):
+    for (key, value) in obj.items():
+      self.encode(key)
+      self.encode(value)
+
+
+class _RecordDecoder(object):
+  def __init__(self, tokens, floats, ints, strings, angas, shared_objects, class_index):
+    self._tokens = iter(tokens)
+    self._floats = iter(floats)
+    self._ints = iter(ints)
+    self._strings = strings
+    self._angas = angas
+    self._shared_objects = shared_objects
+    self._class_index = class_index
+
+  def decode(self):
+    tokens = self._tokens
+    token = next(tokens)
+    if token == _STR:
+      return self._strings[next(tokens)]
+    elif token == _FLOAT:
+      return next(self._floats)
+    elif token == _OBJECT:
+      cls = self._class_index[next(tokens)]
+      num_attributes = next(tokens)
+      state = {}
+      for _ in range(num_attributes):
+        key = self._strings[next(tokens)]
+        state[key] = self.decode()
+      return _make_json_object(cls, state)
+    elif token == _NONE:
+      return None
+    elif token == _ANGA:
+      return self._angas[next(tokens)]
+    elif token == _INT:
+      return next(self._ints)
+    elif token == _TRUE:
+      return True
+    elif token == _FALSE:
+      return False
+    elif token == _SHARED:
+      return self._shared_objects[next(tokens)]
+    elif token == _LIST:
+      return [self.decode() for _ in range(next(tokens))]
+    elif token == _TUPLE:
+      return tuple(self.decode() for _ in range(next(tokens)))
+    elif token == _SET:
+      return set(self.decode() for _ in range(next(tokens)))
+    elif token == _DICT:
+      return self._decode_items(obj={})
+    elif token == _DEFAULT_DICT:
+      default_factory = _DEFAULT_FACTORIES[self._strings[next(tokens)]]
+      return self._decode_items(obj=collections.defaultdict(default_factory))
+    else:
+      raise ValueError("Bad token", token)
+
+  def _decode_items(self, obj):
+    for _ in range(next(self._tokens)):
+      key = self.decode()
+      obj[key] = self.decode()
+    return obj
+
+
+def _get_state(obj):
+  # Attributes not serialized in json either are left out (except _default_to_none).
+  return {key: value for (key, value) in obj.__dict__.items() if not key.startswith("_") or key == "_default_to_none"}
+
+
+def dump(panchaanga, f):
+  """Writes the panchaanga to the (binary) file object f."""
+  daily_panchaangas = panchaanga._get_daily_panchaangas()
+  state = _get_state(panchaanga)
+  state.pop("date_str_to_panchaanga", None)
+  encoder = _RecordEncoder()
+  offsets = [(0, 0, 0)]
+
+  def encode_record(obj):
+    encoder.encode(obj)
+    offsets.append((len(encoder.tokens), len(encoder.floats), len(encoder.ints)))
+
+  encode_record(state)
+  encoder.set_shared_objects([getattr(panchaanga, name) for name in _SHARED_OBJECT_NAMES])
+  for dp in daily_panchaangas:
+    encode_record(dp)
+  (token_offsets, float_offsets, int_offsets) = zip(*offsets)
+  arrays = {
+    "tokens": numpy.array(encoder.tokens, dtype=numpy.int32),
+    "floats": numpy.array(encoder.floats, dtype=numpy.float64),
+    "ints": numpy.array(encoder.ints, dtype=numpy.int64),
+    "token_offsets": numpy.array(token_offsets, dtype=numpy.int64),
+    "float_offsets": numpy.array(float_offsets, dtype=numpy.int64),
+    "int_offsets": numpy.array(int_offsets, dtype=numpy.int64),
+  }
+  metadata = {
+    "format": FORMAT_NAME,
+    "format_version": FORMAT_VERSION,
+    "panchaanga_version": panchaanga.version,
+    "festival_rules_fingerprint": panchaanga._festival_rules_fingerprint,
+    "day_ordinal_start": panchaanga._day_ordinal_start,
+    "strings": sorted(encoder.string_to_id.keys(), key=lambda x: encoder.string_to_id[x]),
+    "angas": sorted(encoder.anga_to_id.keys(), key=lambda x: encoder.anga_to_id[x]),
+  }
+  columns.save_arrays(file=f, metadata=metadata, arrays=arrays)
+
+
+def read(data):
+  """
+
+  :param data: The contents (bytes) of a file written by dump.
+  :return: (metadata, arrays) - see the module docstring.
+  """
+  try:
+    (metadata, arrays) = columns.load_arrays(file=io.BytesIO(data))
+  except (zipfile.BadZipFile, KeyError, EOFError) as e:
+    raise ValueError("Not a binary panchaanga file", e)
+  if not isinstance(metadata, dict) or metadata.get("format", None) != FORMAT_NAME:
+    raise ValueError("Not a binary panchaanga file")
+  if metadata.get("format_version", None) != FORMAT_VERSION:
+    raise ValueError("Unsupported binary panchaanga format version", metadata.get("format_version", None))
+  return (metadata, arrays)
+
+
+def load(panchaanga_class, data, lazy=True):
+  """
+
+  :param panchaanga_class: periodical.Panchaanga - passed to avoid a circular import.
+  :param data: The contents (bytes) of a file written by dump.
+  :param lazy: If True, daily panchaangas are decoded only as accessed (see LazyDailyPanchaangas).
+  """
+  (metadata, arrays) = read(data)
+  records = _Records(metadata=metadata, arrays=arrays)
+  panchaanga = _make_json_object(panchaanga_class, records.decode(index=0, shared_objects=()))
+  daily_panchaangas = LazyDailyPanchaangas(records=records, shared_objects=[getattr(panchaanga, name) for name in _SHARED_OBJECT_NAMES])
+  if not lazy:
+    daily_panchaangas = list(daily_panchaangas)
+  panchaanga._set_loaded_daily_panchaangas(daily_panchaangas=daily_panchaangas, day_ordinal_start=metadata["day_ordinal_start"])
+  panchaanga._festival_rules_fingerprint = metadata.get("festival_rules_fingerprint", None)
+  return panchaanga
+
+
+class _Records(object):
+  """The records of a file written by dump - each decoded on request."""
+
+  def __init__(self, metadata, arrays):
+    self.strings = metadata["strings"]
+    self.angas = [Anga.get_cached(index=index, anga_type_id=anga_type_id) for (anga_type_id, index) in metadata["angas"]]
+    self.arrays = arrays
+    class_index = {}
+    for (string_id, name) in enumerate(self.strings):
+      cls = common.json_class_index.get(name, None)
+      if isinstance(cls, type) and issubclass(cls, common.JsonObject):
+        class_index[string_id] = cls
+    self.class_index = class_index
+
+  def __len__(self):
+    return len(self.arrays["token_offsets"]) - 1
+
+  def decode(self, index, shared_objects):
+    def get_slice(name):
+      offsets = self.arrays[name[:-1] + "_offsets"]
+      return self.arrays[name][offsets[index]: offsets[index + 1]].tolist()
+
+    decoder = _RecordDecoder(tokens=get_slice("tokens"), floats=get_slice("floats"), ints=get_slice("ints"), strings=self.strings, angas=self.angas, shared_objects=shared_objects, class_index=self.class_index)
+    try:
+      return decoder.decode()
+    except (KeyError, IndexError, StopIteration) as e:
+      raise ValueError("Corrupt binary panchaanga record", index, e)
+
+
+class LazyDailyPanchaangas(collections.abc.Sequence):
+  """A read-only sequence of daily panchaangas (or None-s for missing days), each decoded on first access."""
+
+  def __init__(self, records, shared_objects):
+    """
+
+    :param records: The _Records of the file - with the panchaanga at index 0, followed by the days.
+    :param shared_objects: The objects (city and computation system) referred to by _SHARED tokens.
+    """
+    self._records = records
+    self._shared_objects = shared_objects
+    self._index_to_daily_panchaanga = {}
+
+  def __len__(self):
+    return len(self._records) - 1
+
+  def __getitem__(self, index):
+    if isinstance(index, slice):
+      return [self[i] for i in range(*index.indices(len(self)))]
+    index = range(len(self))[index]
+    if index not in self._index_to_daily_panchaanga:
+      self._index_to_daily_panchaanga[index] = self._records.decode(index=index + 1, shared_objects=self._shared_objects)
+    return self._index_to_daily_panchaanga[index]
+
+  def __add__(self, other):
+    return list(self) + list(other)
+
+  def __radd__(self, other):
+    return list(other) + list(self)
+
+  def get_num_loaded(self):
+    return len(self._index_to_daily_panchaanga)
@@ -0,0 +1,312 @@
+import contextlib
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+
+import methodtools
+
+try:
+  import fcntl
+except ImportError:
+  # Not on windows - where LocalDirectoryBackend.lock does not lock.
+  fcntl = None
+
+from jyotisha.panchaanga.spatio_temporal import binary
+from jyotisha.panchaanga.spatio_temporal.periodical import Panchaanga
+from jyotisha.panchaanga.temporal import ComputationSystem
+from jyotisha.util import default_if_none
+
+
+class CacheEntry(object):
+  def __init__(self, key, size, last_access_time):
+    self.key = key
+    self.size = size
+    self.last_access_time = last_access_time
+
+
+class CacheBackend(object):
+  """Storage for a PanchaangaCache - of bytes, by key."""
+
+  def get(self, key):
+    """
+
+    :return: The stored bytes (marking the entry as accessed), or None if there are none.
+    """
+    raise NotImplementedError()
+
+  def put(self, key, data):
+    raise NotImplementedError()
+
+  def delete(self, key):
+    raise NotImplementedError()
+
+  def get_entries(self):
+    """
+
+    :return: CacheEntry-s for all stored keys.
+    """
+    raise NotImplementedError()
+
+  def lock(self, key):
+    """
+
+    :return: A context manager holding an exclusive lock on key (across processes sharing the storage) - by default, none.
+    """
+    return contextlib.nullcontext()
+
+  def sweep(self):
+    """Deletes leftovers - of interrupted puts and the like - other than entries. By default, there are none."""
+    pass
+
+
+class LocalDirectoryBackend(CacheBackend):
+  """Stores each entry as a file in a directory - the file modification time being the last access time.
+  
+  Files are written to a temporary file and renamed, so that concurrent readers never see partially written ones. Locks are (advisory) locks on files in the locks subdirectory.
+  """
+  TEMP_FILE_SUFFIX = ".tmp"
+  LOCK_FILE_SUFFIX = ".lock"
+  # Temporary files older than this are taken to be left by interrupted puts (see sweep).
+  TEMP_FILE_MAX_AGE_SECONDS = 60 * 60
+
+  def __init__(self, path):
+    self.path = os.path.expanduser(path)
+
+  def _get_file_path(self, key):
+    return os.path.join(self.path, key + binary.FILE_SUFFIX)
+
+  def get(self, key):
+    file_path = self._get_file_path(key=key)
+    try:
+      with open(file_path, "rb") as f:
+        data = f.read()
+    except FileNotFoundError:
+      return None
+    try:
+      self._touch(file_path=file_path)
+    except OSError:
+      # Say, evicted meanwhile by another process, or a read-only directory - costing only LRU precision.
+      logging.debug("Not able to mark %s as accessed.", file_path, exc_info=True)
+    return data
+
+  def _touch(self, file_path):
+    # Explicitly, since modification times set by the file system may be coarser (by milliseconds).
+    now = time.time_ns()
+    os.utime(file_path, ns=(now, now))
+
+  def put(self, key, data):
+    os.makedirs(self.path, exist_ok=True)
+    file_path = self._get_file_path(key=key)
+    (fd, temp_file_path) = tempfile.mkstemp(dir=self.path, prefix=key, suffix=LocalDirectoryBackend.TEMP_FILE_SUFFIX)
+    try:
+      with os.fdopen(fd, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+      self._touch(file_path=temp_file_path)
+      os.replace(temp_file_path, file_path)
+    except BaseException:
+      os.remove(temp_file_path)
+      raise
+
+  def delete(self, key):
+    try:
+      os.remove(self._get_file_path(key=key))
+    except FileNotFoundError:
+      pass
+
+  def get_entries(self):
+    if not os.path.isdir(self.path):
+      return []
+    entries = []
+    for file_name in os.listdir(self.path):
+      if file_name.endswith(binary.FILE_SUFFIX):
+        try:
+          stat = os.stat(os.path.join(self.path, file_name))
+        except FileNotFoundError:
+          # Deleted meanwhile, by another process.
+          continue
+        entries.append(CacheEntry(key=file_name[:-len(binary.FILE_SUFFIX)], size=stat.st_size, last_access_time=stat.st_mtime_ns))
+    return entries
+
+  def _get_lock_file_path(self, key):
+    return os.path.join(self.path, "locks", key + LocalDirectoryBackend.LOCK_FILE_SUFFIX)
+
+  @contextlib.contextmanager
+  def lock(self, key):
+    if fcntl is None:
+      yield
+      return
+    lock_file_path = self._get_lock_file_path(key=key)
+    os.makedirs(os.path.dirname(lock_file_path), exist_ok=True)
+    while True:
+      with open(lock_file_path, "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+          # Else, the lock file was deleted (see sweep) after we opened it - and another process may hold a lock on its replacement.
+          if _is_file_at(f=lock_file, path=lock_file_path):
+            yield
+            return
+        finally:
+          fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+  def sweep(self):
+    """Deletes temporary files older than TEMP_FILE_MAX_AGE_SECONDS, and lock files of keys without entries which no process holds."""
+    if not os.path.isdir(self.path):
+      return
+    min_temp_file_mtime = time.time() - LocalDirectoryBackend.TEMP_FILE_MAX_AGE_SECONDS
+    for file_name in os.listdir(self.path):
+      if file_name.endswith(LocalDirectoryBackend.TEMP_FILE_SUFFIX):
+        try:
+          file_path = os.path.join(self.path, file_name)
+          if os.stat(file_path).st_mtime < min_temp_file_mtime:
+            os.remove(file_path)
+        except FileNotFoundError:
+          # Renamed or deleted meanwhile, by another process.
+          pass
+    lock_dir = os.path.join(self.path, "locks")
+    if fcntl is None or not os.path.isdir(lock_dir):
+      return
+    for file_name in os.listdir(lock_dir):
+      key = file_name[:-len(LocalDirectoryBackend.LOCK_FILE_SUFFIX)]
+      if not file_name.endswith(LocalDirectoryBackend.LOCK_FILE_SUFFIX) or os.path.exists(self._get_file_path(key=key)):
+        continue
+      lock_file_path = self._get_lock_file_path(key=key)
+      with open(lock_file_path, "a") as lock_file:
+        try:
+          fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+          # Held - say, by a process computing the entry.
+          continue
+        try:
+          # Only the holder of the lock on a lock file deletes it - so it can't be replaced meanwhile.
+          if _is_file_at(f=lock_file, path=lock_file_path):
+            os.remove(lock_file_path)
+        finally:
+          fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _is_file_at(f, path):
+  try:
+    return os.path.samestat(os.fstat(f.fileno()), os.stat(path))
+  except FileNotFoundError:
+    return False
+
+
+class PanchaangaCache(object):
+  """Precomputed panchaangas, keyed by a hash of everything they depend on (see get_key) - with the least recently used ones evicted beyond max_size_bytes."""
+  DEFAULT_MAX_SIZE_BYTES = 2 ** 30
+
+  def __init__(self, backend, max_size_bytes=DEFAULT_MAX_SIZE_BYTES):
+    """
+
+    :param backend: A CacheBackend.
+    :param max_size_bytes: None for no limit.
+    """
+    self.backend = backend
+    self.max_size_bytes = max_size_bytes
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+
+  @methodtools.lru_cache(maxsize=None)
+  @classmethod
+  def get_cached(cls, path):
+    """A PanchaangaCache with a LocalDirectoryBackend at path - shared within the process (as are its statistics)."""
+    return PanchaangaCache(backend=LocalDirectoryBackend(path=path))
+
+  @classmethod
+  def get_key(cls, city, period, computation_system: ComputationSystem = None):
+    """
+
+    :param city: City - its name, coordinates and timezone are all part of the key.
+    :param period: A json serializable description of the period - like {"civil_year": 2019}.
+    :return: A hex digest of the city, period, computation system (with options), the panchaanga version and the binary format version. The festival rules fingerprint (see rules.get_rules_fingerprint) is not part of the key - it is stored with each entry instead, so that a rules change only needs festivals to be reassigned (see get_or_compute).
+    """
+    computation_system = default_if_none(computation_system, ComputationSystem.DEFAULT)
+    key_dict = {
+      "city": city.to_json_map(),
+      "period": period,
+      "computation_system": computation_system.to_json_map(),
+      "version": Panchaanga.LATEST_VERSION,
+      "binary_format_version": binary.FORMAT_VERSION,
+    }
+    return hashlib.sha256(json.dumps(key_dict, sort_keys=True).encode("utf-8")).hexdigest()
+
+  def get(self, key, lazy=True):
+    """
+
+    :return: The Panchaanga stored under key, or None. Its festivals may be out of date (see Panchaanga.are_festivals_up_to_date).
+    """
+    panchaanga = self._load(key=key, lazy=lazy)
+    if panchaanga is None:
+      self.misses += 1
+    else:
+      self.hits += 1
+    return panchaanga
+
+  def _load(self, key, lazy=True):
+    data = self.backend.get(key=key)
+    if data is None:
+      return None
+    try:
+      return binary.load(panchaanga_class=Panchaanga, data=data, lazy=lazy)
+    except Exception:
+      # Say, written by an incompatible version, or corrupted - treated as a miss.
+      logging.warning("Deleting unreadable panchaanga cache entry %s.", key, exc_info=True)
+      self.backend.delete(key=key)
+      return None
+
+  def put(self, key, panchaanga):
+    with io.BytesIO() as f:
+      binary.dump(panchaanga=panchaanga, f=f)
+      self.backend.put(key=key, data=f.getvalue())
+    self.evict()
+
+  def get_or_compute(self, key, compute_fn, allow_cached=True):
+    """On a miss, only one process (of those sharing the backend) computes the panchaanga - the others wait for and load its result. Likewise, if the festival rules changed since the stored panchaanga was computed, only its festivals are reassigned (see Panchaanga.update_festival_details), and it is stored again.
+
+    :param compute_fn: Returns the Panchaanga to be stored under key - called on a miss (or if not allow_cached).
+    """
+    panchaanga = self._load(key=key) if allow_cached else None
+    if panchaanga is None or not panchaanga.are_festivals_up_to_date():
+      with self.backend.lock(key=key):
+        # Possibly computed (or updated) by another process meanwhile.
+        panchaanga = self._load(key=key) if allow_cached else None
+        if panchaanga is None:
+          self.misses += 1
+          panchaanga = compute_fn()
+          self._put_if_possible(key=key, panchaanga=panchaanga)
+          return panchaanga
+        elif not panchaanga.are_festivals_up_to_date():
+          panchaanga.update_festival_details()
+          self._put_if_possible(key=key, panchaanga=panchaanga)
+    self.hits += 1
+    return panchaanga
+
+  def _put_if_possible(self, key, panchaanga):
+    try:
+      self.put(key=key, panchaanga=panchaanga)
+    except EnvironmentError:
+      logging.warning("Not able to save to the panchaanga cache.", exc_info=True)
+
+  def evict(self):
+    """Deletes the least recently used entries, till the total size is within max_size_bytes - and any leftovers (see CacheBackend.sweep)."""
+    self.backend.sweep()
+    if self.max_size_bytes is None:
+      return
+    entries = sorted(self.backend.get_entries(), key=lambda entry: entry.last_access_time)
+    total_size = sum(entry.size for entry in entries)
+    for entry in entries:
+      if total_size <= self.max_size_bytes:
+        break
+      self.backend.delete(key=entry.key)
+      total_size -= entry.size
+      self.evictions += 1
+
+  def get_stats(self):
+    return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
@@ -0,0 +1,168 @@
+import json
+import struct
+import zipfile
+
+import numpy
+
+from jyotisha.panchaanga.temporal.interval import Interval
+
+METADATA_KEY = "metadata"
+# Modes of numpy.memmap which leave the file as is - "w+" would overwrite it, and writes in "r+" mode would not update the CRC-32 checksums of the .npz members (breaking later loads).
+MMAP_MODES = ("r", "c")
+
+
+class PanchaangaColumns(object):
+  """Attributes of the daily panchaangas of a Panchaanga (from its start_date to its end_date), as numpy arrays with one entry per day - see Panchaanga.to_columns.
+
+  Suits bulk consumers (analytics over many city-years) - which needn't walk the object graph. Saved as (uncompressed) .npz files, which can be loaded memory-mapped.
+
+  Columns:
+  - year, month, day, weekday
+  - jd_sunrise, jd_sunset, jd_moonrise, jd_moonset (nan where there is none)
+  - tithi_at_sunrise, nakshatra_at_sunrise, yoga_at_sunrise
+  - lunar_month (as in LunarMonthAssigner - x.5 for adhika maasa-s)
+  - solar_month, solar_day (sidereal, at sunset), tropical_month, tropical_day
+  - kaala_jd_starts, kaala_jd_ends - days x len(kaala_names) arrays (see DayLengthBasedPeriods)
+  - festival_day_indices, festival_codes - a (day index, index into festival_ids) pair per festival of a day
+  """
+
+  def __init__(self, metadata, columns):
+    """
+
+    :param metadata: A json serializable dict - with the city, the period and the names of the kaala-s and festivals (see from_panchaanga).
+    :param columns: A dict of column name to numpy array.
+    """
+    self.metadata = metadata
+    self.columns = columns
+
+  def __getitem__(self, name):
+    return self.columns[name]
+
+  def __len__(self):
+    return len(self.columns["jd_sunrise"])
+
+  @classmethod
+  def from_panchaanga(cls, panchaanga):
+    daily_panchaangas = [panchaanga.daily_panchaanga_for_ordinal(day_ordinal=day_ordinal) for day_ordinal in range(panchaanga.start_date.get_ordinal(), panchaanga.end_date.get_ordinal() + 1)]
+    periods = daily_panchaangas[0].day_length_based_periods
+    kaala_names = [name for (name, value) in periods.__dict__.items() if isinstance(value, Interval)]
+    festival_ids = sorted(set(fest_id for dp in daily_panchaangas for fest_id in dp.festival_id_to_instance.keys()))
+    festival_id_to_code = {fest_id: code for (code, fest_id) in enumerate(festival_ids)}
+
+    def _column(values, dtype):
+      return numpy.array([numpy.nan if value is None else value for value in values], dtype=dtype)
+
+    columns = {
+      "year": _column([dp.date.year for dp in daily_panchaangas], numpy.int16),
+      "month": _column([dp.date.month for dp in daily_panchaangas], numpy.int8),
+      "day": _column([dp.date.day for dp in daily_panchaangas], numpy.int8),
+      "weekday": _column([dp.date.get_weekday() for dp in daily_panchaangas], numpy.int8),
+      "jd_sunrise": _column([dp.jd_sunrise for dp in daily_panchaangas], numpy.float64),
+      "jd_sunset": _column([dp.jd_sunset for dp in daily_panchaangas], numpy.float64),
+      "jd_moonrise": _column([dp.jd_moonrise for dp in daily_panchaangas], numpy.float64),
+      "jd_moonset": _column([dp.jd_moonset for dp in daily_panchaangas], numpy.float64),
+      "tithi_at_sunrise": _column([dp.sunrise_day_angas.tithi_at_sunrise.index for dp in daily_panchaangas], numpy.int8),
+      "nakshatra_at_sunrise": _column([dp.sunrise_day_angas.nakshatra_at_sunrise.index for dp in daily_panchaangas], numpy.int8),
+      "yoga_at_sunrise": _column([dp.sunrise_day_angas.yoga_at_sunrise.index for dp in daily_panchaangas], numpy.int8),
+      "lunar_month": _column([None if dp.lunar_month_sunrise is None else dp.lunar_month_sunrise.index for dp in daily_panchaangas], numpy.float32),
+      "solar_month": _column([dp.solar_sidereal_date_sunset.month for dp in daily_panchaangas], numpy.int8),
+      "solar_day": _column([dp.solar_sidereal_date_sunset.day for dp in daily_panchaangas], numpy.int8),
+      "tropical_month": _column([dp.tropical_date_sunset.month for dp in daily_panchaangas], numpy.int8),
+      "tropical_day": _column([dp.tropical_date_sunset.day for dp in daily_panchaangas], numpy.int8),
+      "kaala_jd_starts": numpy.array([[_nan_if_none(getattr(dp.day_length_based_periods, name).jd_start) for name in kaala_names] for dp in daily_panchaangas], dtype=numpy.float64).reshape(len(daily_panchaangas), len(kaala_names)),
+      "kaala_jd_ends": numpy.array([[_nan_if_none(getattr(dp.day_length_based_periods, name).jd_end) for name in kaala_names] for dp in daily_panchaangas], dtype=numpy.float64).reshape(len(daily_panchaangas), len(kaala_names)),
+    }
+    festivals = [(day_index, festival_id_to_code[fest_id]) for (day_index, dp) in enumerate(daily_panchaangas) for fest_id in sorted(dp.festival_id_to_instance.keys())]
+    columns["festival_day_indices"] = numpy.array([day_index for (day_index, _) in festivals], dtype=numpy.int32)
+    columns["festival_codes"] = numpy.array([code for (_, code) in festivals], dtype=numpy.int32)
+
+    metadata = {
+      "city": {"name": panchaanga.city.name, "latitude": panchaanga.city.latitude, "longitude": panchaanga.city.longitude, "timezone": panchaanga.city.timezone},
+      "start_date": panchaanga.start_date.get_date_str(),
+      "end_date": panchaanga.end_date.get_date_str(),
+      "kaala_names": kaala_names,
+      "festival_ids": festival_ids,
+    }
+    return PanchaangaColumns(metadata=metadata, columns=columns)
+
+  def get_kaala(self, name):
+    """
+
+    :return: (jd_starts, jd_ends) arrays of the kaala with the given name (say "raahu").
+    """
+    index = self.metadata["kaala_names"].index(name)
+    return (self.columns["kaala_jd_starts"][:, index], self.columns["kaala_jd_ends"][:, index])
+
+  def get_festival_ids(self, day_index):
+    festival_ids = self.metadata["festival_ids"]
+    festival_day_indices = self.columns["festival_day_indices"]
+    (index_start, index_end) = numpy.searchsorted(festival_day_indices, [day_index, day_index + 1], side="left")
+    return [festival_ids[code] for code in self.columns["festival_codes"][index_start:index_end]]
+
+  def save(self, path):
+    """Saves as an uncompressed .npz file (see load)."""
+    save_arrays(file=path, metadata=self.metadata, arrays=self.columns)
+
+  @classmethod
+  def load(cls, path, mmap_mode=None):
+    """
+
+    :param path: As passed to save (with the .npz suffix).
+    :param mmap_mode: If not None, one of MMAP_MODES - "r" (read-only) or "c" (copy-on-write) - columns are then memory-mapped (in this mode, as in numpy.memmap) from the file rather than read. Writes never reach the file.
+    """
+    (metadata, columns) = load_arrays(file=path, mmap_mode=mmap_mode)
+    return PanchaangaColumns(metadata=metadata, columns=columns)
+
+
+def save_arrays(file, metadata, arrays):
+  """Saves numpy arrays, with json metadata, as an uncompressed .npz file (see load_arrays) - of arrays of plain (non-object) dtypes only, so that no pickle is involved.
+
+  :param file: A path or a (binary) file object.
+  :param metadata: A json serializable dict.
+  :param arrays: A dict of name to numpy array.
+  """
+  numpy.savez(file, **{METADATA_KEY: numpy.array(json.dumps(metadata))}, **arrays)
+
+
+def load_arrays(file, mmap_mode=None):
+  """
+
+  :param file: As passed to save_arrays - a path, if mmap_mode is not None.
+  :param mmap_mode: If not None, one of MMAP_MODES - "r" (read-only) or "c" (copy-on-write) - arrays are then memory-mapped (in this mode, as in numpy.memmap) from the file rather than read. Writes never reach the file.
+  :return: (metadata, arrays) - as passed to save_arrays.
+  """
+  if mmap_mode is not None and mmap_mode not in MMAP_MODES:
+    raise ValueError("Unsupported mmap_mode", mmap_mode)
+  arrays = {}
+  with numpy.load(file, allow_pickle=False) as npz_file:
+    metadata = json.loads(str(npz_file[METADATA_KEY]))
+    array_names = [name for name in npz_file.files if name != METADATA_KEY]
+    if mmap_mode is None:
+      arrays = {name: npz_file[name] for name in array_names}
+  if mmap_mode is not None:
+    # numpy.load does not memory-map .npz files - but members are stored uncompressed by save_arrays.
+    with zipfile.ZipFile(file) as zip_file:
+      arrays = {name: _memmap_npz_member(path=file, zip_info=zip_file.getinfo(name + ".npy"), mmap_mode=mmap_mode) for name in array_names}
+  return (metadata, arrays)
+
+
+def _nan_if_none(x):
+  return numpy.nan if x is None else x
+
+
+def _memmap_npz_member(path, zip_info, mmap_mode):
+  with open(path, "rb") as f:
+    # The local file header is 30 bytes, followed by the file name and an extra field - whose lengths are at bytes 26-29.
+    f.seek(zip_info.header_offset)
+    (name_length, extra_length) = struct.unpack("<HH", f.read(30)[26:30])
+    f.seek(zip_info.header_offset + 30 + name_length + extra_length)
+    version = numpy.lib.format.read_magic(f)
+    if version == (1, 0):
+      (shape, fortran_order, dtype) = numpy.lib.format.read_array_header_1_0(f)
+    else:
+      (shape, fortran_order, dtype) = numpy.lib.format.read_array_header_2_0(f)
+    offset = f.tell()
+  if zip_info.compress_type != zipfile.ZIP_STORED or dtype.hasobject or numpy.prod(shape) == 0:
+    with numpy.load(path, allow_pickle=False) as npz_file:
+      return npz_file[zip_info.filename[:-len(".npy")]]
+  return numpy.memmap(path, dtype=dtype, mode=mmap_mode, offset=offset, shape=shape, order="F" if fortran_order else "C")
@@ -8,7 +8,7 @@ from jyotisha.panchaanga.spatio_temporal import City
 from jyotisha.panchaanga.temporal import interval, time, ComputationSystem, set_constants
 from jyotisha.panchaanga.temporal import zodiac
 from jyotisha.panchaanga.temporal.body import Graha
-from jyotisha.panchaanga.temporal.interval import DayLengthBasedPeriods, Interval
+from jyotisha.panchaanga.temporal.interval import DayLengthBasedPeriods, Interval, AngaSpanIndex
 from jyotisha.panchaanga.temporal.month import LunarMonthAssigner
 from jyotisha.panchaanga.temporal.time import Timezone, Date, BasicDate
 from jyotisha.panchaanga.temporal.zodiac import Ayanamsha, NakshatraDivision, AngaSpanFinder
@@ -28,7 +28,7 @@ set_constants()
 
 
 
-class DayAngas(common.JsonObject):
+class DayAngas(common.JsonObject, AngaSpanIndex):
   def __init__(self):
     super().__init__()
     self.tithis_with_ends = None
@@ -49,56 +49,27 @@ class DayAngas(common.JsonObject):
     elif anga_type == AngaType.YOGA:
       anga_spans = self.yogas_with_ends
     elif anga_type == AngaType.RASHI:
-      anga_spans = self.rashis_with_ends
+      anga_spans = self.raashis_with_ends
     elif anga_type == AngaType.KARANA:
       anga_spans = self.karanas_with_ends
     return anga_spans
 
-  def find_anga_span(self, anga):
-    for anga_span in self.get_angas_with_ends(anga_type=anga.get_type()):
-      if anga_span.anga == anga:
-        return anga_span
-    return None
-
-  def get_anga_spans_in_interval(self, anga_type, interval):
-    """
-
-    Assumptions: interval ends are not None. Anga spans in self could be None.
-    Raison d'etre: efficiency.
-    :param anga_type: 
-    :param interval: 
-    :return: 
-    """
-    all_spans = self.get_angas_with_ends(anga_type=anga_type)
-    spans = []
-    for span in all_spans:
-      if span.jd_end is not None and span.jd_end < interval.jd_start:
-        continue
-      # Does the anga start within the interval?
-      elif span.jd_start is not None and span.jd_start >= interval.jd_start and span.jd_start <= interval.jd_end:
-        spans.append(span)
-      # Does the anga end within the interval?
-      elif span.jd_end is not None and span.jd_end >= interval.jd_start and span.jd_end <= interval.jd_end:
-        spans.append(span)
-      # Does the anga end fully contain the interval?
-      elif (span.jd_start is None or span.jd_start <= interval.jd_start) and (span.jd_end is None or span.jd_end >= interval.jd_end):
-        spans.append(span)
-      elif span.jd_start is not None and span.jd_start > interval.jd_end:
-        break
-    return spans
-
-  def get_anga_at_jd(self, jd, anga_type):
-    anga_spans = self.get_anga_spans_in_interval(anga_type=anga_type, interval=Interval(jd_start=jd, jd_end=jd))
-    for anga_span in anga_spans:
-      return anga_span.anga
-    return None
-
 # This class is not named Panchangam in order to be able to disambiguate from annual.Panchangam in serialized objects.
 class DailyPanchaanga(common.JsonObject):
   """This class enables the construction of a panchaanga.
   
   For comments on matching pre-sunrise festivals with days, see periodic panchaanga.
   """
+  # In lazy mode (see __init__), attributes are computed on first access by these methods - each setting a group of attributes.
+  LAZY_ATTRIBUTE_SETTERS = {
+    "jd_moonrise": "compute_moon_transitions",
+    "jd_moonset": "compute_moon_transitions",
+    "sunrise_day_angas": "set_sunrise_day_angas",
+    "day_length_based_periods": "set_day_length_based_periods",
+    "solar_sidereal_date_sunset": "set_carried_over_attributes",
+    "tropical_date_sunset": "set_carried_over_attributes",
+    "lunar_month_sunrise": "set_carried_over_attributes",
+  }
 
   @classmethod
   def from_city_and_julian_day(cls, city, julian_day, computation_system: ComputationSystem = None):
@@ -106,8 +77,12 @@ class DailyPanchaanga(common.JsonObject):
     return DailyPanchaanga(city=city, date=date, computation_system=computation_system)
 
   def __init__(self, city: City, date: Date, computation_system = None,
-               previous_day_panchaanga=None) -> None:
+               previous_day_panchaanga=None, anga_timeline=None, rise_set_table=None, lazy=False) -> None:
     """Constructor for the panchaanga.
+
+    :param anga_timeline: Optional AngaTimeline (computed with the same ayanaamsha), to slice sunrise_day_angas from (and to look up month transitions from - see set_carried_over_attributes).
+    :param rise_set_table: Optional RiseSetTable for this city (see City.get_rise_set_table), to look up sunrise, sunset etc. (and sunsets since the month start) from.
+    :param lazy: If True, only sunrise and sunset are computed here - the attributes in LAZY_ATTRIBUTE_SETTERS are computed (afresh, without previous_day_panchaanga and anga_timeline) on first access. Suits callers needing only a few of them (say, kaala-s). See materialize.
     """
     super(DailyPanchaanga, self).__init__()
     self.city = city
@@ -136,14 +111,67 @@ class DailyPanchaanga(common.JsonObject):
     self.shraaddha_tithi = []
     self.festival_id_to_instance = {}
 
-    self.compute_sun_moon_transitions(previous_day_panchaanga=previous_day_panchaanga)
-    self.compute_solar_day_sunset(previous_day_panchaanga=previous_day_panchaanga)
-    self.set_tropical_date_sunset(previous_day_panchaanga=previous_day_panchaanga)
+    if lazy:
+      # Left unset, to be computed on first access (see __getattr__).
+      for name in DailyPanchaanga.LAZY_ATTRIBUTE_SETTERS.keys():
+        self.__dict__.pop(name, None)
+      self._pending_lazy_setters = set(DailyPanchaanga.LAZY_ATTRIBUTE_SETTERS.values())
+      self.compute_sun_transitions(previous_day_panchaanga=previous_day_panchaanga, rise_set_table=rise_set_table)
+      return
+
+    self.compute_sun_moon_transitions(previous_day_panchaanga=previous_day_panchaanga, anga_timeline=anga_timeline, rise_set_table=rise_set_table)
+    self.set_day_length_based_periods()
+    self.set_carried_over_attributes(previous_day_panchaanga=previous_day_panchaanga, rise_set_table=rise_set_table, anga_timeline=anga_timeline)
+
+  def __getattr__(self, name):
+    # Only called for attributes not (yet) set - as are the lazily computed ones (see __init__).
+    setter_name = DailyPanchaanga.LAZY_ATTRIBUTE_SETTERS.get(name, None)
+    pending_lazy_setters = self.__dict__.get("_pending_lazy_setters", ())
+    if setter_name is not None and setter_name in pending_lazy_setters:
+      pending_lazy_setters.remove(setter_name)
+      attributes = [attribute for (attribute, setter) in DailyPanchaanga.LAZY_ATTRIBUTE_SETTERS.items() if setter == setter_name]
+      # Set beforehand, so that the setter's own checks (like "if self.sunrise_day_angas is None") don't recurse here.
+      for attribute in attributes:
+        setattr(self, attribute, None)
+      try:
+        getattr(self, setter_name)()
+      except BaseException:
+        # To be retried on the next access.
+        for attribute in attributes:
+          self.__dict__.pop(attribute, None)
+        pending_lazy_setters.add(setter_name)
+        raise
+      return self.__dict__[name]
+    return super(DailyPanchaanga, self).__getattr__(name)
+
+  def materialize(self):
+    """Computes all the attributes yet to be computed in lazy mode (see __init__) - as needed before serialization.
+    
+    :return: self
+    """
+    for name in list(DailyPanchaanga.LAZY_ATTRIBUTE_SETTERS.keys()):
+      getattr(self, name)
+    self.__dict__.pop("_pending_lazy_setters", None)
+    return self
+
+  def to_json_map(self, floating_point_precision=None):
+    self.materialize()
+    return super(DailyPanchaanga, self).to_json_map(floating_point_precision=floating_point_precision)
+
+  def set_day_length_based_periods(self):
     self.day_length_based_periods = DayLengthBasedPeriods(jd_previous_sunset=self.jd_previous_sunset, jd_sunrise=self.jd_sunrise, jd_sunset=self.jd_sunset, jd_next_sunrise=self.jd_next_sunrise, weekday=self.date.get_weekday())
 
+  def set_carried_over_attributes(self, previous_day_panchaanga=None, rise_set_table=None, anga_timeline=None):
+    """Sets the solar and tropical dates at sunset and the lunar month - which are carried over from previous_day_panchaanga where possible (and computed afresh otherwise).
+
+    :param anga_timeline: Optional AngaTimeline (computed with the same ayanaamsha), to look up month transitions (and new moons) from - where it has the relevant spans (see AngaTimeline.SOLAR_MONTH_ANGA_TYPES), rather than root finding afresh.
+    """
+    self.compute_solar_day_sunset(previous_day_panchaanga=previous_day_panchaanga, rise_set_table=rise_set_table, anga_timeline=anga_timeline)
+    self.set_tropical_date_sunset(previous_day_panchaanga=previous_day_panchaanga, rise_set_table=rise_set_table, anga_timeline=anga_timeline)
+
     if self.computation_system.lunar_month_assigner_type is not None:
       lunar_month_assigner = LunarMonthAssigner.get_assigner(computation_system=self.computation_system)
-      self.set_lunar_month_sunrise(month_assigner=lunar_month_assigner, previous_day_panchaanga=previous_day_panchaanga)
+      self.set_lunar_month_sunrise(month_assigner=lunar_month_assigner, previous_day_panchaanga=previous_day_panchaanga, anga_timeline=anga_timeline)
 
   def __repr__(self):
     return "%s %s" % (repr(self.date), repr(self.city))
@@ -151,53 +179,97 @@ class DailyPanchaanga(common.JsonObject):
   def __lt__(self, other):
     return self.date.get_date_str() < self.date.get_date_str()
 
-  def compute_sun_moon_transitions(self, previous_day_panchaanga=None, force_recomputation=False):
+  def _get_angas_in_day(self, anga_type, anga_timeline=None, parent_spans=None):
+    if anga_timeline is not None and anga_timeline.covers(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise):
+      return anga_timeline.get_all_angas_in_period(anga_type=anga_type, jd1=self.jd_sunrise, jd2=self.jd_next_sunrise)
+    if anga_type == zodiac.AngaType.TITHI:
+      # Deliberately passing ASHVINI_STARTING_0 below since it is cheapest. Tithi is independent of ayanAmsha. 
+      ayanaamsha_id = Ayanamsha.ASHVINI_STARTING_0
+    else:
+      ayanaamsha_id = self.computation_system.ayanaamsha_id
+    return AngaSpanFinder.get_cached(ayanaamsha_id=ayanaamsha_id, anga_type=anga_type).get_all_angas_in_period(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise, parent_spans=parent_spans)
+
+  def compute_sun_moon_transitions(self, previous_day_panchaanga=None, force_recomputation=False, anga_timeline=None, rise_set_table=None):
     """
 
     :param previous_day_panchaanga: Panchangam for previous day, to avoid unnecessary calculations. (rise_trans calculations can be time consuming.)
     :param force_recomputation: Boolean indicating if the transitions should be recomputed. (rise_trans calculations can be time consuming.)
+    :param anga_timeline: Optional AngaTimeline, to slice sunrise_day_angas from (rather than computing them afresh).
+    :param rise_set_table: Optional RiseSetTable, to look up rise and set times from (rather than computing them afresh).
     :return:
     """
-    if force_recomputation or self.jd_sunrise is None:
+    self.compute_sun_transitions(previous_day_panchaanga=previous_day_panchaanga, force_recomputation=force_recomputation, rise_set_table=rise_set_table)
+    self.compute_moon_transitions(force_recomputation=force_recomputation, rise_set_table=rise_set_table)
+    if force_recomputation or self.sunrise_day_angas is None:
+      self.set_sunrise_day_angas(anga_timeline=anga_timeline)
+
+  def _get_rise_set_table_day_index(self, rise_set_table=None):
+    day_index = None if rise_set_table is None else rise_set_table.get_day_index(julian_day_start=self.julian_day_start)
+    # The previous day's sunset and the next day's sunrise are needed too.
+    if day_index is not None and 0 < day_index < len(rise_set_table.sunrises) - 1:
+      return day_index
+    return None
+
+  def compute_sun_transitions(self, previous_day_panchaanga=None, force_recomputation=False, rise_set_table=None):
+    """Sets sunrise, sunset, the previous sunset and the next sunrise - see compute_sun_moon_transitions."""
+    day_index = self._get_rise_set_table_day_index(rise_set_table=rise_set_table)
+    if day_index is not None and (force_recomputation or self.jd_sunrise is None):
+      self.jd_sunrise = float(rise_set_table.sunrises[day_index])
+      self.jd_sunset = float(rise_set_table.sunsets[day_index])
+      self.jd_previous_sunset = float(rise_set_table.sunsets[day_index - 1])
+      self.jd_next_sunrise = float(rise_set_table.sunrises[day_index + 1])
+      recompute_rise_set = False
+    else:
+      recompute_rise_set = force_recomputation
+    if recompute_rise_set or self.jd_sunrise is None:
       if previous_day_panchaanga is not None and previous_day_panchaanga.jd_next_sunrise is not None:
         self.jd_sunrise = previous_day_panchaanga.jd_next_sunrise
       else:
         self.jd_sunrise = self.city.get_rising_time(julian_day_start=self.julian_day_start, body=Graha.SUN)
-    if force_recomputation or self.jd_sunset is None:
+    if recompute_rise_set or self.jd_sunset is None:
       self.jd_sunset = self.city.get_setting_time(julian_day_start=self.jd_sunrise, body=Graha.SUN)
-    if force_recomputation or self.jd_previous_sunset is None:
+    if recompute_rise_set or self.jd_previous_sunset is None:
       if previous_day_panchaanga is not None and previous_day_panchaanga.jd_sunset is not None:
         self.jd_previous_sunset = previous_day_panchaanga.jd_sunset
       else:
         self.jd_previous_sunset = self.city.get_setting_time(julian_day_start=self.jd_sunrise - 1,
                                                              body=Graha.SUN)
-    if force_recomputation or self.jd_next_sunrise is None:
+    if recompute_rise_set or self.jd_next_sunrise is None:
       self.jd_next_sunrise = self.city.get_rising_time(julian_day_start=self.jd_sunset, body=Graha.SUN)
     if self.jd_sunset == 0.0:
       logging.error('No sunset was computed!')
       raise (ValueError(
         'No sunset was computed. Perhaps the co-ordinates are beyond the polar circle (most likely a LAT-LONG swap! Please check your inputs.'))
 
-    if force_recomputation or self.jd_moonrise is None:
+  def compute_moon_transitions(self, force_recomputation=False, rise_set_table=None):
+    """Sets moonrise and moonset - see compute_sun_moon_transitions."""
+    day_index = self._get_rise_set_table_day_index(rise_set_table=rise_set_table)
+    if day_index is not None and (force_recomputation or self.jd_moonrise is None):
+      self.jd_moonrise = float(rise_set_table.moonrises[day_index])
+      self.jd_moonset = float(rise_set_table.moonsets[day_index])
+      recompute_rise_set = False
+    else:
+      recompute_rise_set = force_recomputation
+    if recompute_rise_set or self.jd_moonrise is None:
       self.jd_moonrise = self.city.get_rising_time(julian_day_start=self.jd_sunrise, body=Graha.MOON)
-    if force_recomputation or self.jd_moonset is None:
+    if recompute_rise_set or self.jd_moonset is None:
       self.jd_moonset = self.city.get_setting_time(julian_day_start=self.jd_sunrise, body=Graha.MOON)
 
-    if force_recomputation or self.sunrise_day_angas is None:
-      self.sunrise_day_angas = DayAngas()
-      # Deliberately passing ASHVINI_STARTING_0 below since it is cheapest. Tithi is independent of ayanAmsha. 
-      self.sunrise_day_angas.tithis_with_ends = AngaSpanFinder.get_cached(ayanaamsha_id=Ayanamsha.ASHVINI_STARTING_0, anga_type=zodiac.AngaType.TITHI).get_all_angas_in_period(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise)
-      self.sunrise_day_angas.tithi_at_sunrise = self.sunrise_day_angas.tithis_with_ends[0].anga
-      
-      self.sunrise_day_angas.nakshatras_with_ends = AngaSpanFinder.get_cached(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=zodiac.AngaType.NAKSHATRA).get_all_angas_in_period(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise)
-      self.sunrise_day_angas.nakshatra_at_sunrise = self.sunrise_day_angas.nakshatras_with_ends[0].anga
-      
-      self.sunrise_day_angas.yogas_with_ends = AngaSpanFinder.get_cached(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=zodiac.AngaType.YOGA).get_all_angas_in_period(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise)
-      self.sunrise_day_angas.yoga_at_sunrise = self.sunrise_day_angas.yogas_with_ends[0].anga
-      
-      self.sunrise_day_angas.karanas_with_ends = AngaSpanFinder.get_cached(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=zodiac.AngaType.KARANA).get_all_angas_in_period(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise)
-      
-      self.sunrise_day_angas.raashis_with_ends = AngaSpanFinder.get_cached(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=zodiac.AngaType.RASHI).get_all_angas_in_period(jd1=self.jd_sunrise, jd2=self.jd_next_sunrise)
+  def set_sunrise_day_angas(self, anga_timeline=None):
+    """Sets the angas (with ends) of the day from sunrise to the next sunrise - see compute_sun_moon_transitions."""
+    self.sunrise_day_angas = DayAngas()
+    self.sunrise_day_angas.tithis_with_ends = self._get_angas_in_day(anga_type=zodiac.AngaType.TITHI, anga_timeline=anga_timeline)
+    self.sunrise_day_angas.tithi_at_sunrise = self.sunrise_day_angas.tithis_with_ends[0].anga
+    
+    self.sunrise_day_angas.nakshatras_with_ends = self._get_angas_in_day(anga_type=zodiac.AngaType.NAKSHATRA, anga_timeline=anga_timeline)
+    self.sunrise_day_angas.nakshatra_at_sunrise = self.sunrise_day_angas.nakshatras_with_ends[0].anga
+    
+    self.sunrise_day_angas.yogas_with_ends = self._get_angas_in_day(anga_type=zodiac.AngaType.YOGA, anga_timeline=anga_timeline)
+    self.sunrise_day_angas.yoga_at_sunrise = self.sunrise_day_angas.yogas_with_ends[0].anga
+    
+    self.sunrise_day_angas.karanas_with_ends = self._get_angas_in_day(anga_type=zodiac.AngaType.KARANA, anga_timeline=anga_timeline, parent_spans=self.sunrise_day_angas.tithis_with_ends)
+    
+    self.sunrise_day_angas.raashis_with_ends = self._get_angas_in_day(anga_type=zodiac.AngaType.RASHI, anga_timeline=anga_timeline)
 
   def compute_tb_muhuurtas(self):
     """ Computes muhuurta-s according to taittiriiya brAhmaNa.
@@ -230,19 +302,34 @@ class DailyPanchaanga(common.JsonObject):
     interval = self.get_interval(name=name)
     return (self.sunrise_day_angas.get_anga_spans_in_interval(interval=interval, anga_type=anga_type), interval)
 
-  def compute_solar_day_sunset(self, previous_day_panchaanga=None):
+  def _get_sunsets_in_period(self, jd_start, jd_end, rise_set_table=None):
+    sunsets = None
+    if rise_set_table is not None:
+      sunsets = rise_set_table.get_sunsets_in_period(jd_start=jd_start, jd_end=jd_end)
+    if sunsets is None:
+      sunsets = self.city.get_sunsets_in_period(jd_start=jd_start, jd_end=jd_end)
+    return sunsets
+
+  def compute_solar_day_sunset(self, previous_day_panchaanga=None, rise_set_table=None, anga_timeline=None):
     """Compute the solar month and day for a given Julian day at sunset.
+
+    :param rise_set_table: Optional RiseSetTable, to count sunsets since the month start from.
+    :param anga_timeline: Optional AngaTimeline, to look up the month start from (if it has SIDEREAL_MONTH spans).
     """
     # If solar transition happens before the current sunset but after the previous sunset, then that is taken to be solar day 1.
-    self.compute_sun_moon_transitions(previous_day_panchaanga=previous_day_panchaanga)
+    self.compute_sun_transitions(previous_day_panchaanga=previous_day_panchaanga)
     solar_month_sunset = NakshatraDivision(jd=self.jd_sunset, ayanaamsha_id=self.computation_system.ayanaamsha_id).get_anga(
       anga_type=AngaType.SIDEREAL_MONTH)
 
     solar_sidereal_month_end_jd = None
     if previous_day_panchaanga is None or previous_day_panchaanga.solar_sidereal_date_sunset.day > 28 :
-      anga_finder = zodiac.AngaSpanFinder.get_cached(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=AngaType.SIDEREAL_MONTH)
-      solar_month_sunset_span = anga_finder.find(jd1=self.jd_sunset - 32, jd2=self.jd_sunset + 5, target_anga_id=solar_month_sunset)
-      solar_sidereal_month_day_sunset = len(self.city.get_sunsets_in_period(jd_start=solar_month_sunset_span.jd_start, jd_end=self.jd_sunset + 1/48.0))
+      (jd1, jd2) = (self.jd_sunset - 32, self.jd_sunset + 5)
+      if anga_timeline is not None and anga_timeline.covers(jd1=jd1, jd2=jd2, anga_type=AngaType.SIDEREAL_MONTH):
+        solar_month_sunset_span = anga_timeline.find(anga_type=AngaType.SIDEREAL_MONTH, jd1=jd1, jd2=jd2, target_anga=solar_month_sunset)
+      else:
+        anga_finder = zodiac.AngaSpanFinder.get_cached(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type=AngaType.SIDEREAL_MONTH)
+        solar_month_sunset_span = anga_finder.find(jd1=jd1, jd2=jd2, target_anga_id=solar_month_sunset)
+      solar_sidereal_month_day_sunset = len(self._get_sunsets_in_period(jd_start=solar_month_sunset_span.jd_start, jd_end=self.jd_sunset + 1/48.0, rise_set_table=rise_set_table))
       if solar_sidereal_month_day_sunset == 1 and solar_month_sunset_span.jd_start > self.jd_sunrise:
         solar_sidereal_month_end_jd = solar_month_sunset_span.jd_start
       elif solar_sidereal_month_day_sunset == 30 and solar_month_sunset_span.jd_end < self.jd_next_sunrise:
@@ -252,7 +339,7 @@ class DailyPanchaanga(common.JsonObject):
     from jyotisha.panchaanga.temporal import time
     self.solar_sidereal_date_sunset = time.BasicDateWithTransitions(month=solar_month_sunset.index, day=solar_sidereal_month_day_sunset, month_transition=solar_sidereal_month_end_jd)
 
-  def set_tropical_date_sunset(self, previous_day_panchaanga=None):
+  def set_tropical_date_sunset(self, previous_day_panchaanga=None, rise_set_table=None, anga_timeline=None):
     month_transition_jd = None
     if previous_day_panchaanga is not None:
       tropical_date_sunset_day = previous_day_panchaanga.tropical_date_sunset.day + 1
@@ -263,25 +350,29 @@ class DailyPanchaanga(common.JsonObject):
       fractional_month = nd.get_fractional_division_for_body(body=Graha.singleton(Graha.SUN), anga_type=AngaType.RASHI)
       (month_fraction, _) = modf(fractional_month)
       approx_day = month_fraction*30
-      month_transitions = Graha.singleton(Graha.SUN).get_transits(jd_start=self.jd_sunset-approx_day-5, jd_end=self.jd_sunset + 4, anga_type=AngaType.RASHI, ayanaamsha_id=Ayanamsha.ASHVINI_STARTING_0)
+      (jd_start, jd_end) = (self.jd_sunset-approx_day-5, self.jd_sunset + 4)
+      if anga_timeline is not None and anga_timeline.covers(jd1=jd_start, jd2=jd_end, anga_type=AngaType.TROPICAL_MONTH):
+        month_transitions = anga_timeline.get_transits(jd_start=jd_start, jd_end=jd_end, anga_type=AngaType.TROPICAL_MONTH)
+      else:
+        month_transitions = Graha.singleton(Graha.SUN).get_transits(jd_start=jd_start, jd_end=jd_end, anga_type=AngaType.RASHI, ayanaamsha_id=Ayanamsha.ASHVINI_STARTING_0)
       if month_transitions[-1].jd > self.jd_previous_sunset and month_transitions[-1].jd <= self.jd_sunset:
         tropical_date_sunset_day = 1
         tropical_date_sunset_month = month_transitions[-1].value_2
       else:
-        tropical_date_sunset_day = len(self.city.get_sunsets_in_period(jd_start=month_transitions[0].jd, jd_end=self.jd_sunset + 1/48.0))
+        tropical_date_sunset_day = len(self._get_sunsets_in_period(jd_start=month_transitions[0].jd, jd_end=self.jd_sunset + 1/48.0, rise_set_table=rise_set_table))
         tropical_date_sunset_month = month_transitions[0].value_2
     self.tropical_date_sunset = time.BasicDateWithTransitions(month=tropical_date_sunset_month, day=tropical_date_sunset_day, month_transition=month_transition_jd)
 
-  def set_lunar_month_sunrise(self, month_assigner, previous_day_panchaanga=None):
+  def set_lunar_month_sunrise(self, month_assigner, previous_day_panchaanga=None, anga_timeline=None):
     if previous_day_panchaanga is not None:
       span = previous_day_panchaanga.sunrise_day_angas.find_anga_span(Anga.get_cached(anga_type_id=AngaType.TITHI.name, index=1))
       if span is not None or self.sunrise_day_angas.tithi_at_sunrise.index == 1:
-        self.lunar_month_sunrise = month_assigner.get_month_sunrise(daily_panchaanga=self)
+        self.lunar_month_sunrise = month_assigner.get_month_sunrise(daily_panchaanga=self, anga_timeline=anga_timeline)
       else:
         self.lunar_month_sunrise = previous_day_panchaanga.lunar_month_sunrise
     else:
       if  month_assigner is not None:
-        self.lunar_month_sunrise = month_assigner.get_month_sunrise(daily_panchaanga=self)
+        self.lunar_month_sunrise = month_assigner.get_month_sunrise(daily_panchaanga=self, anga_timeline=anga_timeline)
 
   def get_date(self, month_type):
     from jyotisha.panchaanga.temporal.festival.rules import RulesRepo
@@ -290,11 +381,12 @@ class DailyPanchaanga(common.JsonObject):
     elif month_type == RulesRepo.LUNAR_MONTH_DIR:
       return BasicDate(month=self.lunar_month_sunrise.index, day=self.sunrise_day_angas.tithi_at_sunrise.index)
 
-  def get_lagna_data(self, ayanaamsha_id=zodiac.Ayanamsha.CHITRA_AT_180, debug=False):
+  def get_lagna_data(self, ayanaamsha_id=zodiac.Ayanamsha.CHITRA_AT_180, debug=False, lagna_table=None):
     """Returns the lagna data
 
         Args:
           debug
+          lagna_table: Optional LagnaTable (see City.get_lagna_table), to look up the lagna data from
 
         Returns:
           tuples detailing the end time of each lagna, beginning with the one
@@ -306,6 +398,11 @@ class DailyPanchaanga(common.JsonObject):
     self.lagna_data = []
     if getattr(self, "jd_sunrise", None) is None or self.jd_sunrise is None:
       self.compute_sun_moon_transitions()
+    if lagna_table is not None and lagna_table.ayanaamsha_id == ayanaamsha_id:
+      lagna_data = lagna_table.get_lagna_data(jd_sunrise=self.jd_sunrise, jd_next_sunrise=self.jd_next_sunrise)
+      if lagna_data is not None:
+        self.lagna_data = lagna_data
+        return self.lagna_data
     lagna_sunrise = 1 + floor(self.city.get_lagna_float(self.jd_sunrise, ayanaamsha_id=ayanaamsha_id))
 
     lagna_list = [(x + lagna_sunrise - 1) % 12 + 1 for x in range(13)]
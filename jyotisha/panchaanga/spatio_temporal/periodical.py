@@ -1,18 +1,23 @@
 import logging
+import os
+import pickle
 import sys
 from collections import defaultdict
-from typing import Dict
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
+from typing import List
 
-import methodtools
-from jyotisha.panchaanga.spatio_temporal import daily
+from jyotisha.panchaanga.spatio_temporal import daily, binary
 from jyotisha.panchaanga.temporal import time, set_constants, ComputationSystem
-from jyotisha.panchaanga.temporal.festival import FestivalInstance
+from jyotisha.panchaanga.temporal.festival import FestivalInstance, rules
 from jyotisha.panchaanga.temporal.festival.applier import tithi_festival, ecliptic, solar, vaara, rule_repo_based, \
   FestivalAssigner
 from jyotisha.panchaanga.temporal.festival.applier.rule_repo_based import inefficient
 from jyotisha.panchaanga.temporal.time import Date
 from jyotisha.panchaanga.temporal.tithi import TithiAssigner
-from jyotisha.util import default_if_none
+from jyotisha.panchaanga.temporal.zodiac.angas import AngaType, NAME_TO_TYPE
+from jyotisha.panchaanga.temporal.zodiac.timeline import AngaTimeline
+from jyotisha.util import default_if_none, ReadOnlyDict, pickle_dumps
 from sanskrit_data import collection_helper
 from sanskrit_data.schema import common
 from timebudget import timebudget
@@ -29,19 +34,44 @@ class Panchaanga(common.JsonObject):
     Generally, which days is a given festival associated with (esp pre-sunrise events)? We follow the same conventions as the adyatithi repo.
     """
   LATEST_VERSION = "0.0.4"
-
-  def __init__(self, city, start_date, end_date, computation_system: ComputationSystem = None):
+  # Solar months last at most ~32 days.
+  SUNSET_LOOKBACK_DAYS = 35
+  # Days computed before the start date and after the end date (see _set_period).
+  PRIOR_PADDING_DAYS = 2
+  POSTERIOR_PADDING_DAYS = 30
+  # Days around a period whose festivals are reassigned (see _reassign_festivals), for the assignments within to be as in a reassignment of the whole panchaanga.
+  FESTIVAL_CONTEXT_DAYS = 30
+
+  def __init__(self, city, start_date, end_date, computation_system: ComputationSystem = None, num_processes=None, anga_timeline=None, rise_set_ephemeris=None):
     """Constructor for the panchaanga.
+
+    :param num_processes: See compute_angas.
+    :param anga_timeline: Optional AngaTimeline (computed with the computation system's ayanaamsha) to use, where it covers the period - as shared by the panchaangas of many cities (see batch.BatchPanchaanga).
+    :param rise_set_ephemeris: Optional ChebyshevEphemeris for computing sunrise, sunset etc. (see City.get_rise_set_table) - likewise.
         """
     super(Panchaanga, self).__init__()
     self.version = Panchaanga.LATEST_VERSION
     self.city = city
-    self.start_date = Date(*([int(x) for x in start_date.split('-')])) if isinstance(start_date, str) else start_date
-    self.start_date.set_time_to_day_start()
-    self.end_date = Date(*([int(x) for x in end_date.split('-')])) if isinstance(end_date, str) else end_date
-    self.end_date.set_time_to_day_start()
-
     self.computation_system = default_if_none(computation_system, ComputationSystem.DEFAULT)
+    if anga_timeline is not None and anga_timeline.ayanaamsha_id != self.computation_system.ayanaamsha_id:
+      raise ValueError("ayanaamsha mismatch", (anga_timeline.ayanaamsha_id, self.computation_system.ayanaamsha_id))
+    self._anga_timeline = anga_timeline
+    self._rise_set_ephemeris = rise_set_ephemeris
+    self._set_period(start_date=start_date, end_date=end_date)
+
+    self.festival_id_to_days = defaultdict(set, {})
+    self.compute_angas(compute_lagnas=self.computation_system.options.set_lagnas, num_processes=num_processes)
+    if not self.computation_system.options.no_fests:
+      self.update_festival_details()
+
+  def _set_period(self, start_date, end_date):
+    """Sets start_date, end_date and the attributes following from them (jd_start, duration etc.).
+    
+    :param start_date: Date or "YYYY-MM-DD" string.
+    :param end_date: Date or "YYYY-MM-DD" string.
+    """
+    self.start_date = _get_date(start_date)
+    self.end_date = _get_date(end_date)
 
     self.jd_start = time.utc_gregorian_to_jd(self.start_date)
     self.jd_end = time.utc_gregorian_to_jd(self.end_date)
@@ -50,57 +80,253 @@ class Panchaanga(common.JsonObject):
 
     # For accurate festival assignment, we sometimes need panchaanga information about succeeding or preceeding days. 
     # For example, consider a festival to be selebrated during naxatra 27 in solar sideral month 9. If naxatra 27 occurs twice in sidereal_solar_month 9 (gap of 27+ daus), the latter occurence is to be selected - the former day will not get a festival. 
-    self.duration_posterior_padding = int(self.duration + 30)
-    self.duration_prior_padding = 2
+    self.duration_posterior_padding = int(self.duration + Panchaanga.POSTERIOR_PADDING_DAYS)
+    self.duration_prior_padding = Panchaanga.PRIOR_PADDING_DAYS
 
     self.weekday_start = time.get_weekday(self.jd_start)
 
-    self.festival_id_to_days = defaultdict(set, {})
-    self.compute_angas(compute_lagnas=self.computation_system.options.lagnas)
-    if not self.computation_system.options.no_fests:
-      self.update_festival_details()
-
   @timebudget
-  def compute_angas(self, compute_lagnas=True):
+  def compute_angas(self, compute_lagnas=True, num_processes=None):
     """Compute the entire panchaanga
+    
+    :param num_processes: If more than 1, the computation is spread over these many processes (see _compute_daily_panchaangas_in_parallel) - with results identical to those of the serial computation.
     """
 
     nDays = self.duration_posterior_padding
+    dates = time.jds_to_utc_gregorian([self.jd_start + d for d in range(-self.duration_prior_padding, nDays - 1)])
+    daily_panchaangas = self._compute_daily_panchaangas(dates=dates, compute_lagnas=compute_lagnas, num_processes=num_processes)
+    self._set_daily_panchaangas(daily_panchaangas=daily_panchaangas)
 
-    # INITIALISE VARIABLES
-    self.date_str_to_panchaanga: Dict[str, daily.DailyPanchaanga] = {}
+  def _compute_daily_panchaangas(self, dates, compute_lagnas=True, num_processes=None, previous_daily_panchaanga=None):
+    """Computes daily panchaangas for consecutive dates.
+    
+    :param num_processes: See compute_angas.
+    :param previous_daily_panchaanga: The DailyPanchaanga of the day before the first date, if available.
+    """
+    for date_d in dates:
+      date_d.set_time_to_day_start()
+    num_days = len(dates)
+    jd_first_date = time.utc_gregorian_to_jd(dates[0])
+    # Anga boundaries for the whole period are computed in one sweep, and sliced into days. A couple of days of margin on either side suffice to cover the sunrises of the first and last days.
+    anga_timeline_period = dict(jd_start=jd_first_date - 2, jd_end=jd_first_date + num_days + 3)
+    # Likewise for sunrise, sunset etc. - with an extra day on either side (for the previous sunset and next sunrise). The table starts SUNSET_LOOKBACK_DAYS earlier, so that sunsets since the start of the solar month (see DailyPanchaanga.compute_solar_day_sunset) can be counted for the first days too.
+    jd_first_day_start = time.Timezone(self.city.timezone).local_time_to_julian_day(date=dates[0])
+    rise_set_period = Panchaanga._get_rise_set_period(jd_first_day_start=jd_first_day_start, num_days=num_days)
+    lagna_period = None
+    if compute_lagnas:
+      # Lagna ends for all days in one batch, rather than root finding day by day.
+      lagna_period = dict(jd_start=jd_first_day_start - 1, jd_end=jd_first_day_start + num_days + 3)
+
+    anga_timeline = None
+    if self._anga_timeline is not None and self._anga_timeline.covers(jd1=anga_timeline_period["jd_start"], jd2=anga_timeline_period["jd_end"]):
+      anga_timeline = self._anga_timeline
+
+    if num_processes is not None and num_processes > 1:
+      return self._compute_daily_panchaangas_in_parallel(dates=dates, num_processes=num_processes, anga_timeline_period=anga_timeline_period, rise_set_period=rise_set_period, lagna_period=lagna_period, previous_daily_panchaanga=previous_daily_panchaanga, anga_timeline=anga_timeline)
+    else:
+      if anga_timeline is None:
+        anga_timeline = AngaTimeline.get_cached(ayanaamsha_id=self.computation_system.ayanaamsha_id, **anga_timeline_period)
+      self._rise_set_table = self.city.get_rise_set_table(ephemeris=self._rise_set_ephemeris, **rise_set_period)
+      lagna_table = None if lagna_period is None else self.city.get_lagna_table(**lagna_period)
+      return compute_daily_panchaangas(city=self.city, dates=dates, computation_system=self.computation_system, anga_timeline=anga_timeline, rise_set_table=self._rise_set_table, lagna_table=lagna_table, previous_daily_panchaanga=previous_daily_panchaanga)
+
+  @classmethod
+  def _get_rise_set_period(cls, jd_first_day_start, num_days):
+    """The period of the rise-set table for num_days days from jd_first_day_start (see _compute_daily_panchaangas)."""
+    return dict(jd_start=jd_first_day_start - Panchaanga.SUNSET_LOOKBACK_DAYS, jd_end=jd_first_day_start + num_days + 1)
+
+  def _compute_daily_panchaangas_in_parallel(self, dates, num_processes, anga_timeline_period, rise_set_period, lagna_period=None, previous_daily_panchaanga=None, anga_timeline=None):
+    """Computes daily panchaangas for the given dates in a pool of processes.
+    
+    Anga spans are found in one sweep per anga type, each boundary being sought from the previous one - splitting a sweep by period would change boundaries in their last bits. So the sweeps (and the rise-set and lagna tables) are computed in parallel with each other. The days are then computed in chunks, each starting afresh (without the previous day's panchaanga), and stitched - redoing the attributes carried over from the previous day at the start of each chunk, till they agree with what the chunk computed.
 
+    :param anga_timeline: AngaTimeline covering anga_timeline_period, if already available.
+    """
+    with ProcessPoolExecutor(max_workers=num_processes) as executor:
+      anga_span_futures = [] if anga_timeline is not None else [_submit_pickled(executor, _compute_anga_spans, anga_type_names=anga_type_names, ayanaamsha_id=self.computation_system.ayanaamsha_id, **anga_timeline_period) for anga_type_names in [(AngaType.TITHI.name, AngaType.KARANA.name), (AngaType.NAKSHATRA.name,), (AngaType.YOGA.name,), (AngaType.RASHI.name,)]]
+      rise_set_future = _submit_pickled(executor, self.city.get_rise_set_table, ephemeris=self._rise_set_ephemeris, **rise_set_period)
+      lagna_future = None if lagna_period is None else _submit_pickled(executor, self.city.get_lagna_table, **lagna_period)
+      if anga_timeline is None:
+        anga_type_to_spans = {}
+        for future in anga_span_futures:
+          anga_type_to_spans.update(pickle.loads(future.result()))
+        anga_timeline = AngaTimeline(ayanaamsha_id=self.computation_system.ayanaamsha_id, anga_type_to_spans=anga_type_to_spans, **anga_timeline_period)
+      self._rise_set_table = pickle.loads(rise_set_future.result())
+      lagna_table = None if lagna_future is None else pickle.loads(lagna_future.result())
+
+      chunk_size = int(ceil(len(dates) / num_processes))
+      chunk_futures = [_submit_pickled(executor, compute_daily_panchaangas, city=self.city, dates=dates[chunk_start: chunk_start + chunk_size], computation_system=self.computation_system, anga_timeline=anga_timeline, rise_set_table=self._rise_set_table, lagna_table=lagna_table) for chunk_start in range(0, len(dates), chunk_size)]
+      daily_panchaangas = []
+      for future in chunk_futures:
+        chunk_daily_panchaangas = pickle.loads(future.result())
+        for daily_panchaanga in chunk_daily_panchaangas:
+          daily_panchaanga.city = self.city
+          daily_panchaanga.computation_system = self.computation_system
+        if previous_daily_panchaanga is not None:
+          _carry_over_into_chunk(previous_daily_panchaanga=previous_daily_panchaanga, chunk_daily_panchaangas=chunk_daily_panchaangas, rise_set_table=self._rise_set_table, anga_timeline=anga_timeline)
+        daily_panchaangas.extend(chunk_daily_panchaangas)
+        previous_daily_panchaanga = daily_panchaangas[-1]
+    return daily_panchaangas
 
-    #############################################################
-    # Compute all parameters -- sun/moon latitude/longitude etc #
-    #############################################################
+  @timebudget
+  def extend_to(self, end_date, num_processes=None):
+    """Extends this panchaanga till end_date.
+    
+    Only days beyond those already computed (including the posterior padding days) are computed - continuing from the last one. Festivals are reassigned only around the new days (see _reassign_festivals).
+    
+    :param end_date: Date or "YYYY-MM-DD" string - not before the current end_date.
+    :param num_processes: See compute_angas.
+    """
+    old_end_date = self.end_date
+    end_date = _get_date(end_date)
+    if end_date < old_end_date:
+      raise ValueError("Can't extend to an earlier date", (end_date, old_end_date))
+    self._set_period(start_date=self.start_date, end_date=end_date)
+    daily_panchaangas = self._get_daily_panchaangas()
+    last_date = self.start_date + (self.duration_posterior_padding - 2)
+    dates = [daily_panchaangas[-1].date + day_offset for day_offset in range(1, last_date.get_ordinal() - daily_panchaangas[-1].date.get_ordinal() + 1)]
+    if len(dates) > 0:
+      new_daily_panchaangas = self._compute_daily_panchaangas(dates=dates, compute_lagnas=self.computation_system.options.set_lagnas, num_processes=num_processes, previous_daily_panchaanga=daily_panchaangas[-1])
+      self._set_daily_panchaangas(daily_panchaangas=daily_panchaangas + new_daily_panchaangas)
+    if not self.computation_system.options.no_fests and old_end_date < self.end_date:
+      self._reassign_festivals(start_date=old_end_date + 1, end_date=self.end_date)
+
+  @timebudget
+  def extend_from(self, start_date, num_processes=None):
+    """Extends this panchaanga back to start_date.
+    
+    Only days before those already computed (including the prior padding days) are computed. The attributes carried over from one day to the next (see DailyPanchaanga.set_carried_over_attributes) are then redone for the earliest of the existing days. Festivals are reassigned only around the new days (see _reassign_festivals).
+    
+    :param start_date: Date or "YYYY-MM-DD" string - not after the current start_date.
+    :param num_processes: See compute_angas.
+    """
+    old_start_date = self.start_date
+    start_date = _get_date(start_date)
+    if old_start_date < start_date:
+      raise ValueError("Can't extend from a later date", (start_date, old_start_date))
+    self._set_period(start_date=start_date, end_date=self.end_date)
+    daily_panchaangas = self._get_daily_panchaangas()
+    first_date = self.start_date - self.duration_prior_padding
+    dates = [first_date + day_offset for day_offset in range(daily_panchaangas[0].date.get_ordinal() - first_date.get_ordinal())]
+    if len(dates) > 0:
+      new_daily_panchaangas = self._compute_daily_panchaangas(dates=dates, compute_lagnas=self.computation_system.options.set_lagnas, num_processes=num_processes)
+      _carry_over_into_chunk(previous_daily_panchaanga=new_daily_panchaangas[-1], chunk_daily_panchaangas=daily_panchaangas, rise_set_table=self._rise_set_table, anga_timeline=self._anga_timeline)
+      self._set_daily_panchaangas(daily_panchaangas=new_daily_panchaangas + daily_panchaangas)
+    if not self.computation_system.options.no_fests and self.start_date < old_start_date:
+      self._reassign_festivals(start_date=self.start_date, end_date=old_start_date - 1)
+
+  def _reassign_festivals(self, start_date, end_date):
+    """Reassigns festivals (and shraaddha tithis) around the (new) days from start_date to end_date (both inclusive).
+    
+    Assignments of days up to FESTIVAL_CONTEXT_DAYS away from these days may change too (eg. shraaddha tithis are deduplicated within solar months, and days at the edge of the old period were assigned without knowing the days beyond) - so these are reassigned as well, leaving those of other days as they are. Festivals are assigned afresh over a window panchaanga (sharing the daily panchaangas of this one) which extends FESTIVAL_CONTEXT_DAYS further on either side, within this panchaanga's period. Festival numbers are then updated for the whole period.
+    """
+    start_date = max(start_date - Panchaanga.FESTIVAL_CONTEXT_DAYS, self.start_date)
+    end_date = min(end_date + Panchaanga.FESTIVAL_CONTEXT_DAYS, self.end_date)
+    window_start_date = max(start_date - Panchaanga.FESTIVAL_CONTEXT_DAYS, self.start_date)
+    window_end_date = min(end_date + Panchaanga.FESTIVAL_CONTEXT_DAYS, self.end_date)
+    window = Panchaanga.__new__(Panchaanga)
+    window.__dict__.update(self.__dict__)
+    window._set_period(start_date=window_start_date, end_date=window_end_date)
+    first_index = window.start_date.get_ordinal() - window.duration_prior_padding - self._day_ordinal_start
+    window._set_daily_panchaangas(daily_panchaangas=self._get_daily_panchaangas()[first_index: first_index + window.duration_prior_padding + window.duration_posterior_padding - 1])
+
+    (start_ordinal, end_ordinal) = (start_date.get_ordinal(), end_date.get_ordinal())
+    window_daily_panchaangas = window.daily_panchaangas_sorted()
+    day_to_festivals = [(dp.festival_id_to_instance, dp.shraaddha_tithi) for dp in window_daily_panchaangas]
+    # As in a freshly computed panchaanga (shraaddha tithis are otherwise added to those already assigned).
+    for daily_panchaanga in window_daily_panchaangas:
+      daily_panchaanga.shraaddha_tithi = []
+    window.update_festival_details()
+    for (daily_panchaanga, (festival_id_to_instance, shraaddha_tithi)) in zip(window_daily_panchaangas, day_to_festivals):
+      if not start_ordinal <= daily_panchaanga.date.get_ordinal() <= end_ordinal:
+        daily_panchaanga.festival_id_to_instance = festival_id_to_instance
+        daily_panchaanga.shraaddha_tithi = shraaddha_tithi
+
+    for days in self.festival_id_to_days.values():
+      for day in [day for day in days if start_ordinal <= day.get_ordinal() <= end_ordinal]:
+        days.discard(day)
+    for (festival_id, days) in window.festival_id_to_days.items():
+      days = [day for day in days if start_ordinal <= day.get_ordinal() <= end_ordinal]
+      if len(days) > 0:
+        self.festival_id_to_days.setdefault(festival_id, set()).update(days)
+    FestivalAssigner(panchaanga=self).assign_festival_numbers()
+
+  def _set_daily_panchaangas(self, daily_panchaangas):
+    """Stores consecutive daily panchaangas in an array, indexed by the day offset from the first one.
+    
+    date_str_to_panchaanga (which is what gets serialized) is rebuilt as a read-only view of the same.
+    
+    :param daily_panchaangas: DailyPanchaanga-s (or None-s for missing days) for consecutive dates.
+    """
+    self._daily_panchaangas: List[daily.DailyPanchaanga] = list(daily_panchaangas)
+    self._day_ordinal_start = None if len(daily_panchaangas) == 0 else daily_panchaangas[0].date.get_ordinal()
+    self.date_str_to_panchaanga = ReadOnlyDict((dp.date.get_date_str(), dp) for dp in self._daily_panchaangas if dp is not None)
+
+  def _set_loaded_daily_panchaangas(self, daily_panchaangas, day_ordinal_start):
+    """Sets daily panchaangas as loaded from a binary file (see binary.load).
+    
+    :param daily_panchaangas: A list, or a binary.LazyDailyPanchaangas - in which case date_str_to_panchaanga is set only once all days are loaded (see _materialize_daily_panchaangas).
+    """
+    if isinstance(daily_panchaangas, list):
+      self._set_daily_panchaangas(daily_panchaangas=daily_panchaangas)
+    else:
+      self._daily_panchaangas = daily_panchaangas
+      self._day_ordinal_start = day_ordinal_start
+
+  def _materialize_daily_panchaangas(self):
+    if self.date_str_to_panchaanga is None and self._daily_panchaangas is not None:
+      self._set_daily_panchaangas(daily_panchaangas=self._daily_panchaangas)
+
+  def _get_daily_panchaangas(self):
+    if self._daily_panchaangas is None:
+      # Objects deserialized from json (see post_load_ops) carry only date_str_to_panchaanga - as do deep copies, which JsonObject.__deepcopy__ makes by a json round trip. Pickles (see util.pickle_dumps) carry _daily_panchaangas too.
+      daily_panchaangas = sorted(self.date_str_to_panchaanga.values(), key=lambda dp: dp.date.get_ordinal())
+      if len(daily_panchaangas) > 0:
+        day_ordinal_start = daily_panchaangas[0].date.get_ordinal()
+        padded_daily_panchaangas = [None] * (daily_panchaangas[-1].date.get_ordinal() - day_ordinal_start + 1)
+        for dp in daily_panchaangas:
+          padded_daily_panchaangas[dp.date.get_ordinal() - day_ordinal_start] = dp
+        daily_panchaangas = padded_daily_panchaangas
+      self._set_daily_panchaangas(daily_panchaangas=daily_panchaangas)
+    return self._daily_panchaangas
 
-    for d in range(-self.duration_prior_padding, nDays - 1):
-      # TODO: Eventually, we are shifting to an array of daily panchangas. Reason: Better modularity.
-      # The below block is temporary code to make the transition seamless.
-      date_d = time.jd_to_utc_gregorian(self.jd_start + d)
-      date_d.set_time_to_day_start()
-      previous_daily_panchaanga = self.date_str_to_panchaanga.get(date_d.offset_date(days=-1).get_date_str(), None)
-      daily_panchaanga = daily.DailyPanchaanga(city=self.city, date=date_d,
-                                               computation_system=self.computation_system,
-                                               previous_day_panchaanga=previous_daily_panchaanga)
-      if compute_lagnas:
-        daily_panchaanga.get_lagna_data()
-      self.date_str_to_panchaanga[date_d.get_date_str()] = daily_panchaanga
-
-  @methodtools.lru_cache(maxsize=10)
   def daily_panchaangas_sorted(self):
-    return sorted(self.date_str_to_panchaanga.values())
+    """All daily panchaangas, in date order (including the padding days)."""
+    return [dp for dp in self._get_daily_panchaangas() if dp is not None]
 
   def daily_panchaanga_for_jd(self, jd):
-    date = self.city.timezone.julian_day_to_local_time(julian_day=jd)
+    date = time.Timezone(self.city.timezone).julian_day_to_local_time(julian_day=jd)
     return self.daily_panchaanga_for_date(date=date)
 
   def daily_panchaanga_for_date(self, date):
-    from copy import deepcopy
-    date_alt = deepcopy(date)
-    date_alt.set_time_to_day_start()
-    return self.date_str_to_panchaanga.get(date_alt.get_date_str(), None)
+    """
+    
+    :param date: A Date - the time of the day, if any, is ignored.
+    :return: The DailyPanchaanga for the date, or None if it is outside this panchaanga.
+    """
+    return self.daily_panchaanga_for_ordinal(day_ordinal=date.get_ordinal())
+
+  def daily_panchaanga_for_day_offset(self, day_offset):
+    """
+    
+    :param day_offset: Number of days since start_date (negative for the prior padding days).
+    :return: The DailyPanchaanga, or None if it is outside this panchaanga.
+    """
+    return self.daily_panchaanga_for_ordinal(day_ordinal=self.start_date.get_ordinal() + day_offset)
+
+  def daily_panchaanga_for_ordinal(self, day_ordinal):
+    """
+    
+    :param day_ordinal: As in Date.get_ordinal().
+    :return: The DailyPanchaanga, or None if it is outside this panchaanga.
+    """
+    daily_panchaangas = self._get_daily_panchaangas()
+    if len(daily_panchaangas) == 0:
+      return None
+    index = day_ordinal - self._day_ordinal_start
+    if 0 <= index < len(daily_panchaangas):
+      return daily_panchaangas[index]
+    return None
 
   def pre_sunset_daily_panchaanga_for_jd(self, jd):
     panchaanga = self.daily_panchaanga_for_jd(jd=jd)
@@ -150,6 +376,14 @@ class Panchaanga(common.JsonObject):
     self._sync_festivals_dict_and_daily_festivals(here_to_daily=True, daily_to_here=True)
     generic_assigner.assign_festival_numbers()
     self.clear_padding_day_festivals()
+    self._festival_rules_fingerprint = rules.get_rules_fingerprint(computation_options=self.computation_system.options)
+
+  def are_festivals_up_to_date(self):
+    """
+    
+    :return: Whether festivals were last assigned (see update_festival_details) with the current festival rules (see rules.get_rules_fingerprint) - as recorded in binary files too.
+    """
+    return self._festival_rules_fingerprint is not None and self._festival_rules_fingerprint == rules.get_rules_fingerprint(computation_options=self.computation_system.options)
 
 
   def _sync_festivals_dict_and_daily_festivals(self, here_to_daily=False, daily_to_here=True):
@@ -158,12 +392,12 @@ class Panchaanga(common.JsonObject):
         for fest_day in days:
           if not isinstance(fest_day, Date):
             logging.fatal(festival_id + " " + str(days))
-          fest_day_str = fest_day.get_date_str()
-          if fest_day_str in self.date_str_to_panchaanga:
-            self.date_str_to_panchaanga[fest_day_str].festival_id_to_instance[festival_id] =  FestivalInstance(name=festival_id)
+          fest_day_panchaanga = self.daily_panchaanga_for_date(date=fest_day)
+          if fest_day_panchaanga is not None:
+            fest_day_panchaanga.festival_id_to_instance[festival_id] =  FestivalInstance(name=festival_id)
 
     if daily_to_here:
-      for dp in self.date_str_to_panchaanga.values():
+      for dp in self.daily_panchaangas_sorted():
         for fest in dp.festival_id_to_instance.values():
           days = self.festival_id_to_days.get(fest.name, set())
           if dp.date not in days:
@@ -172,12 +406,12 @@ class Panchaanga(common.JsonObject):
 
   def _reset_festivals(self):
     self.festival_id_to_days = defaultdict(set, {})
-    for daily_panchaanga in self.date_str_to_panchaanga.values():
+    for daily_panchaanga in self.daily_panchaangas_sorted():
       daily_panchaanga.festival_id_to_instance = {}
 
   def delete_festival(self, fest_id):
     for date in self.festival_id_to_days.pop(fest_id, []):
-      self.date_str_to_panchaanga[date.get_date_str()].festival_id_to_instance.pop(fest_id, None)
+      self.daily_panchaanga_for_date(date=date).festival_id_to_instance.pop(fest_id, None)
     
 
   def _refill_daily_panchaangas(self):
@@ -185,22 +419,58 @@ class Panchaanga(common.JsonObject):
     
     Inverse of _force_non_redundancy_in_daily_panchaangas
     """
-    for daily_panchaanga in self.date_str_to_panchaanga.values():
+    for daily_panchaanga in self.daily_panchaangas_sorted():
       daily_panchaanga.city = self.city
       daily_panchaanga.computation_system = self.computation_system
 
   def _force_non_redundancy_in_daily_panchaangas(self):
     """Avoids duplication for memory efficiency."""
-    for daily_panchaanga in self.date_str_to_panchaanga.values():
+    for daily_panchaanga in self.daily_panchaangas_sorted():
       daily_panchaanga.city = None
       daily_panchaanga.computation_system = None
 
   def post_load_ops(self):
+    self._daily_panchaangas = None
+    self._get_daily_panchaangas()
     self._refill_daily_panchaangas()
     self.festival_id_to_days = collection_helper.lists_to_sets(self.festival_id_to_days)
 
+  @timebudget
+  def to_columns(self):
+    """
+    
+    :return: A PanchaangaColumns - the daily attributes from start_date to end_date as numpy arrays.
+    """
+    from jyotisha.panchaanga.spatio_temporal.columns import PanchaangaColumns
+    return PanchaangaColumns.from_panchaanga(panchaanga=self)
+
+  def to_json_map(self, floating_point_precision=None):
+    self._materialize_daily_panchaangas()
+    return super(Panchaanga, self).to_json_map(floating_point_precision=floating_point_precision)
+
+  @classmethod
+  def read_from_file(cls, filename, name_to_json_class_index_extra=None, lazy=True, **kwargs):
+    """
+    
+    :param filename: A json file, or a binary file (with the binary.FILE_SUFFIX suffix - see dump_to_file).
+    :param lazy: For binary files - if True, daily panchaangas are loaded only as accessed.
+    """
+    if filename.endswith(binary.FILE_SUFFIX):
+      with open(filename, "rb") as f:
+        return binary.load(panchaanga_class=cls, data=f.read(), lazy=lazy)
+    return super(Panchaanga, cls).read_from_file(filename=filename, name_to_json_class_index_extra=name_to_json_class_index_extra, **kwargs)
+
   @timebudget
   def dump_to_file(self, filename, floating_point_precision=None, sort_keys=True):
+    """
+    
+    :param filename: If it has the binary.FILE_SUFFIX suffix, the compact binary format (see binary module) is written - floating_point_precision and sort_keys are then ignored. Else, json.
+    """
+    if filename.endswith(binary.FILE_SUFFIX):
+      os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+      with open(filename, "wb") as f:
+        binary.dump(panchaanga=self, f=f)
+      return
     self._force_non_redundancy_in_daily_panchaangas()
     self.festival_id_to_days = collection_helper.sets_to_lists(self.festival_id_to_days)
     super(Panchaanga, self).dump_to_file(filename=filename, floating_point_precision=floating_point_precision,
@@ -209,5 +479,64 @@ class Panchaanga(common.JsonObject):
     self._refill_daily_panchaangas()
 
 
+def _get_date(date):
+  """
+  
+  :param date: Date (which is modified to have no time of the day) or "YYYY-MM-DD" string.
+  """
+  date = Date(*([int(x) for x in date.split('-')])) if isinstance(date, str) else date
+  date.set_time_to_day_start()
+  return date
+
+
+def compute_daily_panchaangas(city, dates, computation_system, anga_timeline=None, rise_set_table=None, lagna_table=None, previous_daily_panchaanga=None):
+  """Computes daily panchaangas for consecutive dates - each using the previous one's.
+  
+  :param anga_timeline: See DailyPanchaanga.
+  :param rise_set_table: See DailyPanchaanga.
+  :param lagna_table: If not None, lagna data is computed too (see DailyPanchaanga.get_lagna_data).
+  :param previous_daily_panchaanga: The DailyPanchaanga of the day before the first date, if available.
+  """
+  daily_panchaangas = []
+  for date_d in dates:
+    daily_panchaanga = daily.DailyPanchaanga(city=city, date=date_d,
+                                             computation_system=computation_system,
+                                             previous_day_panchaanga=previous_daily_panchaanga, anga_timeline=anga_timeline, rise_set_table=rise_set_table)
+    if lagna_table is not None:
+      daily_panchaanga.get_lagna_data(lagna_table=lagna_table)
+    daily_panchaangas.append(daily_panchaanga)
+    previous_daily_panchaanga = daily_panchaanga
+  return daily_panchaangas
+
+
+def _compute_anga_spans(jd_start, jd_end, ayanaamsha_id, anga_type_names):
+  anga_types = [NAME_TO_TYPE[anga_type_name] for anga_type_name in anga_type_names]
+  return AngaTimeline(jd_start=jd_start, jd_end=jd_end, ayanaamsha_id=ayanaamsha_id, anga_types=anga_types).anga_type_to_spans
+
+
+def _get_carried_over_attributes_json(daily_panchaanga):
+  return [None if x is None else x.to_json_map() for x in (daily_panchaanga.solar_sidereal_date_sunset, daily_panchaanga.tropical_date_sunset, daily_panchaanga.lunar_month_sunrise)]
+
+
+def _carry_over_into_chunk(previous_daily_panchaanga, chunk_daily_panchaangas, rise_set_table, anga_timeline=None):
+  """Redoes the attributes carried over from the previous day (see DailyPanchaanga.set_carried_over_attributes) for the first days of a chunk computed afresh - till these agree with what the chunk computed. The rest of the chunk is then as it would be in a serial computation."""
+  for daily_panchaanga in chunk_daily_panchaangas:
+    carried_over_attributes = _get_carried_over_attributes_json(daily_panchaanga=daily_panchaanga)
+    daily_panchaanga.set_carried_over_attributes(previous_day_panchaanga=previous_daily_panchaanga, rise_set_table=rise_set_table, anga_timeline=anga_timeline)
+    if _get_carried_over_attributes_json(daily_panchaanga=daily_panchaanga) == carried_over_attributes:
+      break
+    previous_daily_panchaanga = daily_panchaanga
+
+
+def _run_pickled(pickled_call):
+  (function, kwargs) = pickle.loads(pickled_call)
+  return pickle_dumps(function(**kwargs))
+
+
+def _submit_pickled(executor, function, **kwargs):
+  # Arguments and results are JsonObject-s mostly, which can be pickled only with pickle_dumps. Results are to be loaded with pickle.loads.
+  return executor.submit(_run_pickled, pickle_dumps((function, kwargs)))
+
+
 # Essential for depickling to work.
 common.update_json_class_index(sys.modules[__name__])
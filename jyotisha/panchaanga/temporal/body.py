@@ -3,6 +3,7 @@ import math
 import sys
 
 import methodtools
+import numpy
 import swisseph as swe
 from scipy.optimize import brentq
 
@@ -70,6 +71,37 @@ class Graha(JsonObject):
     else:
       return swe.calc_ut(jd, self._get_swisseph_id())[0][0]
 
+  def get_longitude_and_speed(self, jd, ayanaamsha_id=None):
+    """
+    
+    :param jd: 
+    :param ayanaamsha_id: 
+    Default value of ayanaamsha_id here is deliberately None. The (tiny) rate of change of the ayanaamsha is ignored.
+    :return: (longitude, speed in degrees per day) - both from a single swe.calc_ut call.
+    """
+    (longitude, _, _, speed, _, _) = swe.calc_ut(jd, self._get_swisseph_id())[0]
+    if ayanaamsha_id is not None:
+      from jyotisha.panchaanga.temporal.zodiac import Ayanamsha
+      longitude = (longitude - Ayanamsha.singleton(ayanaamsha_id).get_offset(jd)) % 360
+    return (longitude, speed)
+
+  def get_longitudes(self, jds, ayanaamsha_id=None):
+    """Batch version of get_longitude.
+    
+    :param jds: numpy array (or any sequence) of julian days. 
+    :param ayanaamsha_id: 
+    Default value of ayanaamsha_id here is deliberately None.
+    :return: numpy array of longitudes, of the same shape as jds.
+    """
+    jds = numpy.asarray(jds, dtype=float)
+    body_id = self._get_swisseph_id()
+    longitudes = numpy.fromiter((swe.calc_ut(jd, body_id)[0][0] for jd in jds.flat), dtype=float, count=jds.size).reshape(jds.shape)
+    if ayanaamsha_id is not None:
+      from jyotisha.panchaanga.temporal.zodiac import Ayanamsha
+      # The ayanaamsha setup (ephemeris path, sidereal mode etc.) is done once for the whole batch.
+      longitudes = (longitudes - Ayanamsha.singleton(ayanaamsha_id).get_offsets(jds)) % 360
+    return longitudes
+
   def get_transits(self, jd_start: float, jd_end: float, ayanaamsha_id: str, anga_type: object) -> [Transit]:
     """Returns the next transit of the given planet e.g. jupiter
 
@@ -141,5 +173,92 @@ def get_star_longitude(star, jd):
   (long, lat, _, _, _, _) = swe.fixstar_ut(star, jd)[0]
   return long
 
+
+def get_star_longitudes(star, jds):
+  """ Batch version of get_star_longitude - sets the ephemeris path only once.
+  
+  :param star: Example: Spica. 
+  :param jds: numpy array (or any sequence) of julian days.
+  :return: numpy array of longitudes, of the same shape as jds.
+  """
+  from jyotisha.panchaanga.temporal import data
+  import os
+  swe.set_ephe_path(os.path.dirname(data.__file__))
+  jds = numpy.asarray(jds, dtype=float)
+  return numpy.fromiter((swe.fixstar_ut(star, jd)[0][0] for jd in jds.flat), dtype=float, count=jds.size).reshape(jds.shape)
+
+
+class StarLongitudeTable(object):
+  """Longitudes of a fixed star at a grid of jds (one per day), interpolated in between with a 4-point Lagrange polynomial.
+  
+  Stars move slowly (mostly precession, nutation and aberration), so the interpolation error is ~0.01 arcseconds - see max_error and get_interpolation_error. The grid is filled lazily, a block at a time, and is shared by all users within the process (see singleton).
+  """
+  STEP_DAYS = 1.0
+  BLOCK_SIZE = 512
+  # Number of points in each block where the interpolation is checked.
+  NUM_CHECKS_PER_BLOCK = 8
+
+  def __init__(self, star):
+    self.star = star
+    self.blocks = {}
+    # Maximum interpolation error (in degrees) observed so far at the check points.
+    self.max_error = 0.0
+
+  @methodtools.lru_cache(maxsize=None)
+  @classmethod
+  def singleton(cls, star):
+    return cls(star=star)
+
+  def _get_block(self, block_index):
+    block = self.blocks.get(block_index)
+    if block is None:
+      # One extra grid point before and two after the block, for the 4-point interpolation.
+      grid_indices = block_index * self.BLOCK_SIZE + numpy.arange(-1, self.BLOCK_SIZE + 2)
+      block = numpy.unwrap(get_star_longitudes(star=self.star, jds=grid_indices * self.STEP_DAYS), period=360)
+      self.blocks[block_index] = block
+      check_jds = (block_index * self.BLOCK_SIZE + (numpy.arange(self.NUM_CHECKS_PER_BLOCK) + 0.5) * self.BLOCK_SIZE / self.NUM_CHECKS_PER_BLOCK + 0.5) * self.STEP_DAYS
+      error = self.get_interpolation_error(jds=check_jds)
+      self.max_error = max(self.max_error, error)
+      logging.debug("Filled %s longitude table block %d. Interpolation error: %g arcseconds.", self.star, block_index, error * 3600)
+    return block
+
+  def get_longitudes(self, jds):
+    """
+
+    :param jds: numpy array (or any sequence) of julian days.
+    :return: numpy array of longitudes, of the same shape as jds.
+    """
+    jds = numpy.asarray(jds, dtype=float)
+    x = jds / self.STEP_DAYS
+    grid_indices = numpy.floor(x).astype(int)
+    t = x - grid_indices
+    block_indices = grid_indices // self.BLOCK_SIZE
+    offsets = grid_indices - block_indices * self.BLOCK_SIZE
+    values = numpy.empty((4,) + jds.shape)
+    for block_index in numpy.unique(block_indices):
+      mask = block_indices == block_index
+      block = self._get_block(block_index=int(block_index))
+      for k in range(4):
+        values[k][mask] = block[offsets[mask] + k]
+    # Lagrange basis polynomials for the nodes -1, 0, 1, 2.
+    longitudes = (-t * (t - 1) * (t - 2) / 6 * values[0] + (t + 1) * (t - 1) * (t - 2) / 2 * values[1] - (t + 1) * t * (t - 2) / 2 * values[2] + (t + 1) * t * (t - 1) / 6 * values[3])
+    return longitudes % 360
+
+  def get_longitude(self, jd):
+    # Scalar version of get_longitudes, avoiding numpy overheads for single jds (as in root finding).
+    x = jd / self.STEP_DAYS
+    grid_index = math.floor(x)
+    t = x - grid_index
+    block_index = grid_index // self.BLOCK_SIZE
+    offset = grid_index - block_index * self.BLOCK_SIZE
+    (v0, v1, v2, v3) = self._get_block(block_index=block_index)[offset: offset + 4].tolist()
+    longitude = (-t * (t - 1) * (t - 2) / 6 * v0 + (t + 1) * (t - 1) * (t - 2) / 2 * v1 - (t + 1) * t * (t - 2) / 2 * v2 + (t + 1) * t * (t - 1) / 6 * v3)
+    return longitude % 360
+
+  def get_interpolation_error(self, jds):
+    """Maximum absolute difference (in degrees) between the interpolated and exact longitudes at the given jds."""
+    difference = self.get_longitudes(jds=jds) - get_star_longitudes(star=self.star, jds=jds)
+    return float(numpy.max(numpy.abs((difference + 180) % 360 - 180)))
+
 # Essential for depickling to work.
 common.update_json_class_index(sys.modules[__name__])
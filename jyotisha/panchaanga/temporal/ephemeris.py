@@ -0,0 +1,142 @@
+import logging
+from math import floor
+
+import numpy
+from numpy.polynomial import chebyshev
+
+from jyotisha.panchaanga.temporal.body import Graha
+from jyotisha.panchaanga.temporal.zodiac.angas import AngaType
+
+
+# Slowest typical motion (degrees per day) - used to translate a tolerance in seconds into a tolerance in degrees.
+MIN_SPEED = {Graha.SUN: 0.95, Graha.MOON: 11.7}
+
+
+class ChebyshevFit(object):
+  """Piecewise Chebyshev approximation of some smooth function of time (such as an unwrapped longitude), over equal length segments.
+
+  The fit is verified at points other than the interpolation nodes. If the error there exceeds max_error, segments are halved and the fit is redone.
+  """
+
+  def __init__(self, fn, jd_start, jd_end, segment_days, degree, max_error):
+    """
+
+    :param fn: A function mapping a numpy array of julian days to a numpy array of values.
+    :param max_error: Maximum tolerable absolute error.
+    """
+    self.jd_start = jd_start
+    self.jd_end = jd_end
+    self.degree = degree
+    self.max_error = max_error
+    self.error = None
+    self.segment_days = segment_days
+    while True:
+      self._fit(fn=fn)
+      if self.error <= max_error:
+        break
+      if self.segment_days < 0.25:
+        raise ValueError("Could not attain the error bound %s (got %s)" % (max_error, self.error))
+      self.segment_days = self.segment_days / 2
+
+  def _fit(self, fn):
+    num_segments = max(1, int(numpy.ceil((self.jd_end - self.jd_start) / self.segment_days)))
+    self.segment_days = (self.jd_end - self.jd_start) / num_segments
+    nodes = numpy.cos(numpy.pi * (numpy.arange(self.degree + 1) + 0.5) / (self.degree + 1))[::-1]
+    # Check points lie between the nodes, where the interpolation error is largest.
+    check_points = numpy.concatenate(([-1], (nodes[1:] + nodes[:-1]) / 2, [1]))
+    segment_starts = self.jd_start + numpy.arange(num_segments) * self.segment_days
+    node_jds = segment_starts[:, None] + (nodes[None, :] + 1) / 2 * self.segment_days
+    check_jds = segment_starts[:, None] + (check_points[None, :] + 1) / 2 * self.segment_days
+    values = fn(node_jds)
+    self.coefficients = numpy.array([chebyshev.chebfit(nodes, segment_values, self.degree) for segment_values in values])
+    # Plain lists - much faster than numpy for evaluation at single points.
+    self._coefficient_lists = self.coefficients.tolist()
+    self._derivative_coefficient_lists = [chebyshev.chebder(c).tolist() for c in self.coefficients]
+    check_values = fn(check_jds)
+    approximations = numpy.array([chebyshev.chebval(check_points, c) for c in self.coefficients])
+    self.error = float(numpy.max(numpy.abs(approximations - check_values)))
+
+  def covers(self, jd):
+    return self.jd_start <= jd <= self.jd_end
+
+  def _locate(self, jd):
+    index = min(int(floor((jd - self.jd_start) / self.segment_days)), len(self.coefficients) - 1)
+    segment_start = self.jd_start + index * self.segment_days
+    x = 2 * (jd - segment_start) / self.segment_days - 1
+    return index, x
+
+  def get_value(self, jd):
+    (index, x) = self._locate(jd=jd)
+    return _clenshaw(x=x, coefficients=self._coefficient_lists[index])
+
+  def get_derivative(self, jd):
+    """Derivative per day."""
+    (index, x) = self._locate(jd=jd)
+    return _clenshaw(x=x, coefficients=self._derivative_coefficient_lists[index]) * 2 / self.segment_days
+
+
+def _clenshaw(x, coefficients):
+  # Evaluates the Chebyshev series at a single point - same as chebyshev.chebval, minus numpy overheads.
+  b1 = b2 = 0.0
+  for c in reversed(coefficients[1:]):
+    (b1, b2) = (2 * x * b1 - b2 + c, b1)
+  return x * b1 - b2 + coefficients[0]
+
+
+def _unwrapped(longitudes):
+  # Longitudes along the last axis are unwrapped, so that they are continuous (and hence amenable to polynomial approximation).
+  return numpy.unwrap(longitudes, period=360, axis=-1)
+
+
+class ChebyshevEphemeris(object):
+  """Chebyshev polynomial approximations to the sun and moon longitudes (and the ayanaamsha offset) over a span of time.
+
+  Meant to speed up root finding (see AngaSpanFinder), wherein the anga is evaluated many times. Boundary jds computed with this should be within tolerance_seconds of those computed using Swiss Ephemeris directly.
+  """
+
+  def __init__(self, jd_start, jd_end, ayanaamsha_id, tolerance_seconds=1.0):
+    self.jd_start = jd_start
+    self.jd_end = jd_end
+    self.ayanaamsha_id = ayanaamsha_id
+    self.tolerance_seconds = tolerance_seconds
+    tolerance_days = tolerance_seconds / 86400.0
+    self.fits = {}
+    for (body_name, segment_days, degree) in [(Graha.MOON, 8, 16), (Graha.SUN, 16, 12)]:
+      graha = Graha.singleton(body_name)
+      self.fits[body_name] = ChebyshevFit(fn=lambda jds, graha=graha: _unwrapped(graha.get_longitudes(jds)), jd_start=jd_start, jd_end=jd_end, segment_days=segment_days, degree=degree, max_error=tolerance_days * MIN_SPEED[body_name])
+    from jyotisha.panchaanga.temporal.zodiac import Ayanamsha
+    ayanamsha = Ayanamsha.singleton(ayanaamsha_id)
+    # The ayanaamsha offset affects sun-only angas as much as the sun longitude.
+    self.ayanamsha_fit = ChebyshevFit(fn=lambda jds: _unwrapped(ayanamsha.get_offsets(jds)), jd_start=jd_start, jd_end=jd_end, segment_days=64, degree=8, max_error=tolerance_days * MIN_SPEED[Graha.SUN])
+    logging.debug("Chebyshev ephemeris errors (degrees): moon %s, sun %s, ayanaamsha %s", self.fits[Graha.MOON].error, self.fits[Graha.SUN].error, self.ayanamsha_fit.error)
+
+  def covers(self, jd):
+    return self.jd_start <= jd <= self.jd_end
+
+  def get_longitude(self, body_name, jd, ayanaamsha_id=None):
+    longitude = self.fits[body_name].get_value(jd=jd)
+    if ayanaamsha_id is not None:
+      if ayanaamsha_id != self.ayanaamsha_id:
+        raise ValueError("ayanaamsha mismatch", (ayanaamsha_id, self.ayanaamsha_id))
+      longitude = longitude - self.ayanamsha_fit.get_value(jd=jd)
+    return longitude % 360
+
+  def _get_weighted_fits(self, anga_type):
+    fits = []
+    if anga_type.weight_moon != 0:
+      fits.append((anga_type.weight_moon, self.fits[Graha.MOON]))
+    if anga_type.weight_sun != 0:
+      fits.append((anga_type.weight_sun, self.fits[Graha.SUN]))
+    if anga_type != AngaType.TITHI:
+      # Tithi is independent of the ayanaamsha.
+      fits.append((-(anga_type.weight_moon + anga_type.weight_sun), self.ayanamsha_fit))
+    return fits
+
+  def get_anga_float(self, jd, anga_type):
+    lcalc = sum(weight * fit.get_value(jd=jd) for (weight, fit) in self._get_weighted_fits(anga_type=anga_type))
+    return (lcalc % 360) / anga_type.arc_length
+
+  def get_anga_speed(self, jd, anga_type):
+    """Rate of change of the anga, per day."""
+    return sum(weight * fit.get_derivative(jd=jd) for (weight, fit) in self._get_weighted_fits(anga_type=anga_type)) / anga_type.arc_length
+
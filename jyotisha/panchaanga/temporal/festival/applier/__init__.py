@@ -68,7 +68,7 @@ class FestivalAssigner(PeriodicPanchaangaApplier):
 
           if fest_num <= 0:
             logging.warning('Festival %s is only in the future!' % festival_name)
-          self.panchaanga.date_str_to_panchaanga[assigned_day.get_date_str()].festival_id_to_instance[festival_name].ordinal = fest_num
+          self.panchaanga.daily_panchaanga_for_date(date=assigned_day).festival_id_to_instance[festival_name].ordinal = fest_num
 
   def cleanup_festivals(self):
     # If tripurotsava coincides with maha kArttikI (kRttikA nakShatram)
@@ -1,4 +1,5 @@
 import sys
+from functools import lru_cache
 from math import floor
 
 from jyotisha import names
@@ -108,8 +109,7 @@ class EclipticFestivalAssigner(FestivalAssigner):
     check_window = 400  # Max t between two Jupiter transits is ~396 (checked across 180y)
     # Let's check for transitions in a relatively large window
     # to finalise what is the FINAL transition post retrograde movements
-    transits = Graha.singleton(Graha.JUPITER).get_transits(self.panchaanga.jd_start, jd_end + check_window, anga_type=AngaType.RASHI,
-                                                           ayanaamsha_id=self.ayanaamsha_id)
+    transits = get_jupiter_transits(jd_start=self.panchaanga.jd_start, jd_end=jd_end + check_window, ayanaamsha_id=self.ayanaamsha_id)
     if len(transits) > 0:
       for i, transit in enumerate(transits):
         (jd_transit, rashi1, rashi2) = (transit.jd, transit.value_1, transit.value_2)
@@ -138,5 +138,14 @@ class EclipticFestivalAssigner(FestivalAssigner):
 
 MIN_DAYS_NEXT_ECLIPSE = 25
 
+
+@lru_cache(maxsize=16)
+def get_jupiter_transits(jd_start, jd_end, ayanaamsha_id):
+  """Jupiter's raashi transits - which don't depend on the location, and so are computed once for the panchaangas of many cities over the same period (see batch.BatchPanchaanga).
+
+  :return: Transit tuple.
+  """
+  return tuple(Graha.singleton(Graha.JUPITER).get_transits(jd_start, jd_end, anga_type=AngaType.RASHI, ayanaamsha_id=ayanaamsha_id))
+
 # Essential for depickling to work.
 common.update_json_class_index(sys.modules[__name__])
@@ -53,7 +53,7 @@ class RuleLookupAssigner(FestivalAssigner):
 
   def apply_month_day_events(self, day_panchaanga, month_type):
     from jyotisha.panchaanga.temporal.festival import rules, FestivalInstance
-    rule_set = rules.RulesCollection.get_cached(repos_tuple=tuple(self.computation_system.options.fest_repos))
+    rule_set = self.rules_collection
 
     date = day_panchaanga.get_date(month_type=month_type)
     fest_dict = rule_set.get_month_anga_fests(month=date.month, anga=date.day, month_type=month_type, anga_type_id=rules.RulesRepo.DAY_DIR)
@@ -63,10 +63,11 @@ class RuleLookupAssigner(FestivalAssigner):
 
   def apply_month_anga_events(self, day_panchaanga, anga_type, month_type):
     from jyotisha.panchaanga.temporal.festival import rules, priority_decision, FestivalInstance
-    rule_set = rules.RulesCollection.get_cached(repos_tuple=tuple(self.computation_system.options.fest_repos))
+    rule_set = self.rules_collection
     date = day_panchaanga.date
     
-    panchaangas = [self.panchaanga.date_str_to_panchaanga.get((date-2).get_date_str(), None), self.panchaanga.date_str_to_panchaanga.get((date-1).get_date_str(), None), day_panchaanga]
+    date_ordinal = date.get_ordinal()
+    panchaangas = [self.panchaanga.daily_panchaanga_for_ordinal(day_ordinal=date_ordinal - 2), self.panchaanga.daily_panchaanga_for_ordinal(day_ordinal=date_ordinal - 1), day_panchaanga]
     if panchaangas[1] is None:
       # We require atleast 1 day history.
       return
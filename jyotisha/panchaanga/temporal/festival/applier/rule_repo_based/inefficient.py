@@ -1,11 +1,67 @@
 import logging
+from collections import defaultdict
 
-from jyotisha.panchaanga.temporal import Anga
+from jyotisha.panchaanga.temporal import Anga, AngaType
 from jyotisha.panchaanga.temporal.festival import rules, priority_decision
 from jyotisha.panchaanga.temporal.festival.applier import FestivalAssigner
 from timebudget import timebudget
 
 
+class FestivalRuleIndex(object):
+  """Rules for FestivalsTimesDaysAssigner.assign_festival, indexed by (month_type, month_number, anga type, index of the anga at sunrise).
+
+  assign_festival has an effect on a day only if the anga at sunrise is the target anga or its predecessor, and the month of the day (or, for lunar months, of the next day) is the rule's month (or the rule's month number is 0). So each rule is indexed under those two angas; and get_possibly_relevant_rules looks up only such rules for a day.
+  """
+  INDEXED_ANGA_TYPES = (AngaType.TITHI, AngaType.NAKSHATRA, AngaType.YOGA)
+  MONTH_TYPES = (rules.RulesRepo.LUNAR_MONTH_DIR, rules.RulesRepo.SIDEREAL_SOLAR_MONTH_DIR)
+
+  def __init__(self, fest_rules):
+    """
+
+    :param fest_rules: HinduCalendarEvent list - in the order in which they are to be applied on any day.
+    """
+    self._rules = list(fest_rules)
+    self._key_to_rule_positions = defaultdict(list)
+    # Rules with other anga types are checked on every day.
+    self._unindexed_rule_positions = []
+    self._month_types = set()
+    self._anga_types = []
+    name_to_anga_type = {anga_type.name: anga_type for anga_type in FestivalRuleIndex.INDEXED_ANGA_TYPES}
+    for position, fest_rule in enumerate(self._rules):
+      timing = fest_rule.timing
+      if timing.month_type not in FestivalRuleIndex.MONTH_TYPES or timing.month_number is None or timing.anga_type is None or timing.anga_number is None:
+        # assign_festival does nothing with these.
+        continue
+      anga_type = name_to_anga_type.get(timing.anga_type.upper(), None)
+      if anga_type is None:
+        self._unindexed_rule_positions.append(position)
+        continue
+      self._month_types.add(timing.month_type)
+      if anga_type not in self._anga_types:
+        self._anga_types.append(anga_type)
+      target_anga = Anga.get_cached(index=timing.anga_number, anga_type_id=anga_type.name)
+      for sunrise_anga_index in {target_anga.index, (target_anga - 1).index}:
+        self._key_to_rule_positions[(timing.month_type, timing.month_number, anga_type.name, sunrise_anga_index)].append(position)
+
+  def get_possibly_relevant_rules(self, day_panchaanga, next_day_panchaanga):
+    """
+
+    :return: The rules for which assign_festival may have an effect on day_panchaanga - in their original order.
+    """
+    month_keys = []
+    if rules.RulesRepo.LUNAR_MONTH_DIR in self._month_types:
+      # The next day's month matters for shukla prathama festivals.
+      month_keys.extend((rules.RulesRepo.LUNAR_MONTH_DIR, month_number) for month_number in {day_panchaanga.lunar_month_sunrise.index, next_day_panchaanga.lunar_month_sunrise.index, 0})
+    if rules.RulesRepo.SIDEREAL_SOLAR_MONTH_DIR in self._month_types:
+      month_keys.extend((rules.RulesRepo.SIDEREAL_SOLAR_MONTH_DIR, month_number) for month_number in {day_panchaanga.solar_sidereal_date_sunset.month, 0})
+    positions = set(self._unindexed_rule_positions)
+    for anga_type in self._anga_types:
+      sunrise_anga = day_panchaanga.sunrise_day_angas.get_angas_with_ends(anga_type=anga_type)[0].anga
+      for (month_type, month_number) in month_keys:
+        positions.update(self._key_to_rule_positions.get((month_type, month_number, anga_type.name, sunrise_anga.index), []))
+    return [self._rules[position] for position in sorted(positions)]
+
+
 class FestivalsTimesDaysAssigner(FestivalAssigner):
 
   @timebudget
@@ -29,9 +85,10 @@ class FestivalsTimesDaysAssigner(FestivalAssigner):
     # assert "naTarAjar mahAbhiSEkam~2" not in festival_rules_dict
     # assert "kar2pagAmbAL–kapAlIzvarar tirukkalyANam" in festival_rules_dict
 
-
+    # Rather than checking every rule on every day - most such checks having no effect.
+    rule_index = FestivalRuleIndex(fest_rules=festival_rules_dict.values())
     for d in range(self.panchaanga.duration_prior_padding, self.panchaanga.duration + 1):
-      for rule in festival_rules_dict.values():
+      for rule in rule_index.get_possibly_relevant_rules(day_panchaanga=self.daily_panchaangas[d], next_day_panchaanga=self.daily_panchaangas[d + 1]):
         self.assign_festival(fest_rule=rule, d=d)
 
   @timebudget
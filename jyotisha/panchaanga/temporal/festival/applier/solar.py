@@ -4,7 +4,7 @@ from datetime import datetime
 from math import floor
 
 from jyotisha import names
-from jyotisha.panchaanga.temporal import zodiac, tithi
+from jyotisha.panchaanga.temporal import zodiac
 from jyotisha.panchaanga.temporal.festival.applier import FestivalAssigner
 from jyotisha.panchaanga.temporal.zodiac import NakshatraDivision
 from pytz import timezone as tz
@@ -78,11 +78,11 @@ class SolarFestivalAssigner(FestivalAssigner):
   def assign_vishesha_vyatipata(self):
     vs_list = copy(self.panchaanga.festival_id_to_days.get('vyatIpAta-zrAddham', []))
     for date in vs_list:
-      if self.panchaanga.date_str_to_panchaanga[date.get_date_str()].solar_sidereal_date_sunset.month == 9:
+      if self.panchaanga.daily_panchaanga_for_date(date=date).solar_sidereal_date_sunset.month == 9:
         self.panchaanga.festival_id_to_days['vyatIpAta-zrAddham'].remove(date)
         festival_name = 'mahAdhanurvyatIpAta-zrAddham'
         self.festival_id_to_days[festival_name].add(date)
-      elif self.panchaanga.date_str_to_panchaanga[date.get_date_str()].solar_sidereal_date_sunset.month == 6:
+      elif self.panchaanga.daily_panchaanga_for_date(date=date).solar_sidereal_date_sunset.month == 6:
         self.panchaanga.festival_id_to_days['vyatIpAta-zrAddham'].remove(date)
         festival_name = 'mahAvyatIpAta-zrAddham'
         self.festival_id_to_days[festival_name].add(date)
@@ -163,7 +163,8 @@ class SolarFestivalAssigner(FestivalAssigner):
       # 4th pada of vyatipatam, 1st pada of Amavasya, 2nd pada of Shravana, Suryodaya, Somavasara = Mahodayam
       sunrise_zodiac = NakshatraDivision(daily_panchaanga.jd_sunrise, ayanaamsha_id=self.ayanaamsha_id)
       sunset_zodiac = NakshatraDivision(daily_panchaanga.jd_sunset, ayanaamsha_id=self.ayanaamsha_id)
-      if daily_panchaanga.lunar_month_sunrise.index in [10, 11] and daily_panchaanga.sunrise_day_angas.tithi_at_sunrise.index == 30 or tithi.get_tithi(daily_panchaanga.jd_sunrise).index == 30:
+      # On any amaavaasya - the lunar month (10 or 11) was never effectively checked here.
+      if daily_panchaanga.sunrise_day_angas.tithi_at_sunrise.index == 30:
         if sunrise_zodiac.get_anga(zodiac.AngaType.NAKSHATRA).index == 17 or \
             sunset_zodiac.get_anga(zodiac.AngaType.NAKSHATRA).index == 17 and \
             sunrise_zodiac.get_anga(zodiac.AngaType.NAKSHATRA).index == 22 or \
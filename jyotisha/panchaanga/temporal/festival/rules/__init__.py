@@ -1,6 +1,9 @@
+import hashlib
+import json
 import logging
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 import methodtools
@@ -284,6 +287,29 @@ class RulesCollection(common.JsonObject):
 
 
 
+@lru_cache(maxsize=64)
+def _get_rule_files_hash(dir_path):
+  hasher = hashlib.sha256()
+  for file_path in sorted(Path(dir_path).glob("**/*.toml")):
+    hasher.update(str(file_path.relative_to(dir_path)).encode("utf-8"))
+    hasher.update(b"\0")
+    hasher.update(file_path.read_bytes())
+    hasher.update(b"\0")
+  return hasher.hexdigest()
+
+
+def get_rules_fingerprint(computation_options):
+  """A content hash of the festival rules applicable with the given ComputationOptions - covering the options themselves and the rule files of their fest_repos (as read by RulesCollection).
+
+  Rule files are read once per process (like RulesCollection.get_cached).
+  """
+  hasher = hashlib.sha256()
+  hasher.update(json.dumps(computation_options.to_json_map(), sort_keys=True).encode("utf-8"))
+  for repo in computation_options.fest_repos:
+    hasher.update(_get_rule_files_hash(os.path.join(DATA_ROOT, repo.get_path())).encode("utf-8"))
+  return hasher.hexdigest()
+
+
 # Essential for depickling to work.
 common.update_json_class_index(sys.modules[__name__])
 # logging.debug(common.json_class_index)
@@ -1,5 +1,6 @@
 import sys
-from math import floor
+from bisect import bisect_left, bisect_right
+from math import floor, inf
 from numbers import Number
 
 import methodtools
@@ -56,6 +57,56 @@ class AngaSpan(Interval):
                              time.ist_timezone.julian_day_to_local_time_str(jd=self.jd_end))
 
 
+class AngaSpanIndex(object):
+  """Mixin providing bisect-based lookups over contiguous, sorted anga spans - as in DayAngas or AngaTimeline.
+  
+  Subclasses implement get_angas_with_ends(anga_type). The first span may have jd_start None, the last may have jd_end None. Indices are kept in underscored attributes (so as to not be serialized), and are rebuilt if the span lists are replaced.
+  """
+
+  def get_angas_with_ends(self, anga_type):
+    raise NotImplementedError()
+
+  def _get_span_index(self, anga_type):
+    spans = self.get_angas_with_ends(anga_type=anga_type)
+    if getattr(self, "_anga_type_to_span_index", None) is None:
+      self._anga_type_to_span_index = {}
+    span_index = self._anga_type_to_span_index.get(anga_type.name, None)
+    if span_index is None or span_index[0] is not spans:
+      span_starts = [-inf if span.jd_start is None else span.jd_start for span in spans]
+      span_ends = [inf if span.jd_end is None else span.jd_end for span in spans]
+      anga_index_to_position = {}
+      for (position, span) in enumerate(spans):
+        anga_index_to_position.setdefault(span.anga.index, position)
+      span_index = (spans, span_starts, span_ends, anga_index_to_position)
+      self._anga_type_to_span_index[anga_type.name] = span_index
+    return span_index
+
+  def find_anga_span(self, anga):
+    (spans, _, _, anga_index_to_position) = self._get_span_index(anga_type=anga.get_type())
+    position = anga_index_to_position.get(anga.index, None)
+    return None if position is None else spans[position]
+
+  def get_anga_spans_in_interval(self, anga_type, interval):
+    """
+
+    Assumptions: interval ends are not None. Anga spans in self could be None.
+    Raison d'etre: efficiency.
+    :param anga_type: 
+    :param interval: 
+    :return: spans overlapping the interval (including those merely touching it).
+    """
+    (spans, span_starts, span_ends, _) = self._get_span_index(anga_type=anga_type)
+    # Spans ending before the interval start, or starting after the interval end are excluded.
+    return spans[bisect_left(span_ends, interval.jd_start): bisect_right(span_starts, interval.jd_end)]
+
+  def get_anga_at_jd(self, jd, anga_type):
+    (spans, _, span_ends, _) = self._get_span_index(anga_type=anga_type)
+    position = bisect_left(span_ends, jd)
+    if position < len(spans) and (spans[position].jd_start is None or spans[position].jd_start <= jd):
+      return spans[position].anga
+    return None
+
+
 class DayLengthBasedPeriods(common.JsonObject):
   def __init__(self, jd_previous_sunset, jd_sunrise, jd_sunset, jd_next_sunrise, weekday):
     # Compute the various day_length_based_periods
@@ -0,0 +1,271 @@
+"""Conversions between (UTC) julian days and civil (proleptic gregorian) date-times - by plain arithmetic.
+
+These follow the algorithms of ERFA (eraCal2jd, eraJd2cal, eraDtf2d, eraD2dtf, eraD2tf) step by step, as used by astropy.time for the UTC scale - so results are identical to astropy's (which remains the reference implementation in the tests), at a small fraction of the cost. As with astropy, days ending with a leap second are 86401 seconds long. UTC before 1972 (with its fractional adjustments) is treated as having 86400 second days.
+
+Vectorized (numpy) variants are provided for converting many values at once.
+"""
+
+import math
+import sys
+
+import numpy
+
+DAY_SECONDS = 86400.0
+MJD_ZERO = 2400000.5
+
+# Days (year, month, day) at the end of which a leap second was inserted into UTC.
+LEAP_SECOND_DAYS = (
+  (1972, 6, 30), (1972, 12, 31), (1973, 12, 31), (1974, 12, 31), (1975, 12, 31), (1976, 12, 31), (1977, 12, 31),
+  (1978, 12, 31), (1979, 12, 31), (1981, 6, 30), (1982, 6, 30), (1983, 6, 30), (1985, 6, 30), (1987, 12, 31),
+  (1989, 12, 31), (1990, 12, 31), (1992, 6, 30), (1993, 6, 30), (1994, 6, 30), (1995, 12, 31), (1997, 6, 30),
+  (1998, 12, 31), (2005, 12, 31), (2008, 12, 31), (2012, 6, 30), (2015, 6, 30), (2016, 12, 31),
+)
+
+
+def _dnint(a):
+  # Nearest whole number, rounding halves away from zero (ERFA_DNINT).
+  if abs(a) < 0.5:
+    return 0.0
+  return math.ceil(a - 0.5) if a < 0.0 else math.floor(a + 0.5)
+
+
+def _two_sum(a, b):
+  # Sum of two floats as a float and its (exact) error.
+  x = a + b
+  eb = x - a
+  ea = x - eb
+  eb = b - eb
+  ea = a - ea
+  return (x, ea + eb)
+
+
+def _day_frac(val1, val2):
+  # Sum as an integer and a fraction within [-0.5, 0.5] - as in astropy.time.utils.day_frac.
+  (sum12, err12) = _two_sum(val1, val2)
+  day = float(round(sum12))
+  (extra, frac) = _two_sum(sum12, -day)
+  frac += extra + err12
+  excess = float(round(frac))
+  day += excess
+  (extra, frac) = _two_sum(sum12, -day)
+  frac += extra + err12
+  return (day, frac)
+
+
+def _get_modified_julian_day_number(year, month, day):
+  # eraCal2jd
+  # (month - 14) / 12, truncated towards 0 - as in C.
+  my = -((14 - month) // 12)
+  iypmy = year + my
+  return float((1461 * (iypmy + 4800)) // 4 + (367 * (month - 2 - 12 * my)) // 12 - (3 * ((iypmy + 4900) // 100)) // 4 + day - 2432076)
+
+
+def _get_day_length(year, month, day):
+  if (year, month, day) in _LEAP_SECOND_DAY_SET:
+    return DAY_SECONDS + 1
+  return DAY_SECONDS
+
+
+def _julian_day_parts_to_calendar(d1, d2):
+  """eraJd2cal
+
+  :return: (year, month, day, day fraction)
+  """
+  d = _dnint(d1)
+  f1 = d1 - d
+  jd = int(d)
+  d = _dnint(d2)
+  f2 = d2 - d
+  jd += int(d)
+  # f1 + f2 + 0.5, with compensated summation.
+  s = 0.5
+  cs = 0.0
+  for x in (f1, f2):
+    t = s + x
+    cs += (s - t) + x if abs(s) >= abs(x) else (x - t) + s
+    s = t
+    if s >= 1.0:
+      jd += 1
+      s -= 1.0
+  f = s + cs
+  cs = f - s
+  if f < 0.0:
+    f = s + 1.0
+    cs += (1.0 - f) + s
+    s = f
+    f = s + cs
+    cs = f - s
+    jd -= 1
+  if (f - 1.0) >= -sys.float_info.epsilon / 4.0:
+    t = s - 1.0
+    cs += (s - t) - 1.0
+    s = t
+    f = s + cs
+    if -sys.float_info.epsilon / 2.0 < f:
+      jd += 1
+      f = max(f, 0.0)
+  l = jd + 68569
+  n = (4 * l) // 146097
+  l -= (146097 * n + 3) // 4
+  i = (4000 * (l + 1)) // 1461001
+  l -= (1461 * i) // 4 - 31
+  k = (80 * l) // 2447
+  day = l - (2447 * k) // 80
+  l = k // 11
+  month = k + 2 - 12 * l
+  year = 100 * (n - 49) + i + l
+  return (year, month, day, f)
+
+
+def _day_fraction_to_time(num_decimals, day_fraction):
+  """eraD2tf
+
+  :return: (hour, minute, second, fraction of second in units of 10^-num_decimals)
+  """
+  resolution = float(10 ** num_decimals)
+  a = _dnint(resolution * (DAY_SECONDS * abs(day_fraction)))
+  hours = math.trunc(a / (resolution * 3600.0))
+  a -= hours * resolution * 3600.0
+  minutes = math.trunc(a / (resolution * 60.0))
+  a -= minutes * resolution * 60.0
+  seconds = math.trunc(a / resolution)
+  fraction = a - seconds * resolution
+  return (int(hours), int(minutes), int(seconds), int(fraction))
+
+
+def julian_day_to_civil(jd, num_decimals=9):
+  """UTC date and time of a julian day (eraD2dtf, with astropy's splitting of jd).
+
+  :param num_decimals: Number of decimal places of the seconds to round to.
+  :return: (year, month, day, hour, minute, second, fraction of second in units of 10^-num_decimals) - all ints.
+  """
+  (d1, d2) = _day_frac(float(jd), 0.0)
+  (year, month, day, day_fraction) = _julian_day_parts_to_calendar(d1, d2)
+  day_length = _get_day_length(year, month, day)
+  if day_length != DAY_SECONDS:
+    day_fraction += day_fraction * (day_length - DAY_SECONDS) / DAY_SECONDS
+  (hour, minute, second, fraction) = _day_fraction_to_time(num_decimals, day_fraction)
+  if hour > 23:
+    if day_length == DAY_SECONDS or second > 0:
+      (next_year, next_month, next_day, _) = _julian_day_parts_to_calendar(d1 + 1.5, d2 - day_fraction)
+      return (next_year, next_month, next_day, 0, 0, 0, 0)
+    # Within the leap second - ie. 23:59:60.xxx
+    (hour, minute, second) = (23, 59, 60)
+  return (year, month, day, hour, minute, second, fraction)
+
+
+def civil_to_julian_day(year, month, day, hour=0, minute=0, second=0.0):
+  """Julian day of the given UTC date and time (eraDtf2d, with astropy's normalization)."""
+  day_length = _get_day_length(year, month, day)
+  day_fraction = (60.0 * float(60 * hour + minute) + second) / day_length
+  (d1, d2) = _day_frac(MJD_ZERO + _get_modified_julian_day_number(year, month, day), day_fraction)
+  return d1 + d2
+
+
+def julian_day_to_weekday(jd):
+  """Weekday (Sunday being 0) of the UTC date of jd (rounded to the microsecond)."""
+  (year, month, day) = julian_day_to_civil(jd=jd, num_decimals=6)[:3]
+  return (int(_get_modified_julian_day_number(year, month, day)) + 3) % 7
+
+
+def _dnint_array(a):
+  return numpy.where(numpy.abs(a) < 0.5, 0.0, numpy.where(a < 0.0, numpy.ceil(a - 0.5), numpy.floor(a + 0.5)))
+
+
+def _two_sum_array(a, b):
+  x = a + b
+  eb = x - a
+  ea = x - eb
+  eb = b - eb
+  ea = a - ea
+  return (x, ea + eb)
+
+
+def _day_frac_array(val1, val2):
+  (sum12, err12) = _two_sum_array(val1, val2)
+  day = numpy.round(sum12)
+  (extra, frac) = _two_sum_array(sum12, -day)
+  frac += extra + err12
+  day += numpy.round(frac)
+  (extra, frac) = _two_sum_array(sum12, -day)
+  frac += extra + err12
+  return (day, frac)
+
+
+def _get_modified_julian_day_numbers(years, months, days):
+  my = -((14 - months) // 12)
+  iypmy = years + my
+  return ((1461 * (iypmy + 4800)) // 4 + (367 * (months - 2 - 12 * my)) // 12 - (3 * ((iypmy + 4900) // 100)) // 4 + days - 2432076).astype(float)
+
+
+def _get_day_lengths(modified_julian_day_numbers):
+  return numpy.where(numpy.isin(modified_julian_day_numbers, _LEAP_SECOND_MJDS), DAY_SECONDS + 1, DAY_SECONDS)
+
+
+def julian_days_to_civil(jds, num_decimals=9):
+  """Vectorized julian_day_to_civil.
+
+  :param jds: numpy array (or any sequence) of julian days.
+  :return: (years, months, days, hours, minutes, seconds, fractions) - int numpy arrays, of the same shape as jds.
+  """
+  jds = numpy.asarray(jds, dtype=float)
+  (d1, d2) = _day_frac_array(jds, numpy.zeros_like(jds))
+  # The day fractions d2 lie within [-0.5, 0.5] - so the calendar day is that of the integral julian day d1, unless the fraction rounds to 1.0 (handled below, with the rounding of the time).
+  jd_numbers = d1.astype(numpy.int64) + (d2 >= 0.5)
+  day_fractions = numpy.where(d2 >= 0.5, d2 - 0.5, d2 + 0.5)
+  modified_julian_day_numbers = (jd_numbers - 2400001).astype(float)
+  day_lengths = _get_day_lengths(modified_julian_day_numbers)
+  day_fractions = day_fractions + day_fractions * (day_lengths - DAY_SECONDS) / DAY_SECONDS
+  resolution = float(10 ** num_decimals)
+  a = _dnint_array(resolution * (DAY_SECONDS * numpy.abs(day_fractions)))
+  # Rounding into the next day - except within a leap second.
+  next_day = a >= resolution * day_lengths
+  jd_numbers = jd_numbers + next_day
+  a = numpy.where(next_day, 0.0, a)
+  in_leap_second = a >= resolution * DAY_SECONDS
+  a = numpy.where(in_leap_second, a - resolution, a)
+  hours = numpy.trunc(a / (resolution * 3600.0))
+  a -= hours * resolution * 3600.0
+  minutes = numpy.trunc(a / (resolution * 60.0))
+  a -= minutes * resolution * 60.0
+  seconds = numpy.trunc(a / resolution)
+  fractions = a - seconds * resolution
+  seconds = seconds + in_leap_second
+  (years, months, days) = julian_day_numbers_to_calendar(jd_numbers)
+  return (years, months, days, hours.astype(int), minutes.astype(int), seconds.astype(int), fractions.astype(numpy.int64))
+
+
+def julian_day_numbers_to_calendar(jd_numbers):
+  """Gregorian calendar dates of (integral) julian day numbers - as in eraJd2cal.
+
+  :param jd_numbers: int numpy array.
+  :return: (years, months, days) - int numpy arrays.
+  """
+  l = jd_numbers + 68569
+  n = (4 * l) // 146097
+  l = l - (146097 * n + 3) // 4
+  i = (4000 * (l + 1)) // 1461001
+  l = l - (1461 * i) // 4 + 31
+  k = (80 * l) // 2447
+  days = l - (2447 * k) // 80
+  l = k // 11
+  months = k + 2 - 12 * l
+  years = 100 * (n - 49) + i + l
+  return (years, months, days)
+
+
+def civil_to_julian_days(years, months, days, hours=0, minutes=0, seconds=0.0):
+  """Vectorized civil_to_julian_day.
+
+  :return: numpy array of julian days.
+  """
+  (years, months, days, hours, minutes) = [numpy.asarray(x, dtype=numpy.int64) for x in (years, months, days, hours, minutes)]
+  seconds = numpy.asarray(seconds, dtype=float)
+  modified_julian_day_numbers = _get_modified_julian_day_numbers(years, months, days)
+  day_fractions = (60.0 * (60 * hours + minutes).astype(float) + seconds) / _get_day_lengths(modified_julian_day_numbers)
+  (d1, d2) = _day_frac_array(MJD_ZERO + modified_julian_day_numbers, day_fractions)
+  return d1 + d2
+
+
+_LEAP_SECOND_DAY_SET = frozenset(LEAP_SECOND_DAYS)
+_LEAP_SECOND_MJDS = numpy.array([_get_modified_julian_day_number(*leap_second_day) for leap_second_day in LEAP_SECOND_DAYS])
@@ -5,7 +5,7 @@ from jyotisha.panchaanga.temporal import zodiac, tithi, time
 from jyotisha.panchaanga.temporal.zodiac import NakshatraDivision, AngaSpanFinder, Ayanamsha
 from sanskrit_data.schema import common
 from sanskrit_data.schema.common import JsonObject
-from jyotisha.panchaanga.temporal.zodiac.angas import AngaType
+from jyotisha.panchaanga.temporal.zodiac.angas import AngaType, Anga
 
 
 class LunarMonthAssigner(JsonObject):
@@ -16,7 +16,11 @@ class LunarMonthAssigner(JsonObject):
     super().__init__()
     self.ayanaamsha_id = ayanaamsha_id
 
-  def get_month_sunrise(self, daily_panchaanga):
+  def get_month_sunrise(self, daily_panchaanga, anga_timeline=None):
+    """
+
+    :param anga_timeline: Optional AngaTimeline, which assigners may look up anga spans from (rather than root finding afresh).
+    """
     pass
 
   @classmethod
@@ -34,21 +38,26 @@ class MultiNewmoonSolarMonthAdhikaAssigner(LunarMonthAssigner):
   
   प्रचलितायाम् अर्वाचीनायां पद्धतौ अर्वाचीनस्य राशिविभाजने आधृतस्य सौरमासस्य सङ्क्रान्तिं स्वीकृत्य “असङ्क्रान्ति-मासो ऽधिमास” इति परिभाषया अधिकमासगणना क्रियते ।
   """
-  def get_month_sunrise(self, daily_panchaanga):
+  def get_month_sunrise(self, daily_panchaanga, anga_timeline=None):
     """ Assigns Lunar months to days in the period
     
     Implementation note: Works by looking at solar months and new moons (which makes it easy to deduce adhika-mAsa-s.)
     
+    :param anga_timeline: Optional AngaTimeline, to look up new moons from (where it covers them).
     :return: 
     """
     # tithi_at_sunrise gives a rough indication of the number of days since last new moon. We now find a more precise interval below.
     anga_finder = zodiac.AngaSpanFinder.get_cached(ayanaamsha_id=Ayanamsha.ASHVINI_STARTING_0, anga_type=zodiac.AngaType.TITHI)
 
-    last_new_moon = anga_finder.find(
-      jd1=daily_panchaanga.jd_sunrise - daily_panchaanga.sunrise_day_angas.tithi_at_sunrise.index - 3, jd2=daily_panchaanga.jd_sunrise - daily_panchaanga.sunrise_day_angas.tithi_at_sunrise.index + 3, target_anga_id=30)
-    this_new_moon = anga_finder.find(
-      jd1=last_new_moon.jd_start + 24, jd2=last_new_moon.jd_start + 32,
-      target_anga_id=30)
+    def find_new_moon(jd1, jd2):
+      if anga_timeline is not None and anga_timeline.covers(jd1=jd1, jd2=jd2, anga_type=zodiac.AngaType.TITHI):
+        return anga_timeline.find(anga_type=zodiac.AngaType.TITHI, jd1=jd1, jd2=jd2, target_anga=Anga.get_cached(index=30, anga_type_id=zodiac.AngaType.TITHI.name))
+      return anga_finder.find(jd1=jd1, jd2=jd2, target_anga_id=30)
+
+    last_new_moon = find_new_moon(
+      jd1=daily_panchaanga.jd_sunrise - daily_panchaanga.sunrise_day_angas.tithi_at_sunrise.index - 3, jd2=daily_panchaanga.jd_sunrise - daily_panchaanga.sunrise_day_angas.tithi_at_sunrise.index + 3)
+    this_new_moon = find_new_moon(
+      jd1=last_new_moon.jd_start + 24, jd2=last_new_moon.jd_start + 32)
     last_new_moon_solar_raashi = NakshatraDivision(last_new_moon.jd_end, ayanaamsha_id=self.ayanaamsha_id).get_solar_raashi()
     this_new_moon_solar_raashi = NakshatraDivision(this_new_moon.jd_end, ayanaamsha_id=self.ayanaamsha_id).get_solar_raashi()
     is_adhika = last_new_moon_solar_raashi == this_new_moon_solar_raashi
@@ -103,9 +112,10 @@ class SolsticePostDark10AdhikaAssigner(LunarMonthAssigner):
         lunar_month = cls._month_from_previous_jd_month(jd=solstice_tropical_month_span.jd_start, prev_jd=prev_solstice_tropical_month_span.jd_start, prev_jd_month=prev_solstice_lunar_month )
         return lunar_month
 
-  def get_month_sunrise(self, daily_panchaanga):
+  def get_month_sunrise(self, daily_panchaanga, anga_timeline=None):
     """ Assigns Lunar months to days in the period
         
+    :param anga_timeline: Unused.
     :return: 
     """
     solstice_tropical_month_span = zodiac.get_previous_solstice(jd=daily_panchaanga.jd_sunrise)
@@ -3,12 +3,15 @@ import datetime as dt_module
 import logging
 import sys
 import traceback
-from math import modf
+from bisect import bisect_right
+from math import modf, inf
 from numbers import Number
 
+import methodtools
+import numpy
 import pytz
-from astropy.time import Time
 
+from jyotisha.panchaanga.temporal import julian_day
 from jyotisha.util import zero_if_none
 from sanskrit_data.schema import common
 from sanskrit_data.schema.common import JsonObject
@@ -131,6 +134,11 @@ class BasicDateWithTransitions(BasicDate):
 
 
 class Date(BasicDate):
+  """A (gregorian) date, optionally with a time of the day.
+
+  Comparisons, hashing and day arithmetic work on an integer key - (day ordinal, microsecond of the day) - computed once and cached (in _ordinal_key, which is not serialized). The serialized form (year, month, day, hour, minute, second) is unchanged.
+  """
+
   def __init__(self, year, month, day, hour=None, minute=None, second=None):
     super(Date, self).__init__(year=year, month=month, day=day)
     self.hour = hour
@@ -142,22 +150,43 @@ class Date(BasicDate):
     self.hour = None
     self.minute = None
     self.second = None
+    self._ordinal_key = None
+
+  def _get_ordinal_key(self):
+    # An unset attribute (as in deserialized objects) reads as None - see JsonObject.__getattr__.
+    ordinal_key = self._ordinal_key
+    if ordinal_key is None:
+      ordinal_key = (dt_module.date(self.year, self.month, self.day).toordinal(), ((zero_if_none(self.hour) * 60 + zero_if_none(self.minute)) * 60 + int(zero_if_none(self.second))) * 1000000 + self.get_microseconds())
+      self._ordinal_key = ordinal_key
+    return ordinal_key
+
+  def get_ordinal(self):
+    """Proleptic gregorian ordinal of the date - as in datetime.date.toordinal()."""
+    return self._get_ordinal_key()[0]
 
   def to_datetime(self):
     return datetime.datetime(year=self.year, month=self.month, day=self.day, hour=zero_if_none(self.hour), minute=zero_if_none(self.minute), second=int(zero_if_none(self.second)), microsecond=self.get_microseconds())
 
   def __sub__(self, other):
     if isinstance(other, Date):
-      dt_diff = self.to_datetime() - other.to_datetime()
-      return dt_diff.days + dt_diff.seconds / 3600.0 + dt_diff.microseconds / 60.0 / 1e6
+      (ordinal, microsecond_of_day) = self._get_ordinal_key()
+      (other_ordinal, other_microsecond_of_day) = other._get_ordinal_key()
+      # Normalized as in datetime.timedelta.
+      (days, microseconds) = divmod((ordinal - other_ordinal) * 86400000000 + microsecond_of_day - other_microsecond_of_day, 86400000000)
+      (seconds, microseconds) = divmod(microseconds, 1000000)
+      return days + seconds / 3600.0 + microseconds / 60.0 / 1e6
     elif isinstance(other, Number):
       return self.offset_date(days=-other)
 
   def __lt__(self, other):
-    return self.to_datetime() < other.to_datetime()
+    if not isinstance(other, Date):
+      return super(Date, self).__lt__(other)
+    return self._get_ordinal_key() < other._get_ordinal_key()
 
   def __eq__(self, other):
-    return self.to_datetime() == other.to_datetime()
+    if not isinstance(other, Date):
+      return super(Date, self).__eq__(other)
+    return self._get_ordinal_key() == other._get_ordinal_key()
 
   def __add__(self, other):
     if isinstance(other, Number):
@@ -168,6 +197,17 @@ class Date(BasicDate):
     return Date(year=dt.year, month=dt.month, day=dt.day, hour=dt.hour, minute=dt.minute, second=dt.second + dt.microsecond / float(1e6))
 
   def offset_date(self, **kwargs):
+    days = kwargs.get("days", 0)
+    if set(kwargs) == {"days"} and days == int(days):
+      # A whole number of days - the time of the day remains the same.
+      (ordinal, microsecond_of_day) = self._get_ordinal_key()
+      offset_day = dt_module.date.fromordinal(ordinal + int(days))
+      (seconds, microsecond) = divmod(microsecond_of_day, 1000000)
+      (hour, seconds) = divmod(seconds, 3600)
+      (minute, second) = divmod(seconds, 60)
+      offset_date = Date(year=offset_day.year, month=offset_day.month, day=offset_day.day, hour=hour or None, minute=minute or None, second=(second + microsecond / float(1e6)) or None)
+      offset_date._ordinal_key = (ordinal + int(days), microsecond_of_day)
+      return offset_date
     dt = self.to_datetime()
     offset_dt = dt + datetime.timedelta(**kwargs)
     offset_date = Date.from_datetime(dt=offset_dt)
@@ -193,7 +233,8 @@ class Date(BasicDate):
     return [self.year, self.month, self.day, fractional_hour]
 
   def get_weekday(self):
-    return dt_module.date(year=self.year, month=self.month, day=self.day).isoweekday() % 7
+    # Ordinal 1 (0001-01-01) was a monday. Sunday should be 0.
+    return self.get_ordinal() % 7
 
   def sanitize(self):
     (year, month, day, hour, minute, second) = (self.year, self.month, self.day, self.hour, self.minute, self.second)
@@ -216,13 +257,14 @@ class Date(BasicDate):
       year = year + (month - 1) / 12
       month = ((month - 1) % 12) + 1
     (self.year, self.month, self.day, self.hour, self.minute, self.second) = (year, month, day, hour, minute, second)
+    self._ordinal_key = None
     return self.as_tuple()
 
   def __repr__(self):
     return repr(self.to_datetime())
 
   def __hash__(self):
-    return hash(repr(self))
+    return hash(self._get_ordinal_key())
 
   def get_date_str(self):
     return super(Date, self).__repr__()
@@ -232,42 +274,117 @@ class Date(BasicDate):
 
 
 def jd_to_utc_gregorian(jd):
-  tm = Time(jd, format='jd')
-  tm.format = "ymdhms"
-  return Date(year=int(tm.value["year"]), month=int(tm.value["month"]), day=int(tm.value["day"]),
-              hour=int(tm.value["hour"]), minute=int(tm.value["minute"]), second=tm.value["second"])
+  (year, month, day, hour, minute, second, nanoseconds) = julian_day.julian_day_to_civil(jd=jd, num_decimals=9)
+  return Date(year=year, month=month, day=day, hour=hour, minute=minute, second=second + nanoseconds * 10 ** (-9))
+
+
+def jds_to_utc_gregorian(jds):
+  """Vectorized jd_to_utc_gregorian.
+
+  :param jds: numpy array (or any sequence) of julian days.
+  :return: A list of Date-s.
+  """
+  (years, months, days, hours, minutes, seconds, nanoseconds) = [x.ravel().tolist() for x in julian_day.julian_days_to_civil(jds=jds, num_decimals=9)]
+  return [Date(year=year, month=month, day=day, hour=hour, minute=minute, second=second + nanosecond_count * 10 ** (-9)) for (year, month, day, hour, minute, second, nanosecond_count) in zip(years, months, days, hours, minutes, seconds, nanoseconds)]
 
 
 def utc_gregorian_to_jd(date):
   if date.hour is None:
     date.set_time_to_day_start()
-  tm = Time(
-    {"year": date.year, "month": date.month, "day": date.day, "hour": zero_if_none(date.hour), "minute": zero_if_none(date.minute), "second": zero_if_none(date.second)},
-    format='ymdhms')
-  tm.format = "jd"
-  return tm.value
+  return julian_day.civil_to_julian_day(year=date.year, month=date.month, day=date.day, hour=zero_if_none(date.hour), minute=zero_if_none(date.minute), second=zero_if_none(date.second))
 
 
 def get_weekday(jd):
-  tm = Time(jd, format='jd')
-  tm.format = "datetime"
   # Sunday should be 0.
-  return tm.value.isocalendar()[2] % 7
+  return julian_day.julian_day_to_weekday(jd=jd)
+
+
+def _jd_to_utc_datetime(jd):
+  (year, month, day, hour, minute, second, microseconds) = julian_day.julian_day_to_civil(jd=jd, num_decimals=6)
+  return datetime.datetime(year, month, day, hour, minute, second, microseconds)
+
+
+class UtcOffsetTable(object):
+  """Sorted UTC offset transitions (daylight saving and otherwise) of a timezone, from the tz database (as compiled by pytz - till 2037, the last offset continuing thereafter).
+
+  Answers offset queries by binary search - the same way pytz's fromutc and localize do, minus the timezone lookup and per-call overheads. Shared by all Timezone objects with the same id (see get_cached).
+  """
+
+  def __init__(self, timezone_id):
+    self.timezone_id = timezone_id
+    tz = pytz.timezone(timezone_id)
+    if hasattr(tz, "_utc_transition_times"):
+      self.transition_datetimes = list(tz._utc_transition_times)
+      self.tzinfos = [tz._tzinfos[transition_info] for transition_info in tz._transition_info]
+    else:
+      # Timezones with a fixed offset (including UTC).
+      self.transition_datetimes = [datetime.datetime.min]
+      self.tzinfos = [tz]
+    self.offsets = [tzinfo._utcoffset for tzinfo in self.tzinfos]
+    self.offset_seconds = numpy.array([offset.total_seconds() for offset in self.offsets])
+    # The first transition (at datetime.min) stands for "since ever".
+    self.transition_jds = [-inf] + [julian_day.civil_to_julian_day(year=t.year, month=t.month, day=t.day, hour=t.hour, minute=t.minute, second=t.second) for t in self.transition_datetimes[1:]]
+
+  @methodtools.lru_cache(maxsize=None)
+  @classmethod
+  def get_cached(cls, timezone_id):
+    return UtcOffsetTable(timezone_id=timezone_id)
+
+  def get_index(self, jd):
+    return bisect_right(self.transition_jds, jd) - 1
+
+  def get_indices(self, jds):
+    return numpy.searchsorted(self.transition_jds, jds, side="right") - 1
+
+  def _get_index_for_utc_datetime(self, utc_datetime):
+    return max(0, bisect_right(self.transition_datetimes, utc_datetime) - 1)
+
+  def utc_to_local(self, utc_datetime):
+    """Same as pytz's fromutc.
+
+    :param utc_datetime: naive UTC datetime.
+    :return: timezone-aware local datetime.
+    """
+    index = self._get_index_for_utc_datetime(utc_datetime=utc_datetime)
+    return (utc_datetime + self.offsets[index]).replace(tzinfo=self.tzinfos[index])
+
+  def local_to_utc(self, local_datetime):
+    """Same as pytz's localize (with is_dst=False) - ambiguous local times are taken to be in standard time, and non-existent ones (skipped when clocks move forward) to be in the offset preceding the change.
+
+    :param local_datetime: naive local datetime.
+    :return: naive UTC datetime.
+    """
+    utc_datetime_to_index = {}
+    for delta in (datetime.timedelta(days=-1), datetime.timedelta(days=1)):
+      index = self._get_index_for_utc_datetime(utc_datetime=local_datetime + delta)
+      utc_datetime = local_datetime - self.offsets[index]
+      if self.offsets[self._get_index_for_utc_datetime(utc_datetime=utc_datetime)] == self.offsets[index]:
+        utc_datetime_to_index.setdefault(utc_datetime, index)
+    if len(utc_datetime_to_index) == 0:
+      six_hours = datetime.timedelta(hours=6)
+      return self.local_to_utc(local_datetime=local_datetime - six_hours) + six_hours
+    if len(utc_datetime_to_index) > 1:
+      standard_time_utc_datetimes = [utc_datetime for (utc_datetime, index) in utc_datetime_to_index.items() if not self.tzinfos[index]._dst]
+      if len(standard_time_utc_datetimes) == 1:
+        return standard_time_utc_datetimes[0]
+    return max(utc_datetime_to_index.keys())
 
 
 class Timezone:
   def __init__(self, timezone_id):
     self.timezone_id = timezone_id
 
+  def _get_offset_table(self):
+    return UtcOffsetTable.get_cached(timezone_id=self.timezone_id)
+
   def get_timezone_offset_hours_from_jd(self, jd: float):
     """Get timezone offset in hours east of UTC (negative west of UTC)
 
     Timezone offset is dependent both on place and time (yes- time, not just date) - due to Daylight savings time.
     compute offset from UTC in hours
     """
-    local_datetime = self.julian_day_to_local_datetime(jd=jd)
-    return (datetime.datetime.utcoffset(local_datetime).days * 86400 +
-            datetime.datetime.utcoffset(local_datetime).seconds) / 3600.0
+    offset_table = self._get_offset_table()
+    return offset_table.offset_seconds[offset_table.get_index(jd=jd)] / 3600.0
 
   def julian_day_to_local_time(self, julian_day: float, round_seconds: bool = False) -> Date:
     local_datetime = self.julian_day_to_local_datetime(jd=julian_day)
@@ -279,24 +396,36 @@ class Timezone:
       local_time = Date(y, m, dt, hours, minutes, int(round(seconds)))
     return local_time
 
+  def julian_days_to_local_times(self, jds):
+    """Vectorized julian_day_to_local_time.
+
+    :param jds: numpy array (or any sequence) of julian days.
+    :return: A list of Date-s.
+    """
+    jds = numpy.asarray(jds, dtype=float).ravel()
+    (years, months, days, hours, minutes, seconds, microseconds) = julian_day.julian_days_to_civil(jds=jds, num_decimals=6)
+    offset_table = self._get_offset_table()
+    # Microseconds since the start of the julian day number 0 - exact integer arithmetic, as with datetime.
+    jd_numbers = (julian_day.civil_to_julian_days(years, months, days) + 0.5).astype(numpy.int64)
+    local_microseconds = (((jd_numbers * 24 + hours) * 60 + minutes) * 60 + seconds) * 1000000 + microseconds + (offset_table.offset_seconds[offset_table.get_indices(jds=jds)] * 1000000).astype(numpy.int64)
+    (local_jd_numbers, microseconds_of_day) = numpy.divmod(local_microseconds, 86400 * 1000000)
+    (years, months, days) = julian_day.julian_day_numbers_to_calendar(local_jd_numbers)
+    (seconds_of_day, microseconds) = numpy.divmod(microseconds_of_day, 1000000)
+    (hours, seconds_of_day) = numpy.divmod(seconds_of_day, 3600)
+    (minutes, seconds) = numpy.divmod(seconds_of_day, 60)
+    return [Date(year, month, day, hour, minute, second + microsecond / 1000000.0) for (year, month, day, hour, minute, second, microsecond) in zip(years.tolist(), months.tolist(), days.tolist(), hours.tolist(), minutes.tolist(), seconds.tolist(), microseconds.tolist())]
+
   def julian_day_to_local_datetime(self, jd):
-    tm = Time(jd, format='jd')
-    tm.format = "datetime"
-    return pytz.timezone(self.timezone_id).fromutc(tm.value)
+    return self._get_offset_table().utc_to_local(utc_datetime=_jd_to_utc_datetime(jd=jd))
 
   def local_time_to_julian_day(self, date):
     microseconds, _ = modf(zero_if_none(date.second) * 1000000)
-    local_datetime = pytz.timezone(self.timezone_id).localize(
-      datetime.datetime(date.year, date.month, date.day, zero_if_none(date.hour), zero_if_none(date.minute), int(zero_if_none(date.second)), int(microseconds)))
-    tm = Time(local_datetime, format="datetime")
-    tm.format = "jd"
-    return tm.value
+    local_datetime = datetime.datetime(date.year, date.month, date.day, zero_if_none(date.hour), zero_if_none(date.minute), int(zero_if_none(date.second)), int(microseconds))
+    utc_datetime = self._get_offset_table().local_to_utc(local_datetime=local_datetime)
+    return julian_day.civil_to_julian_day(year=utc_datetime.year, month=utc_datetime.month, day=utc_datetime.day, hour=utc_datetime.hour, minute=utc_datetime.minute, second=utc_datetime.second + utc_datetime.microsecond / 1e6)
 
   def julian_day_to_local_time_str(self, jd):
-    tm = Time(jd, format='jd')
-    tm.format = "datetime"
-    local_datetime = pytz.timezone(self.timezone_id).fromutc(tm.value)
-    return str(local_datetime)
+    return str(self.julian_day_to_local_datetime(jd=jd))
 
 
 
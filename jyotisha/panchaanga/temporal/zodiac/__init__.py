@@ -30,10 +30,11 @@ class Ayanamsha(common.JsonObject):
   rAShTriya panchAnga nakshatra ayanAmsha vs chitra at 180 :
   - Shaves off 3 seconds from typical panchaanga computation compared to precise chitrA tracking.
   - rAShTriya panchAnga nakshatra ayanAmsha tracks chitra fairly well. Still, it results in ~5 minutes differences in nakshatra spans.
-  - chitrA does not move a lot in typical year, and it is mostly wasteful to compute its position fresh for every instant.
+  - chitrA does not move a lot in typical year, and it is mostly wasteful to compute its position fresh for every instant. Hence CHITRA_AT_180_TABULATED, which interpolates chitrA positions from a per-process table (see body.StarLongitudeTable).
   """
   VERNAL_EQUINOX_AT_0 = "VERNAL_EQUINOX_AT_0"
   CHITRA_AT_180 = "CHITRA_AT_180"
+  CHITRA_AT_180_TABULATED = "CHITRA_AT_180_TABULATED"
   ASHVINI_STARTING_0 = "ASHVINI_STARTING_0"
   RASHTRIYA_PANCHANGA_NAKSHATRA_TRACKING = "RASHTRIYA_PANCHANGA_NAKSHATRA_TRACKING"
 
@@ -53,6 +54,9 @@ class Ayanamsha(common.JsonObject):
       # TODO: The below fails due to https://github.com/astrorigin/pyswisseph/issues/35
       from jyotisha.panchaanga.temporal import body
       return body.get_star_longitude(star="Spica", jd=jd) - 180
+    elif self.ayanaamsha_id == Ayanamsha.CHITRA_AT_180_TABULATED:
+      from jyotisha.panchaanga.temporal import body
+      return body.StarLongitudeTable.singleton(star="Spica").get_longitude(jd=jd) - 180
     elif self.ayanaamsha_id == Ayanamsha.ASHVINI_STARTING_0:
       return 0
     elif self.ayanaamsha_id == Ayanamsha.RASHTRIYA_PANCHANGA_NAKSHATRA_TRACKING:
@@ -60,9 +64,79 @@ class Ayanamsha(common.JsonObject):
       return swe.get_ayanamsa_ut(jd)
     raise Exception("Bad ayamasha_id")
 
+  def get_offsets(self, jds):
+    """Batch version of get_offset.
+    
+    :param jds: numpy array (or any sequence) of julian days.
+    :return: numpy array of offsets, of the same shape as jds.
+    """
+    jds = numpy.asarray(jds, dtype=float)
+    if self.ayanaamsha_id in (Ayanamsha.VERNAL_EQUINOX_AT_0, Ayanamsha.ASHVINI_STARTING_0):
+      return numpy.zeros(jds.shape)
+    elif self.ayanaamsha_id == Ayanamsha.CHITRA_AT_180:
+      from jyotisha.panchaanga.temporal import body
+      return body.get_star_longitudes(star="Spica", jds=jds) - 180
+    elif self.ayanaamsha_id == Ayanamsha.CHITRA_AT_180_TABULATED:
+      from jyotisha.panchaanga.temporal import body
+      return body.StarLongitudeTable.singleton(star="Spica").get_longitudes(jds=jds) - 180
+    elif self.ayanaamsha_id == Ayanamsha.RASHTRIYA_PANCHANGA_NAKSHATRA_TRACKING:
+      swe.set_sid_mode(swe.SIDM_LAHIRI)
+      return numpy.fromiter((swe.get_ayanamsa_ut(jd) for jd in jds.flat), dtype=float, count=jds.size).reshape(jds.shape)
+    raise Exception("Bad ayamasha_id")
+
+
+class SkyState(object):
+  """Graha longitudes and ayanaamsha offsets at an instant - each computed (lazily) only once. All angas at that instant are derived from these arithmetically.
+  
+  Use get_cached for instants which are queried repeatedly (sunrise, sunset, kaala boundaries ...). The hit/miss counters are available via SkyState.get_cached.cache_info().
+  """
+
+  def __init__(self, jd):
+    self.jd = jd
+    self.body_to_tropical_longitude = {}
+    self.ayanaamsha_id_to_offset = {}
+
+  @methodtools.lru_cache(maxsize=4096)
+  @classmethod
+  def get_cached(cls, jd):
+    return SkyState(jd=jd)
+
+  def get_ayanaamsha_offset(self, ayanaamsha_id):
+    offset = self.ayanaamsha_id_to_offset.get(ayanaamsha_id, None)
+    if offset is None:
+      offset = Ayanamsha.singleton(ayanaamsha_id).get_offset(self.jd)
+      self.ayanaamsha_id_to_offset[ayanaamsha_id] = offset
+    return offset
+
+  def get_longitude(self, body_name, ayanaamsha_id=None):
+    """Same as Graha.get_longitude."""
+    longitude = self.body_to_tropical_longitude.get(body_name, None)
+    if longitude is None:
+      longitude = Graha.singleton(body_name).get_longitude(self.jd)
+      self.body_to_tropical_longitude[body_name] = longitude
+    if ayanaamsha_id is None:
+      return longitude
+    return (longitude - self.get_ayanaamsha_offset(ayanaamsha_id=ayanaamsha_id)) % 360
+
+  def get_anga_float(self, anga_type, ayanaamsha_id):
+    """Same as NakshatraDivision.get_anga_float."""
+    if anga_type == AngaType.TITHI:
+      # For efficiency - avoid lookups.
+      ayanaamsha_id = Ayanamsha.VERNAL_EQUINOX_AT_0
+
+    lcalc = 0  # computing offset longitudes
+    if anga_type.weight_moon != 0:
+      lcalc += anga_type.weight_moon * self.get_longitude(Graha.MOON, ayanaamsha_id=ayanaamsha_id)
+    if anga_type.weight_sun != 0:
+      lcalc += anga_type.weight_sun * self.get_longitude(Graha.SUN, ayanaamsha_id=ayanaamsha_id)
+    return (lcalc % 360) / anga_type.arc_length
+
 
 class NakshatraDivision(common.JsonObject):
-  """Nakshatra division at a certain time, according to a certain ayanaamsha."""
+  """Nakshatra division at a certain time, according to a certain ayanaamsha.
+  
+  Longitudes come from SkyState.get_cached - so that the various angas at an instant don't each call Swiss Ephemeris afresh.
+  """
 
   def __init__(self, jd, ayanaamsha_id):
     super().__init__()
@@ -75,7 +149,7 @@ class NakshatraDivision(common.JsonObject):
     :param body: graha ID.
     :return: 0.x for AshvinI and so on.
     """
-    longitude = body.get_longitude(self.jd, ayanaamsha_id=self.ayanaamsha_id)
+    longitude = SkyState.get_cached(jd=self.jd).get_longitude(body.body_name, ayanaamsha_id=self.ayanaamsha_id)
     return self.longitude_to_fractional_division(longitude=longitude, anga_type=anga_type)
 
   def get_equatorial_boundary_coordinates(self):
@@ -118,28 +192,32 @@ class NakshatraDivision(common.JsonObject):
       Returns:
         float anga
     """
-    if anga_type == AngaType.TITHI:
-      # For efficiency - avoid lookups.
-      ayanaamsha_id = Ayanamsha.VERNAL_EQUINOX_AT_0
-    else:
-      ayanaamsha_id = self.ayanaamsha_id
+    return SkyState.get_cached(jd=self.jd).get_anga_float(anga_type=anga_type, ayanaamsha_id=self.ayanaamsha_id)
 
-    w_moon = anga_type.weight_moon
-    w_sun = anga_type.weight_sun
-
-    lcalc = 0  # computing offset longitudes
+  @classmethod
+  def get_anga_floats(cls, jds, anga_type, ayanaamsha_id):
+    """Batch version of get_anga_float - useful for sampling a long period (say a year) in one go.
 
-    #  Get the lunar longitude, starting at the ayanaamsha point in the ecliptic.
-    if w_moon != 0:
-      lmoon = Graha.singleton(Graha.MOON).get_longitude(self.jd, ayanaamsha_id=ayanaamsha_id)
-      lcalc += w_moon * lmoon
+      Args:
+        :param jds: numpy array (or any sequence) of julian days
+        :param anga_type: One of the pre-defined tuple-valued constants in the panchaanga
+        class, such as TITHI, nakshatra, YOGA, KARANA or SIDEREAL_MONTH
+        :param ayanaamsha_id
 
-    #  Get the solar longitude, starting at the ayanaamsha point in the ecliptic.
-    if w_sun != 0:
-      lsun = Graha.singleton(Graha.SUN).get_longitude(self.jd, ayanaamsha_id=ayanaamsha_id)
-      lcalc += w_sun * lsun
+      Returns:
+        numpy array of float angas
+    """
+    if anga_type == AngaType.TITHI:
+      # For efficiency - avoid lookups.
+      ayanaamsha_id = Ayanamsha.VERNAL_EQUINOX_AT_0
 
-    return self.longitude_to_fractional_division(longitude=lcalc, anga_type=anga_type)
+    jds = numpy.asarray(jds, dtype=float)
+    lcalc = numpy.zeros(jds.shape)
+    if anga_type.weight_moon != 0:
+      lcalc += anga_type.weight_moon * Graha.singleton(Graha.MOON).get_longitudes(jds, ayanaamsha_id=ayanaamsha_id)
+    if anga_type.weight_sun != 0:
+      lcalc += anga_type.weight_sun * Graha.singleton(Graha.SUN).get_longitudes(jds, ayanaamsha_id=ayanaamsha_id)
+    return (lcalc % 360) / anga_type.arc_length
 
   def get_anga(self, anga_type):
     """Returns the anga prevailing at a particular time. Computed based on lunar and solar longitudes, division of a circle into a certain number of degrees (arc_len).
@@ -216,21 +294,47 @@ def ecliptic_to_equatorial(longitude, latitude):
 
 
 class AngaSpanFinder(JsonObject):
-  def __init__(self, ayanaamsha_id, anga_type):
+  # Step forward by half angas till the target anga is found, and then run brentq on the bracket.
+  BRACKETING = "BRACKETING"
+  # Newton steps (using the longitude speeds from swe.calc_ut) from the mean-period estimate straight to the boundary - with fallback to BRACKETING if these don't converge (as near stations).
+  NEWTON = "NEWTON"
+  NEWTON_MAX_ITERATIONS = 20
+  NEWTON_TOLERANCE_DAYS = 1e-8
+
+  def __init__(self, ayanaamsha_id, anga_type, ephemeris=None, solver=BRACKETING):
+    """
+
+    :param ephemeris: Optional ChebyshevEphemeris (see temporal.ephemeris), used for root finding within the period it covers. Each root so found is corrected with one exact Swiss Ephemeris evaluation.
+    :param solver: BRACKETING or NEWTON.
+    """
     super(AngaSpanFinder, self).__init__()
     self.ayanaamsha_id = ayanaamsha_id
     self.anga_type = anga_type
+    self.solver = solver
+    if ephemeris is not None and anga_type != AngaType.TITHI and ephemeris.ayanaamsha_id != ayanaamsha_id:
+      raise ValueError("ayanaamsha mismatch", (ephemeris.ayanaamsha_id, ayanaamsha_id))
+    # Underscored, so as to not be serialized.
+    self._ephemeris = ephemeris
 
   @methodtools.lru_cache(maxsize=None)
   @classmethod
-  def get_cached(cls, ayanaamsha_id, anga_type):
-    return AngaSpanFinder(ayanaamsha_id=ayanaamsha_id, anga_type=anga_type)
+  def get_cached(cls, ayanaamsha_id, anga_type, solver=BRACKETING):
+    return AngaSpanFinder(ayanaamsha_id=ayanaamsha_id, anga_type=anga_type, solver=solver)
+
+  def _uses_ephemeris(self, jd):
+    return self._ephemeris is not None and self._ephemeris.covers(jd)
+
+  def _get_anga_float(self, jd, exact=False):
+    if not exact and self._uses_ephemeris(jd=jd):
+      return self._ephemeris.get_anga_float(jd=jd, anga_type=self.anga_type)
+    # Root finding rarely revisits an instant - so SkyState.get_cached is bypassed.
+    return SkyState(jd=jd).get_anga_float(anga_type=self.anga_type, ayanaamsha_id=self.ayanaamsha_id)
 
   def _get_anga(self, jd):
-    return NakshatraDivision(jd, ayanaamsha_id=self.ayanaamsha_id).get_anga( anga_type=self.anga_type)
+    return Anga.get_cached(index=int(1 + floor(self._get_anga_float(jd=jd))), anga_type_id=self.anga_type.name)
 
-  def _get_anga_float_offset(self, jd, target_anga):
-    anga_float = NakshatraDivision(jd, ayanaamsha_id=self.ayanaamsha_id).get_anga_float(anga_type=self.anga_type)
+  def _get_anga_float_offset(self, jd, target_anga, exact=False):
+    anga_float = self._get_anga_float(jd=jd, exact=exact)
     num_angas = self.anga_type.num_angas
     if anga_float > target_anga.index:
       return anga_float - num_angas # A negative number
@@ -240,11 +344,68 @@ class AngaSpanFinder(JsonObject):
   def _interpolate_for_start(self, jd1, jd2, target_anga):
     try:
       # noinspection PyTypeChecker
-      return brentq(lambda x: self._get_anga_float_offset(jd=x, target_anga=target_anga), jd1, jd2)
+      jd_start = brentq(lambda x: self._get_anga_float_offset(jd=x, target_anga=target_anga), jd1, jd2)
     except ValueError:
       return None
+    if self._uses_ephemeris(jd=jd_start):
+      # A Newton step with the exact offset - removes the (tiny) approximation error to first order.
+      offset = self._get_anga_float_offset(jd=jd_start, target_anga=target_anga, exact=True)
+      jd_start -= offset / self._ephemeris.get_anga_speed(jd=jd_start, anga_type=self.anga_type)
+    return jd_start
+
+  def _get_anga_float_and_speed(self, jd):
+    if self.anga_type == AngaType.TITHI:
+      # For efficiency - avoid lookups.
+      ayanaamsha_id = Ayanamsha.VERNAL_EQUINOX_AT_0
+    else:
+      ayanaamsha_id = self.ayanaamsha_id
+    lcalc = 0
+    speed = 0
+    for (weight, body_name) in [(self.anga_type.weight_moon, Graha.MOON), (self.anga_type.weight_sun, Graha.SUN)]:
+      if weight != 0:
+        (longitude, longitude_speed) = Graha.singleton(body_name).get_longitude_and_speed(jd=jd, ayanaamsha_id=ayanaamsha_id)
+        lcalc += weight * longitude
+        speed += weight * longitude_speed
+    return ((lcalc % 360) / self.anga_type.arc_length, speed / self.anga_type.arc_length)
+
+  def _find_anga_start_newton(self, jd1, jd2, target_anga):
+    """
+
+    :return: (converged, jd_start) - where jd_start is None if target_anga does not start within [jd1, jd2].
+    """
+    num_angas = self.anga_type.num_angas
+    (anga_float, _) = self._get_anga_float_and_speed(jd=jd1)
+    # How far (in angas) jd1 is past the start of target_anga.
+    progress = (anga_float - (target_anga.index - 1)) % num_angas
+    if progress < 1:
+      # target_anga already prevails at jd1 - its next start (if within [jd1, jd2]) is left to the bracketing solver, for the two to agree.
+      return (False, None)
+    distance = num_angas - progress
+    jd = jd1 + distance * self.anga_type.mean_period_days / num_angas
+    for _ in range(self.NEWTON_MAX_ITERATIONS):
+      (anga_float, speed) = self._get_anga_float_and_speed(jd=jd)
+      if speed <= 0:
+        # Near a station.
+        return (False, None)
+      offset = (anga_float - (target_anga.index - 1) + num_angas / 2) % num_angas - num_angas / 2
+      step = offset / speed
+      jd -= step
+      if abs(step) < self.NEWTON_TOLERANCE_DAYS:
+        break
+    else:
+      return (False, None)
+    if jd < jd1 or jd - jd1 > 1.5 * (distance + 1) * self.anga_type.mean_period_days / num_angas:
+      # Converged to some other occurrence of the boundary.
+      return (False, None)
+    if jd > jd2:
+      return (True, None)
+    return (True, jd)
 
   def find_anga_start_between(self, jd1, jd2, target_anga):
+    if self.solver == AngaSpanFinder.NEWTON:
+      (converged, jd_start) = self._find_anga_start_newton(jd1=jd1, jd2=jd2, target_anga=target_anga)
+      if converged:
+        return jd_start
     jd_start = None
     num_angas = self.anga_type.num_angas
     min_step = 0.5 * self.anga_type.mean_period_days/num_angas  # Min Step for moving - half an anga span.
@@ -315,8 +476,64 @@ class AngaSpanFinder(JsonObject):
         jd_bracket_L = default_if_none(span.jd_start, jd_bracket_L) + self.anga_type.mean_period_days * (1 - 2.0 / self.anga_type.num_angas)
     return spans
 
+  def _get_derived_angas_in_period(self, jd1, jd2, parent_spans=None):
+    """get_all_angas_in_period for angas which exactly subdivide a parent anga (see AngaType.parent_type_name).
+    
+    Parent boundaries are child boundaries too; the rest are found by one brentq within each parent span.
+    """
+    parent_finder = AngaSpanFinder.get_cached(ayanaamsha_id=self.ayanaamsha_id, anga_type=self.anga_type.get_parent_type(), solver=self.solver)
+    if parent_spans is None:
+      parent_spans = parent_finder._get_angas_in_period_by_scan(jd1=jd1, jd2=jd2)
+    num_parent_angas = parent_finder.anga_type.num_angas
+    num_children = self.anga_type.get_num_angas_per_parent()
+
+    def get_progress(jd, parent_anga):
+      # Fraction of parent_anga elapsed at jd - continuous around the parent anga (even across the last-first anga wraparound).
+      anga_float = parent_finder._get_anga_float(jd=jd)
+      return (anga_float - (parent_anga.index - 1) + num_parent_angas / 2) % num_parent_angas - num_parent_angas / 2
+
+    boundaries = []
+    anga_now = None
+    for parent_span in parent_spans:
+      if parent_span.jd_start is None:
+        progress_start = get_progress(jd=jd1, parent_anga=parent_span.anga)
+      else:
+        progress_start = 0
+        boundaries.append(parent_span.jd_start)
+      if parent_span.jd_end is None:
+        progress_end = get_progress(jd=jd2, parent_anga=parent_span.anga)
+      else:
+        progress_end = 1
+      if anga_now is None:
+        child_index = min(max(int(floor(progress_start * num_children)), 0), num_children - 1)
+        anga_now = Anga.get_cached(index=(parent_span.anga.index - 1) * num_children + child_index + 1, anga_type_id=self.anga_type.name)
+      for child_index in range(1, num_children):
+        fraction = child_index / num_children
+        if progress_start < fraction <= progress_end:
+          # noinspection PyTypeChecker
+          boundaries.append(brentq(lambda x: get_progress(jd=x, parent_anga=parent_span.anga) - fraction, default_if_none(parent_span.jd_start, jd1), default_if_none(parent_span.jd_end, jd2)))
+
+    spans = []
+    jd_start = None
+    for jd_end in boundaries:
+      spans.append(AngaSpan(jd_start=jd_start, jd_end=jd_end, anga=anga_now))
+      anga_now = anga_now + 1
+      jd_start = jd_end
+    spans.append(AngaSpan(jd_start=jd_start, jd_end=None, anga=anga_now))
+    return spans
+
   @timebudget
-  def get_all_angas_in_period(self, jd1, jd2):
+  def get_all_angas_in_period(self, jd1, jd2, parent_spans=None):
+    """
+
+    :param parent_spans: For derived anga types (see AngaType.parent_type_name) - parent anga spans over the same period (as returned by get_all_angas_in_period), if already available.
+    :return: AngaSpan list - the first with jd_start None, the last with jd_end None.
+    """
+    if self.anga_type.parent_type_name is not None:
+      return self._get_derived_angas_in_period(jd1=jd1, jd2=jd2, parent_spans=parent_spans)
+    return self._get_angas_in_period_by_scan(jd1=jd1, jd2=jd2)
+
+  def _get_angas_in_period_by_scan(self, jd1, jd2):
     spans = []
     jd_start = None
     anga_now = self._get_anga(jd=jd1)
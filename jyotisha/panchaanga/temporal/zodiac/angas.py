@@ -22,10 +22,15 @@ class AngaType(common.JsonObject):
   SOLAR_NAKSH = None
   SOLAR_NAKSH_PADA = None
 
-  def __init__(self, name, num_angas, weight_moon, weight_sun, mean_period_days=None, names_dict=None):
+  def __init__(self, name, num_angas, weight_moon, weight_sun, mean_period_days=None, names_dict=None, parent_type_name=None):
+    """
+
+    :param parent_type_name: Name of the anga type of which this is an exact subdivision (eg. karaNa-s are halves of tithi-s). Boundaries of such derived angas can be found within the parent anga spans.
+    """
     super(AngaType, self).__init__()
     self.name = name
     self.num_angas = num_angas
+    self.parent_type_name = parent_type_name
     self.arc_length = 360.0 / num_angas
     self.weight_moon = weight_moon
     self.weight_sun = weight_sun
@@ -40,6 +45,14 @@ class AngaType(common.JsonObject):
         self.names_dict = names.NAMES[key]
     NAME_TO_TYPE[self.name] = self
 
+  def get_parent_type(self):
+    if self.parent_type_name is None:
+      return None
+    return NAME_TO_TYPE[self.parent_type_name]
+
+  def get_num_angas_per_parent(self):
+    return self.num_angas // self.get_parent_type().num_angas
+
   def add(self, a, b):
     if b < 1:
       offset_index = (a + b) % self.num_angas
@@ -59,16 +72,16 @@ class AngaType(common.JsonObject):
 
 
 AngaType.TITHI = AngaType(name='TITHI', num_angas=30, weight_moon=1, weight_sun=-1, mean_period_days=29.530588)
-AngaType.TITHI_PADA = AngaType(name='TITHI_PADA', num_angas=120, weight_moon=1, weight_sun=-1, mean_period_days=29.530588)
+AngaType.TITHI_PADA = AngaType(name='TITHI_PADA', num_angas=120, weight_moon=1, weight_sun=-1, mean_period_days=29.530588, parent_type_name='TITHI')
 AngaType.NAKSHATRA = AngaType(name='NAKSHATRA', num_angas=27, weight_moon=1, weight_sun=0, mean_period_days=27.321661)
-AngaType.NAKSHATRA_PADA = AngaType(name='NAKSHATRA_PADA', num_angas=108, weight_moon=1, weight_sun=0, mean_period_days=27.321661)
+AngaType.NAKSHATRA_PADA = AngaType(name='NAKSHATRA_PADA', num_angas=108, weight_moon=1, weight_sun=0, mean_period_days=27.321661, parent_type_name='NAKSHATRA')
 AngaType.RASHI = AngaType(name='RASHI', num_angas=12, weight_moon=1, weight_sun=0, mean_period_days=27.321661)
 AngaType.YOGA = AngaType(name='YOGA', num_angas=27, weight_moon=1, weight_sun=1, mean_period_days=29.541)
-AngaType.KARANA = AngaType(name='KARANA', num_angas=60, weight_moon=1, weight_sun=-1, mean_period_days=29.4)
+AngaType.KARANA = AngaType(name='KARANA', num_angas=60, weight_moon=1, weight_sun=-1, mean_period_days=29.4, parent_type_name='TITHI')
 AngaType.SIDEREAL_MONTH = AngaType(name='SIDEREAL_MONTH', num_angas=12, weight_moon=0, weight_sun=1, mean_period_days=365.242)
 AngaType.TROPICAL_MONTH = AngaType(name='TROPICAL_MONTH', num_angas=12, weight_moon=0, weight_sun=1, mean_period_days=365.242)
 AngaType.SOLAR_NAKSH = AngaType(name='SOLAR_NAKSH', num_angas=27, weight_moon=0, weight_sun=1, mean_period_days=365.242)
-AngaType.SOLAR_NAKSH_PADA = AngaType(name='SOLAR_NAKSH_PADA', num_angas=108, weight_moon=0, weight_sun=1, mean_period_days=365.242)
+AngaType.SOLAR_NAKSH_PADA = AngaType(name='SOLAR_NAKSH_PADA', num_angas=108, weight_moon=0, weight_sun=1, mean_period_days=365.242, parent_type_name='SOLAR_NAKSH')
 
 class Anga(common.JsonObject):
   def __init__(self, index, anga_type_id):
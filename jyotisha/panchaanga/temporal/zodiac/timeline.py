@@ -0,0 +1,102 @@
+import sys
+from bisect import bisect_right
+
+import methodtools
+from jyotisha.panchaanga.temporal.body import Graha, Transit
+from jyotisha.panchaanga.temporal.interval import AngaSpan, AngaSpanIndex
+from jyotisha.panchaanga.temporal.zodiac import AngaSpanFinder, Ayanamsha
+from jyotisha.panchaanga.temporal.zodiac.angas import AngaType
+from sanskrit_data.schema import common
+from timebudget import timebudget
+
+
+class AngaTimeline(common.JsonObject, AngaSpanIndex):
+  """All anga spans (of a few anga types) over a long period, computed in one sweep per anga type.
+
+  Anga boundaries don't depend on the location - so a timeline can be sliced into DayAngas for any number of days and cities (see DailyPanchaanga). Lookups (such as get_anga_spans_in_interval) work across day boundaries too.
+  """
+  ANGA_TYPES = (AngaType.TITHI, AngaType.NAKSHATRA, AngaType.YOGA, AngaType.KARANA, AngaType.RASHI)
+  # Solar month transitions (sankraanti-s) - looked up by DailyPanchaanga-s (see DailyPanchaanga.set_carried_over_attributes), if available.
+  SOLAR_MONTH_ANGA_TYPES = (AngaType.SIDEREAL_MONTH, AngaType.TROPICAL_MONTH)
+
+  def __init__(self, jd_start, jd_end, ayanaamsha_id, anga_types=ANGA_TYPES, anga_type_to_spans=None):
+    """
+
+    :param anga_type_to_spans: Spans already computed (over the same period) for some anga types, by anga type name - these are not recomputed.
+    """
+    super(AngaTimeline, self).__init__()
+    self.jd_start = jd_start
+    self.jd_end = jd_end
+    self.ayanaamsha_id = ayanaamsha_id
+    self.anga_type_to_spans = {} if anga_type_to_spans is None else dict(anga_type_to_spans)
+    for anga_type in anga_types:
+      if anga_type.name not in self.anga_type_to_spans:
+        self.anga_type_to_spans[anga_type.name] = self._compute_spans(anga_type=anga_type)
+
+  @methodtools.lru_cache(maxsize=16)
+  @classmethod
+  def get_cached(cls, jd_start, jd_end, ayanaamsha_id):
+    return AngaTimeline(jd_start=jd_start, jd_end=jd_end, ayanaamsha_id=ayanaamsha_id)
+
+  @timebudget
+  def _compute_spans(self, anga_type):
+    if anga_type == AngaType.TITHI:
+      # Deliberately passing ASHVINI_STARTING_0 below since it is cheapest. Tithi is independent of ayanAmsha.
+      ayanaamsha_id = Ayanamsha.ASHVINI_STARTING_0
+    elif anga_type == AngaType.TROPICAL_MONTH:
+      # As in DailyPanchaanga.set_tropical_date_sunset.
+      ayanaamsha_id = Ayanamsha.ASHVINI_STARTING_0
+    else:
+      ayanaamsha_id = self.ayanaamsha_id
+    # Derived angas (eg. karaNa-s) reuse the parent anga spans, if these were computed earlier.
+    parent_spans = self.anga_type_to_spans.get(anga_type.parent_type_name, None)
+    return AngaSpanFinder.get_cached(ayanaamsha_id=ayanaamsha_id, anga_type=anga_type).get_all_angas_in_period(jd1=self.jd_start, jd2=self.jd_end, parent_spans=parent_spans)
+
+  def covers(self, jd1, jd2, anga_type=None):
+    """
+
+    :param anga_type: If not None, spans of this anga type must be available too.
+    """
+    if anga_type is not None and anga_type.name not in self.anga_type_to_spans:
+      return False
+    return self.jd_start <= jd1 and jd2 <= self.jd_end
+
+  def get_angas_with_ends(self, anga_type):
+    return self.anga_type_to_spans.get(anga_type.name, None)
+
+  def get_all_angas_in_period(self, anga_type, jd1, jd2):
+    """Same as AngaSpanFinder.get_all_angas_in_period - but sliced from this timeline.
+
+    :return: AngaSpan list - the first with jd_start None, the last with jd_end None.
+    """
+    if not self.covers(jd1=jd1, jd2=jd2):
+      raise ValueError("Period not covered by the timeline", (jd1, jd2), (self.jd_start, self.jd_end))
+    (spans, span_starts, _, _) = self._get_span_index(anga_type=anga_type)
+    # Boundaries b with jd1 < b <= jd2 occur within the period.
+    index_first = bisect_right(span_starts, jd1) - 1
+    index_last = bisect_right(span_starts, jd2) - 1
+    sliced_spans = [AngaSpan(jd_start=span.jd_start, jd_end=span.jd_end, anga=span.anga) for span in spans[index_first: index_last + 1]]
+    sliced_spans[0].jd_start = None
+    sliced_spans[-1].jd_end = None
+    return sliced_spans
+
+  def find(self, anga_type, jd1, jd2, target_anga):
+    """Same as AngaSpanFinder.find - but from this timeline.
+
+    :return: None if target_anga was not found. Otherwise, AngaSpan with boundary jds None if they don't occur within [jd1, jd2].
+    """
+    spans = self.get_all_angas_in_period(anga_type=anga_type, jd1=jd1, jd2=jd2)
+    # As with AngaSpanFinder.find, the start is not sought if target_anga prevails at jd1.
+    for span in spans:
+      if span.anga == target_anga:
+        return AngaSpan(jd_start=span.jd_start, jd_end=span.jd_end, anga=span.anga)
+    return None
+
+  def get_transits(self, jd_start, jd_end, anga_type):
+    """Same as Graha.get_transits for the sun (and anga types such as SIDEREAL_MONTH or TROPICAL_MONTH) - but from this timeline."""
+    spans = self.get_all_angas_in_period(anga_type=anga_type, jd1=jd_start, jd2=jd_end)
+    return [Transit(body=Graha.SUN, jd=span.jd_start, anga_type=anga_type.name, value_1=previous_span.anga.index, value_2=span.anga.index) for (previous_span, span) in zip(spans, spans[1:])]
+
+
+# Essential for depickling to work.
+common.update_json_class_index(sys.modules[__name__])
@@ -63,7 +63,7 @@ class KaalaHandler(Resource):
   def get(self, latitude, longitude, year, month, day):
     args = self.get_parser.parse_args()
     city = City("", latitude, longitude, args['timezone'])
-    panchaanga = daily.DailyPanchaanga(city=city, date=Date(year=int(year), month=int(month), day=int(day)))
+    panchaanga = daily.DailyPanchaanga(city=city, date=Date(year=int(year), month=int(month), day=int(day)), lazy=True)
     return panchaanga.day_length_based_periods.to_json_map()
 
 
@@ -107,6 +107,6 @@ class RaashiTransitionFinder(Resource):
     transits = Graha.singleton(body).get_transits(jd_start=jd, jd_end=jd + 100, anga_type=AngaType.RASHI,
                                                   ayanaamsha_id=Ayanamsha.CHITRA_AT_180)
     # logging.debug(transits)
-    transits_local = [(Timezone(timezone).julian_day_to_local_time(transit.jd), transit.value_1, transit.value_2) for transit in
-                      transits]
+    local_times = Timezone(timezone).julian_days_to_local_times([transit.jd for transit in transits])
+    transits_local = [(local_time, transit.value_1, transit.value_2) for (local_time, transit) in zip(local_times, transits)]
     return str(transits_local)
@@ -1,5 +1,46 @@
+import io
+import pickle
+
+
 def zero_if_none(x):
   return default_if_none(x=x, default=0)
 
 def default_if_none(x, default):
   return default if x is None else x
+
+
+class ReadOnlyDict(dict):
+  """A dict which can't be modified after construction (but is otherwise serialized and compared like any dict)."""
+
+  def _raise_read_only(self, *args, **kwargs):
+    raise TypeError("%s is read-only" % self.__class__.__name__)
+
+  __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _raise_read_only
+
+  def __reduce__(self):
+    # The default (for dict subclasses) would set the items one by one.
+    return (self.__class__, (dict(self),))
+
+
+def _make_json_object(cls, state):
+  obj = cls.__new__(cls)
+  obj.__dict__.update(state)
+  return obj
+
+
+class _JsonObjectPickler(pickle.Pickler):
+  def reducer_override(self, obj):
+    from sanskrit_data.schema.common import JsonObject
+    if isinstance(obj, JsonObject):
+      return (_make_json_object, (obj.__class__, obj.__dict__))
+    return NotImplemented
+
+
+def pickle_dumps(obj):
+  """pickle.dumps, but for objects which may contain JsonObject-s too.
+  
+  JsonObject-s can't be pickled as such - since their __getattr__ yields None for missing attributes (like __setstate__). Only their __dict__ is pickled (as with their json serialization - but much faster). The result can be loaded with pickle.loads.
+  """
+  with io.BytesIO() as f:
+    _JsonObjectPickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return f.getvalue()
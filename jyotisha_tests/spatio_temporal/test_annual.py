@@ -1,8 +1,14 @@
 import logging
 import os
+import pickle
+import time
 from copy import deepcopy
 
-from jyotisha.panchaanga.spatio_temporal import City, annual, periodical
+import numpy
+import pytest
+
+from jyotisha import util
+from jyotisha.panchaanga.spatio_temporal import City, annual, binary, periodical
 # from jyotisha.panchaanga import scripts
 # from jyotisha.panchaanga.spatio_temporal import annual
 from jyotisha.panchaanga.temporal import ComputationSystem
@@ -91,3 +97,234 @@ def test_orinda_ca_dst_2019():
   # Sunrise on that day is around 7:27 AM according to Google, which is JD 2458553.14375 according to https://ssd.jpl.nasa.gov/tc.cgi#top .
   # We use the index 70 below as the annual panchaanga object seems to use the index d + 1.
   assert round(panchaanga.daily_panchaangas_sorted()[panchaanga.duration_prior_padding + 69].jd_sunrise, ndigits=4) == round(2458554.104348237, ndigits=4)  # 2019-Mar-10 07:30:15.68
+
+
+def test_daily_panchaanga_lookups(tmp_path):
+  computation_system = deepcopy(ComputationSystem.DEFAULT)
+  computation_system.options.no_fests = True
+  panchaanga = periodical.Panchaanga(city=chennai, start_date=Date(2019, 2, 25), end_date=Date(2019, 3, 5), computation_system=computation_system)
+  daily_panchaangas = panchaanga.daily_panchaangas_sorted()
+  assert [dp.date.get_date_str() for dp in daily_panchaangas[:4]] == ["2019-02-23", "2019-02-24", "2019-02-25", "2019-02-26"]
+  date = Date(2019, 3, 1, 10, 30)
+  daily_panchaanga = panchaanga.daily_panchaanga_for_date(date=date)
+  assert daily_panchaanga.date.get_date_str() == "2019-03-01"
+  assert panchaanga.daily_panchaanga_for_day_offset(day_offset=4) is daily_panchaanga
+  assert panchaanga.daily_panchaanga_for_jd(jd=daily_panchaanga.jd_sunrise) is daily_panchaanga
+  assert panchaanga.date_str_to_panchaanga["2019-03-01"] is daily_panchaanga
+  assert panchaanga.daily_panchaanga_for_date(date=Date(2019, 2, 22)) is None
+  assert panchaanga.daily_panchaanga_for_day_offset(day_offset=len(daily_panchaangas)) is None
+  with pytest.raises(TypeError):
+    panchaanga.date_str_to_panchaanga["2019-03-01"] = None
+
+  file_path = str(tmp_path / "panchaanga.json")
+  panchaanga.dump_to_file(filename=file_path)
+  loaded_panchaanga = periodical.Panchaanga.read_from_file(filename=file_path)
+  assert loaded_panchaanga.daily_panchaanga_for_date(date=date).jd_sunrise == daily_panchaanga.jd_sunrise
+  assert [dp.date for dp in loaded_panchaanga.daily_panchaangas_sorted()] == [dp.date for dp in daily_panchaangas]
+
+
+def test_parallel_computation_matches_serial():
+  computation_system = deepcopy(ComputationSystem.DEFAULT)
+  computation_system.options.no_fests = True
+  computation_system.options.set_lagnas = True
+  serial_panchaanga = periodical.Panchaanga(city=chennai, start_date=Date(2019, 1, 20), end_date=Date(2019, 3, 10), computation_system=computation_system)
+  parallel_panchaanga = periodical.Panchaanga(city=chennai, start_date=Date(2019, 1, 20), end_date=Date(2019, 3, 10), computation_system=computation_system, num_processes=3)
+  assert parallel_panchaanga.to_json_map() == serial_panchaanga.to_json_map()
+  assert all(dp.city is parallel_panchaanga.city for dp in parallel_panchaanga.daily_panchaangas_sorted())
+
+
+def test_extension_matches_fresh_computation():
+  from sanskrit_data import collection_helper
+  panchaanga = periodical.Panchaanga(city=chennai, start_date="2019-03-01", end_date="2019-04-30")
+  panchaanga.extend_to(end_date="2019-06-15")
+  panchaanga.extend_from(start_date="2019-02-10")
+  panchaanga.extend_to(end_date="2019-06-16")
+  fresh_panchaanga = periodical.Panchaanga(city=chennai, start_date="2019-02-10", end_date="2019-06-16")
+  assert panchaanga.daily_panchaangas_sorted()[0].date == fresh_panchaanga.daily_panchaangas_sorted()[0].date
+  collection_helper.assert_approx_equals(x=panchaanga, y=fresh_panchaanga, floating_point_precision=4)
+  assert {fest_id: days for (fest_id, days) in panchaanga.festival_id_to_days.items() if len(days) > 0} == {fest_id: days for (fest_id, days) in fresh_panchaanga.festival_id_to_days.items() if len(days) > 0}
+  with pytest.raises(ValueError):
+    panchaanga.extend_to(end_date="2019-06-01")
+
+
+def test_batch_computation_matches_separate():
+  from sanskrit_data import collection_helper
+  from jyotisha.panchaanga.spatio_temporal.batch import BatchPanchaanga
+  orinda = City('Orinda', '37:51:38', '-122:10:59', 'America/Los_Angeles')
+  # Sharing a name with chennai.
+  other_chennai = City('Chennai', '13:05:24', '79:16:13', 'Asia/Calcutta')
+  cities = [chennai, orinda, other_chennai]
+  batch_panchaanga = BatchPanchaanga(cities=cities, start_date="2019-03-01", end_date="2019-04-30")
+  assert [panchaanga.city for panchaanga in batch_panchaanga.panchaangas] == cities
+  for city in cities:
+    panchaanga = periodical.Panchaanga(city=city, start_date="2019-03-01", end_date="2019-04-30")
+    collection_helper.assert_approx_equals(x=batch_panchaanga.get_panchaanga(city), y=panchaanga, floating_point_precision=4)
+  assert batch_panchaanga.get_panchaanga(City('Delhi', '28:36:50', '77:12:32', 'Asia/Calcutta')) is None
+
+
+def test_columns_round_trip(tmp_path):
+  import numpy
+  from jyotisha.panchaanga.spatio_temporal.columns import PanchaangaColumns
+  panchaanga = periodical.Panchaanga(city=chennai, start_date="2019-03-01", end_date="2019-03-31")
+  columns = panchaanga.to_columns()
+  assert len(columns) == 31
+  daily_panchaanga = panchaanga.daily_panchaanga_for_date(date=Date(2019, 3, 2))
+  assert columns["jd_sunrise"][1] == daily_panchaanga.jd_sunrise
+  assert columns["tithi_at_sunrise"][1] == daily_panchaanga.sunrise_day_angas.tithi_at_sunrise.index
+  assert columns["solar_day"][1] == daily_panchaanga.solar_sidereal_date_sunset.day
+  assert columns.get_kaala("raahu")[1][1] == daily_panchaanga.day_length_based_periods.raahu.jd_end
+  assert columns.get_festival_ids(1) == sorted(daily_panchaanga.festival_id_to_instance.keys())
+  file_path = str(tmp_path / "columns.npz")
+  columns.save(file_path)
+  for mmap_mode in [None, "r"]:
+    loaded_columns = PanchaangaColumns.load(file_path, mmap_mode=mmap_mode)
+    assert loaded_columns.metadata == columns.metadata
+    for (name, column) in columns.columns.items():
+      numpy.testing.assert_array_equal(loaded_columns[name], column)
+      assert loaded_columns[name].dtype == column.dtype
+  assert isinstance(loaded_columns["jd_sunset"], numpy.memmap)
+  for mmap_mode in ["w+", "r+"]:
+    with pytest.raises(ValueError):
+      PanchaangaColumns.load(file_path, mmap_mode=mmap_mode)
+  assert PanchaangaColumns.load(file_path)["jd_sunset"][1] == columns["jd_sunset"][1]
+
+
+def test_binary_file_round_trip(tmp_path):
+  panchaanga = periodical.Panchaanga(city=chennai, start_date="2019-03-01", end_date="2019-03-31")
+  file_path = str(tmp_path / "panchaanga.panchaanga")
+  panchaanga.dump_to_file(filename=file_path)
+  loaded_panchaanga = periodical.Panchaanga.read_from_file(filename=file_path)
+  daily_panchaanga = loaded_panchaanga.daily_panchaanga_for_date(date=Date(2019, 3, 2))
+  assert loaded_panchaanga._daily_panchaangas.get_num_loaded() == 1
+  assert daily_panchaanga.city is loaded_panchaanga.city
+  # Lazily loaded panchaangas can be passed to other processes.
+  unpickled_panchaanga = pickle.loads(util.pickle_dumps(loaded_panchaanga))
+  assert unpickled_panchaanga._daily_panchaangas.get_num_loaded() == 1
+  assert unpickled_panchaanga.to_json_map() == panchaanga.to_json_map()
+  assert loaded_panchaanga.festival_id_to_days == panchaanga.festival_id_to_days
+  assert loaded_panchaanga.to_json_map() == panchaanga.to_json_map()
+  assert periodical.Panchaanga.read_from_file(filename=file_path, lazy=False).to_json_map() == panchaanga.to_json_map()
+  # Plain typed arrays only - no pickles.
+  with numpy.load(file_path, allow_pickle=False) as npz_file:
+    assert all(not npz_file[name].dtype.hasobject for name in npz_file.files)
+  with pytest.raises(ValueError):
+    binary.load(panchaanga_class=periodical.Panchaanga, data=b"not a panchaanga")
+
+
+def test_panchaanga_cache_reassigns_festivals_only_on_rules_change(tmp_path, monkeypatch):
+  from jyotisha.panchaanga.spatio_temporal.cache import PanchaangaCache, LocalDirectoryBackend
+  from jyotisha.panchaanga.temporal.festival import rules
+  cache = PanchaangaCache(backend=LocalDirectoryBackend(path=str(tmp_path)), max_size_bytes=None)
+  panchaanga = periodical.Panchaanga(city=chennai, start_date="2019-03-01", end_date="2019-03-31")
+  assert panchaanga.are_festivals_up_to_date()
+  cache.put(key="key", panchaanga=panchaanga)
+
+  def fail(*args, **kwargs):
+    pytest.fail("Not expected to be called - the stored festivals being up to date.")
+  with monkeypatch.context() as m:
+    m.setattr(periodical.Panchaanga, "update_festival_details", fail)
+    m.setattr(cache, "put", fail)
+    loaded_panchaanga = cache.get_or_compute(key="key", compute_fn=fail)
+  assert loaded_panchaanga.festival_id_to_days == panchaanga.festival_id_to_days
+
+  # Only festivals are reassigned (compute_fn is not called), and stored.
+  monkeypatch.setattr(rules, "get_rules_fingerprint", lambda computation_options: "changed")
+  assert cache.get_or_compute(key="key", compute_fn=fail).are_festivals_up_to_date()
+  assert cache.get(key="key").are_festivals_up_to_date()
+  assert cache.get_stats() == {"hits": 3, "misses": 0, "evictions": 0}
+
+
+def test_panchaanga_cache(tmp_path):
+  from jyotisha.panchaanga.spatio_temporal.cache import PanchaangaCache, LocalDirectoryBackend
+  cache = PanchaangaCache(backend=LocalDirectoryBackend(path=str(tmp_path)), max_size_bytes=None)
+  other_chennai = City('Chennai', "13:05:24", "80:16:13", "Asia/Calcutta")
+  period = {"start_date": "2019-03-01", "end_date": "2019-03-10"}
+  key = cache.get_key(city=chennai, period=period)
+  assert key == cache.get_key(city=chennai, period=period, computation_system=ComputationSystem.DEFAULT)
+  assert len({key, cache.get_key(city=other_chennai, period=period), cache.get_key(city=chennai, period={"civil_year": 2019}), cache.get_key(city=chennai, period=period, computation_system=ComputationSystem.SOLSTICE_POST_DARK_10_ADHIKA__CHITRA_180)}) == 4
+
+  computed = []
+  def compute(city):
+    computed.append(city)
+    return periodical.Panchaanga(city=city, start_date=period["start_date"], end_date=period["end_date"])
+  panchaanga = cache.get_or_compute(key=key, compute_fn=lambda: compute(chennai))
+  assert cache.get_or_compute(key=key, compute_fn=lambda: compute(chennai)).to_json_map() == panchaanga.to_json_map()
+  other_key = cache.get_key(city=other_chennai, period=period)
+  cache.get_or_compute(key=other_key, compute_fn=lambda: compute(other_chennai))
+  assert computed == [chennai, other_chennai]
+  assert cache.get_stats() == {"hits": 1, "misses": 2, "evictions": 0}
+
+  # The least recently used entry is evicted.
+  cache.get(key=key)
+  cache.max_size_bytes = max(entry.size for entry in cache.backend.get_entries())
+  cache.evict()
+  assert [entry.key for entry in cache.backend.get_entries()] == [key]
+  assert cache.get(key=other_key) is None
+  assert cache.get_stats() == {"hits": 2, "misses": 3, "evictions": 1}
+
+  # Unreadable entries are misses - and are deleted.
+  cache.backend.put(key=other_key, data=b"not a panchaanga")
+  assert cache.get(key=other_key) is None
+  assert [entry.key for entry in cache.backend.get_entries()] == [key]
+
+
+def test_panchaanga_cache_evict_sweeps_leftovers(tmp_path):
+  from jyotisha.panchaanga.spatio_temporal.cache import PanchaangaCache, LocalDirectoryBackend
+  cache = PanchaangaCache(backend=LocalDirectoryBackend(path=str(tmp_path)), max_size_bytes=None)
+  cache.backend.put(key="key", data=b"data")
+  for key in ("key", "evicted"):
+    with cache.backend.lock(key=key):
+      pass
+  for file_name in ("interrupted.tmp", "being_written.tmp"):
+    (tmp_path / file_name).write_bytes(b"data")
+  old_time = time.time() - 2 * LocalDirectoryBackend.TEMP_FILE_MAX_AGE_SECONDS
+  os.utime(str(tmp_path / "interrupted.tmp"), (old_time, old_time))
+  with cache.backend.lock(key="being_computed"):
+    cache.evict()
+    assert sorted(os.listdir(str(tmp_path))) == ["being_written.tmp", "key.panchaanga", "locks"]
+    assert sorted(os.listdir(str(tmp_path / "locks"))) == ["being_computed.lock", "key.lock"]
+  cache.evict()
+  assert sorted(os.listdir(str(tmp_path / "locks"))) == ["key.lock"]
+  with cache.backend.lock(key="being_computed"):
+    assert os.path.exists(str(tmp_path / "locks" / "being_computed.lock"))
+
+
+def test_panchaanga_cache_get_survives_failed_touch(tmp_path, monkeypatch):
+  from jyotisha.panchaanga.spatio_temporal.cache import LocalDirectoryBackend
+  backend = LocalDirectoryBackend(path=str(tmp_path))
+  backend.put(key="key", data=b"data")
+
+  def evict_and_touch(file_path):
+    # As if evicted by another process between the read and the touch.
+    os.remove(file_path)
+    os.utime(file_path)
+  monkeypatch.setattr(backend, "_touch", evict_and_touch)
+  assert backend.get(key="key") == b"data"
+  assert backend.get(key="key") is None
+
+
+def _compute_for_cache(log_path):
+  with open(log_path, "a") as f:
+    f.write("computed\n")
+  computation_system = deepcopy(ComputationSystem.DEFAULT)
+  computation_system.options.no_fests = True
+  return periodical.Panchaanga(city=chennai, start_date="2019-03-01", end_date="2019-03-05", computation_system=computation_system)
+
+
+def _get_from_cache(cache_path, key, log_path):
+  from jyotisha.panchaanga.spatio_temporal.cache import PanchaangaCache, LocalDirectoryBackend
+  cache = PanchaangaCache(backend=LocalDirectoryBackend(path=cache_path))
+  return cache.get_or_compute(key=key, compute_fn=lambda: _compute_for_cache(log_path=log_path)).jd_start
+
+
+def test_panchaanga_cache_single_flight(tmp_path):
+  from concurrent.futures import ProcessPoolExecutor
+  log_path = str(tmp_path / "log.txt")
+  cache_path = str(tmp_path / "cache")
+  with ProcessPoolExecutor(max_workers=3) as executor:
+    futures = [executor.submit(_get_from_cache, cache_path, "key", log_path) for _ in range(3)]
+    jd_starts = [future.result() for future in futures]
+  assert len(set(jd_starts)) == 1
+  with open(log_path) as f:
+    assert f.read() == "computed\n"
+  assert sorted(os.listdir(cache_path)) == ["key.panchaanga", "locks"]
@@ -5,3 +5,25 @@ def test_moonrise_time():
   city = City.get_city_from_db(name="Bangalore")
   from jyotisha.panchaanga.temporal.body import Graha
   assert city.get_rising_time(julian_day_start=2459107.33, body=Graha.MOON) == 2459107.4297038973
+
+
+def test_get_rise_set_table():
+  import numpy
+  from jyotisha.panchaanga.temporal.body import Graha
+  for city in [City.get_city_from_db(name="Bangalore"), City.get_city_from_db(name="Orinda")]:
+    table = city.get_rise_set_table(jd_start=2459107.33, jd_end=2459107.33 + 40)
+    assert len(table.sunrises) == 41
+    for day_index in range(41):
+      sunrise = city.get_rising_time(julian_day_start=2459107.33 + day_index, body=Graha.SUN)
+      assert table.get_day_index(julian_day_start=2459107.33 + day_index + 0.02) == day_index
+      # As documented in City.get_rise_set_table.
+      numpy.testing.assert_allclose([table.sunrises[day_index], table.sunsets[day_index], table.moonrises[day_index], table.moonsets[day_index]], [sunrise, city.get_setting_time(julian_day_start=sunrise, body=Graha.SUN), city.get_rising_time(julian_day_start=sunrise, body=Graha.MOON), city.get_setting_time(julian_day_start=sunrise, body=Graha.MOON)], rtol=0, atol=0.06 / 86400)
+
+
+def test_rise_set_table_sunsets_in_period():
+  city = City.get_city_from_db(name="Bangalore")
+  table = city.get_rise_set_table(jd_start=2459107.33, jd_end=2459107.33 + 40)
+  for (jd_start, jd_end) in [(2459107.9, 2459137.5), (2459110.2, 2459110.3), (table.sunsets[3], table.sunsets[20])]:
+    sunsets = table.get_sunsets_in_period(jd_start=jd_start, jd_end=jd_end)
+    assert len(sunsets) == len(city.get_sunsets_in_period(jd_start=jd_start, jd_end=jd_end))
+  assert table.get_sunsets_in_period(jd_start=2459100, jd_end=2459110) is None
@@ -2,6 +2,7 @@ import logging
 import os
 
 import numpy.testing
+import pytest
 from jyotisha.panchaanga.spatio_temporal import City
 from jyotisha.panchaanga.spatio_temporal import daily
 from jyotisha.panchaanga.temporal import time
@@ -110,6 +111,25 @@ def test_get_anga_data_1981_12_23():
   angas = [s.anga.index for s in panchaanga.sunrise_day_angas.get_anga_spans_in_interval(interval=Interval(jd_start=panchaanga.jd_sunrise, jd_end=panchaanga.jd_next_sunrise), anga_type=AngaType.NAKSHATRA)]
   assert angas == [16, 17]
 
+  day_angas = panchaanga.sunrise_day_angas
+  nakshatra_end = day_angas.nakshatras_with_ends[0].jd_end
+  assert day_angas.get_anga_at_jd(jd=nakshatra_end - 0.01, anga_type=AngaType.NAKSHATRA).index == 16
+  assert day_angas.get_anga_at_jd(jd=nakshatra_end + 0.01, anga_type=AngaType.NAKSHATRA).index == 17
+  assert day_angas.find_anga_span(anga=day_angas.nakshatras_with_ends[1].anga) is day_angas.nakshatras_with_ends[1]
+  assert day_angas.find_anga_span(anga=day_angas.nakshatras_with_ends[1].anga + 5) is None
+  assert day_angas.get_angas_with_ends(anga_type=AngaType.RASHI) is day_angas.raashis_with_ends
+
+
+def test_anga_timeline_lookups():
+  from jyotisha.panchaanga.temporal.zodiac.timeline import AngaTimeline
+  panchaanga = daily.DailyPanchaanga(city=chennai, date=Date(1981, 12, 23))
+  timeline = AngaTimeline(jd_start=panchaanga.jd_sunrise - 1, jd_end=panchaanga.jd_sunrise + 3, ayanaamsha_id=panchaanga.computation_system.ayanaamsha_id)
+  # An interval spanning two days.
+  interval = Interval(jd_start=panchaanga.jd_sunset, jd_end=panchaanga.jd_next_sunrise + 0.5)
+  angas = [s.anga.index for s in timeline.get_anga_spans_in_interval(interval=interval, anga_type=AngaType.NAKSHATRA)]
+  assert angas == [17, 18]
+  assert timeline.get_anga_at_jd(jd=panchaanga.jd_sunrise, anga_type=AngaType.NAKSHATRA).index == 16
+
 
 def test_get_lagna_data():
   city = City.get_city_from_db('Chennai') 
@@ -124,3 +144,38 @@ def test_get_lagna_data():
               (10, 2458223.3787625884), (11, 2458223.4494649624),
               (12, 2458223.518700759)]
   numpy.testing.assert_allclose(actual, expected, rtol=1e-4) 
+
+
+def test_get_lagna_data_from_table():
+  city = City.get_city_from_db('Chennai')
+  from jyotisha.panchaanga.temporal import zodiac
+  panchaanga = daily.DailyPanchaanga.from_city_and_julian_day(city=city, julian_day=2458222.5208333335)
+  lagna_table = city.get_lagna_table(jd_start=2458200.5, jd_end=2458240.5, ayanaamsha_id=zodiac.Ayanamsha.CHITRA_AT_180)
+  actual = panchaanga.get_lagna_data(ayanaamsha_id=zodiac.Ayanamsha.CHITRA_AT_180, lagna_table=lagna_table)
+  expected = daily.DailyPanchaanga.from_city_and_julian_day(city=city, julian_day=2458222.5208333335).get_lagna_data(ayanaamsha_id=zodiac.Ayanamsha.CHITRA_AT_180)
+  assert [lagna for (lagna, _) in actual] == [lagna for (lagna, _) in expected]
+  numpy.testing.assert_allclose([jd for (_, jd) in actual], [jd for (_, jd) in expected], rtol=0, atol=0.01 / 86400)
+
+
+def test_lazy_attributes():
+  panchaanga = daily.DailyPanchaanga(city=chennai, date=Date(2019, 3, 1))
+  lazy_panchaanga = daily.DailyPanchaanga(city=chennai, date=Date(2019, 3, 1), lazy=True)
+  assert lazy_panchaanga.day_length_based_periods.raahu.to_tuple() == panchaanga.day_length_based_periods.raahu.to_tuple()
+  assert "sunrise_day_angas" not in lazy_panchaanga.__dict__ and "jd_moonrise" not in lazy_panchaanga.__dict__
+  assert lazy_panchaanga.lunar_month_sunrise == panchaanga.lunar_month_sunrise
+  assert lazy_panchaanga.to_json_map() == panchaanga.to_json_map()
+
+
+def test_lazy_attributes_retried_after_error(monkeypatch):
+  panchaanga = daily.DailyPanchaanga(city=chennai, date=Date(2019, 3, 1))
+  lazy_panchaanga = daily.DailyPanchaanga(city=chennai, date=Date(2019, 3, 1), lazy=True)
+
+  def fail(*args, **kwargs):
+    raise RuntimeError()
+  with monkeypatch.context() as m:
+    m.setattr(daily.DailyPanchaanga, "compute_moon_transitions", fail)
+    with pytest.raises(RuntimeError):
+      lazy_panchaanga.jd_moonrise
+  assert "jd_moonset" not in lazy_panchaanga.__dict__
+  assert lazy_panchaanga.jd_moonset == panchaanga.jd_moonset
+  assert lazy_panchaanga.jd_moonrise == panchaanga.jd_moonrise
@@ -0,0 +1,40 @@
+from jyotisha.panchaanga.spatio_temporal import City, periodical
+from jyotisha.panchaanga.temporal import ComputationSystem
+from jyotisha.panchaanga.temporal.festival import rules
+from jyotisha.panchaanga.temporal.festival.applier.rule_repo_based import inefficient
+from jyotisha.panchaanga.temporal.time import Date
+
+chennai = City.get_city_from_db('Chennai')
+
+
+def _get_rule(month_type, month_number, anga_type, anga_number, kaala=None):
+  rule = rules.HinduCalendarEvent()
+  rule.id = "%s-%02d-%s-%02d-%s" % (month_type, month_number, anga_type, anga_number, kaala)
+  rule.timing = rules.HinduCalendarEventTiming.from_details(month_type=month_type, month_number=month_number, anga_type=anga_type, anga_number=anga_number, kaala=kaala, year_start=None)
+  return rule
+
+
+def test_indexed_rules_match_all_rules_on_all_days():
+  panchaanga = periodical.Panchaanga(city=chennai, start_date=Date(2019, 3, 1), end_date=Date(2019, 4, 30), computation_system=ComputationSystem.DEFAULT)
+  fest_rules = [_get_rule(month_type=rules.RulesRepo.LUNAR_MONTH_DIR, month_number=month_number, anga_type=anga_type, anga_number=anga_number) for month_number in (0, 1, 12) for (anga_type, num_angas) in (("tithi", 30), ("nakshatra", 27), ("yoga", 27)) for anga_number in range(1, num_angas + 1)]
+  # Shukla prathama festivals may be assigned when the day's month is still the previous one.
+  fest_rules += [_get_rule(month_type=rules.RulesRepo.LUNAR_MONTH_DIR, month_number=month_number, anga_type="tithi", anga_number=1, kaala=kaala) for month_number in (1, 12) for kaala in ("madhyaahna", "aparaahna", "sunset")]
+  fest_rules += [_get_rule(month_type=rules.RulesRepo.SIDEREAL_SOLAR_MONTH_DIR, month_number=month_number, anga_type="nakshatra", anga_number=anga_number) for month_number in (0, 1, 12) for anga_number in range(1, 28)]
+  assigner = inefficient.FestivalsTimesDaysAssigner(panchaanga=panchaanga)
+  assigner.rules_collection = rules.RulesCollection(repos=())
+  assigner.rules_collection.name_to_rule = {rule.id: rule for rule in fest_rules}
+
+  def get_assigned_days(assign_fn):
+    for rule in fest_rules:
+      panchaanga.festival_id_to_days.pop(rule.id, None)
+    assign_fn()
+    return {rule.id: sorted(panchaanga.festival_id_to_days[rule.id]) for rule in fest_rules if rule.id in panchaanga.festival_id_to_days}
+
+  def assign_all_rules_on_all_days():
+    for d in range(panchaanga.duration_prior_padding, panchaanga.duration + 1):
+      for rule in fest_rules:
+        assigner.assign_festival(fest_rule=rule, d=d)
+
+  expected_days = get_assigned_days(assign_fn=assign_all_rules_on_all_days)
+  assert len(expected_days) > 100
+  assert get_assigned_days(assign_fn=assigner.assign_festivals_from_rules) == expected_days
@@ -6,4 +6,17 @@ from jyotisha.panchaanga.temporal.festival import rules
 def test_rules_dicts():
   rule_set = rules.RulesCollection()
   pprint(rule_set)
-  assert 'pUrNimA~vratam' in rule_set.tree[rules.RulesRepo.LUNAR_MONTH_DIR][rules.RulesRepo.TITHI_DIR]["00"]["15"]
\ No newline at end of file
+  assert 'pUrNimA~vratam' in rule_set.tree[rules.RulesRepo.LUNAR_MONTH_DIR][rules.RulesRepo.TITHI_DIR]["00"]["15"]
+
+def test_rules_fingerprint(tmp_path):
+  from jyotisha.panchaanga.temporal import ComputationOptions
+  rule_file = tmp_path / "repo" / "day" / "x__info.toml"
+  rule_file.parent.mkdir(parents=True)
+  rule_file.write_text("id = 'x'")
+  options = ComputationOptions(fest_repos=(rules.RulesRepo(name="repo", path=str(tmp_path / "repo")),))
+  fingerprint = rules.get_rules_fingerprint(computation_options=options)
+  assert rules.get_rules_fingerprint(computation_options=options) == fingerprint
+  assert rules.get_rules_fingerprint(computation_options=ComputationOptions(fest_repos=options.fest_repos, fest_ids_excluded=["x"])) != fingerprint
+  rule_file.write_text("id = 'y'")
+  rules._get_rule_files_hash.cache_clear()
+  assert rules.get_rules_fingerprint(computation_options=options) != fingerprint
@@ -24,3 +24,23 @@ def test_graha_get_next_raashi_transit():
 
 def test_get_star_longitude():
   assert body.get_star_longitude(star="Spica", jd=2458434.083333251) == 204.09485939669307
+
+
+def test_graha_get_longitudes():
+  import numpy
+  from jyotisha.panchaanga.temporal.zodiac import Ayanamsha
+  jds = numpy.arange(2458434.083333251, 2458434.083333251 + 30, 0.75)
+  for graha in [Graha.singleton(Graha.SUN), Graha.singleton(Graha.MOON)]:
+    for ayanaamsha_id in [None, Ayanamsha.CHITRA_AT_180, Ayanamsha.RASHTRIYA_PANCHANGA_NAKSHATRA_TRACKING]:
+      expected = [graha.get_longitude(jd=jd, ayanaamsha_id=ayanaamsha_id) for jd in jds]
+      numpy.testing.assert_allclose(graha.get_longitudes(jds=jds, ayanaamsha_id=ayanaamsha_id), expected, rtol=0, atol=1e-9)
+
+
+def test_star_longitude_table():
+  import numpy
+  table = body.StarLongitudeTable.singleton(star="Spica")
+  jds = numpy.arange(2458434.083333251, 2458434.083333251 + 400, 0.37)
+  numpy.testing.assert_allclose(table.get_longitudes(jds=jds), body.get_star_longitudes(star="Spica", jds=jds), rtol=0, atol=0.1 / 3600)
+  assert abs(table.get_longitude(jd=jds[5]) - body.get_star_longitude(star="Spica", jd=jds[5])) < 0.1 / 3600
+  assert 0 < table.max_error < 0.1 / 3600
+  assert table.get_interpolation_error(jds=jds) < 0.1 / 3600
@@ -47,3 +47,74 @@ def test_get_timezone_offset_hours_from_jd():
 def test_get_weekday():
   # 2018, 11, 11 was sunday
   assert time.get_weekday(2458434.083333251) == 0
+
+
+def test_julian_day_conversions_match_astropy():
+  import numpy
+  from astropy.time import Time
+  from jyotisha.panchaanga.temporal import julian_day
+  # Includes the last leap second (at the end of 2016-12-31), and day boundaries.
+  jds = numpy.concatenate((numpy.random.default_rng(0).uniform(2441318.5, 2488070.5, 2000), numpy.arange(2458119.5, 2458130.5, 1 / 48.0), [2457754.5 - 0.5 / 86401, 2457754.5 - 1e-10, 2457755.0]))
+  reference = Time(jds, format='jd')
+  reference.format = "ymdhms"
+  reference_values = reference.value
+  civil = julian_day.julian_days_to_civil(jds)
+  for (index, jd) in enumerate(jds):
+    date = time.jd_to_utc_gregorian(jd)
+    assert date.as_tuple() == tuple(reference_values[index].tolist())
+    assert julian_day.julian_day_to_civil(jd) == tuple(int(x[index]) for x in civil)
+    assert time.utc_gregorian_to_jd(date) == Time(_to_ymdhms_dict(date), format='ymdhms').jd
+  numpy.testing.assert_array_equal(julian_day.civil_to_julian_days(*[reference_values[field] for field in ["year", "month", "day", "hour", "minute", "second"]]), [time.utc_gregorian_to_jd(date) for date in time.jds_to_utc_gregorian(jds)])
+  assert [time.get_weekday(jd) for jd in jds[:100]] == [Time(jd, format='jd').datetime.isoweekday() % 7 for jd in jds[:100]]
+
+
+def _to_ymdhms_dict(date):
+  return {"year": date.year, "month": date.month, "day": date.day, "hour": date.hour, "minute": date.minute, "second": date.second}
+
+
+def test_utc_offset_table_matches_pytz():
+  import datetime
+  import numpy
+  import pytz
+  tz = Timezone("America/Los_Angeles")
+  pytz_tz = pytz.timezone("America/Los_Angeles")
+  # Half-hourly, across the 2019 daylight saving transitions (2019-03-10 and 2019-11-03).
+  jds = numpy.concatenate((numpy.arange(2458551.5, 2458553.5, 1 / 48.0), numpy.arange(2458789.5, 2458791.5, 1 / 48.0)))
+  local_times = tz.julian_days_to_local_times(jds)
+  for (jd, local_time) in zip(jds, local_times):
+    assert local_time.as_tuple() == tz.julian_day_to_local_time(julian_day=jd).as_tuple()
+    assert tz.julian_day_to_local_datetime(jd=jd) == pytz_tz.fromutc(time._jd_to_utc_datetime(jd=jd))
+  # Including the non-existent (02:30 on 2019-03-10) and ambiguous (01:30 on 2019-11-03) local times.
+  for local_datetime in [datetime.datetime(2019, 3, 10, hour, 30) for hour in range(4)] + [datetime.datetime(2019, 11, 3, hour, 30) for hour in range(4)]:
+    expected = pytz_tz.localize(local_datetime)
+    assert tz._get_offset_table().local_to_utc(local_datetime=local_datetime) == (expected - expected.utcoffset()).replace(tzinfo=None)
+
+
+def test_date_ordinal_operations_match_datetime():
+  import datetime
+  from jyotisha.util import zero_if_none
+  dates = [Date(2019, 12, 30, 23, 59, 59.5), Date(2019, 12, 31), Date(2020, 2, 28, 6, 30), Date(2020, 2, 29, 0, 0, 0.25), Date(2020, 3, 1)]
+  for date in dates:
+    dt = date.to_datetime()
+    assert date.get_weekday() == dt.isoweekday() % 7
+    for days in [-400, -1, 0, 1, 366, 1.5]:
+      assert (date + days).to_datetime() == dt + datetime.timedelta(days=days)
+    assert (date + 1).get_date_str() == (dt + datetime.timedelta(days=1)).strftime("%Y-%m-%d")
+    assert date + 1 - 1 == date and hash(date + 1 - 1) == hash(date)
+    for other in dates:
+      assert (date == other) == (dt == other.to_datetime())
+      assert (date < other) == (dt < other.to_datetime())
+  assert sorted(reversed(dates)) == dates
+  # Offsets by other units (alone) are not whole day offsets.
+  assert Date(2020, 1, 1, 10).offset_date(hours=5) == Date(2020, 1, 1, 15)
+  assert Date(2020, 1, 1, 10).offset_date(minutes=90) == Date(2020, 1, 1, 11, 30)
+  assert Date(2020, 1, 1, 10).offset_date(days=0, hours=5) == Date(2020, 1, 1, 15)
+  assert len({Date(2020, 3, 1), Date(2020, 2, 29) + 1, Date(2020, 3, 1, 0, 0, 0)}) == 1
+  # Arithmetic in the (fractional) units of the original timedelta based implementation.
+  delta = Date(2020, 3, 1, 6, 30, 0.5) - Date(2020, 2, 28, 0)
+  assert delta == 2 + 23400 / 3600.0 + 500000 / 60.0 / 1e6
+  # The cached key is not serialized.
+  assert "_ordinal_key" not in dates[0].to_json_map()
+  date = Date(2020, 2, 29, 10)
+  date.set_time_to_day_start()
+  assert date == Date(2020, 2, 29) and zero_if_none(date.hour) == 0
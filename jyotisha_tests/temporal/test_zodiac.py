@@ -3,6 +3,7 @@ from jyotisha.panchaanga.temporal import zodiac, time
 from jyotisha.panchaanga.temporal.time import Date
 from jyotisha.panchaanga.temporal.zodiac import NakshatraDivision, Ayanamsha, AngaSpanFinder
 from jyotisha.panchaanga.temporal.zodiac.angas import AngaType
+from jyotisha.util import default_if_none
 
 
 def test_get_ayanaamsha():
@@ -106,3 +107,84 @@ def test_get_previous_solstice():
   solstice = zodiac.get_previous_solstice(jd=time.ist_timezone.local_time_to_julian_day(Date(2018, 7, 14)))
   expected_jd_start = time.ist_timezone.local_time_to_julian_day(date=Date(year=2018, month=6, day=20, hour=21, minute=44))
   numpy.testing.assert_approx_equal(solstice.jd_start, expected_jd_start, significant=4)
+
+
+def test_get_anga_floats():
+  jds = numpy.arange(2444961.7125, 2444961.7125 + 10, 0.5)
+  for anga_type in [AngaType.TITHI, AngaType.NAKSHATRA, AngaType.YOGA, AngaType.KARANA, AngaType.SIDEREAL_MONTH]:
+    expected = [NakshatraDivision(jd, ayanaamsha_id=Ayanamsha.CHITRA_AT_180).get_anga_float(anga_type=anga_type) for jd in jds]
+    numpy.testing.assert_allclose(NakshatraDivision.get_anga_floats(jds=jds, anga_type=anga_type, ayanaamsha_id=Ayanamsha.CHITRA_AT_180), expected, rtol=0, atol=1e-9)
+
+
+def test_get_all_angas_in_period_chebyshev():
+  from jyotisha.panchaanga.temporal.ephemeris import ChebyshevEphemeris
+  jd1 = time.ist_timezone.local_time_to_julian_day(Date(year=2020, month=1, day=1))
+  jd2 = jd1 + 60
+  ephemeris = ChebyshevEphemeris(jd_start=jd1 - 1, jd_end=jd2 + 1, ayanaamsha_id=Ayanamsha.CHITRA_AT_180, tolerance_seconds=1)
+  for anga_type in [AngaType.TITHI, AngaType.NAKSHATRA, AngaType.YOGA, AngaType.SIDEREAL_MONTH]:
+    expected = AngaSpanFinder.get_cached(anga_type=anga_type, ayanaamsha_id=Ayanamsha.CHITRA_AT_180).get_all_angas_in_period(jd1=jd1, jd2=jd2)
+    spans = AngaSpanFinder(anga_type=anga_type, ayanaamsha_id=Ayanamsha.CHITRA_AT_180, ephemeris=ephemeris).get_all_angas_in_period(jd1=jd1, jd2=jd2)
+    assert [span.anga for span in spans] == [span.anga for span in expected]
+    numpy.testing.assert_allclose([default_if_none(span.jd_end, 0) for span in spans], [default_if_none(span.jd_end, 0) for span in expected], rtol=0, atol=1.0/86400)
+
+
+def test_get_ayanaamsha_tabulated():
+  ayanaamsha = zodiac.Ayanamsha.singleton(ayanaamsha_id=zodiac.Ayanamsha.CHITRA_AT_180_TABULATED)
+  assert abs(ayanaamsha.get_offset(2458434.083333251) - 24.094859396693067) < 0.1 / 3600
+
+
+def test_get_all_angas_in_period_newton():
+  jd1 = time.ist_timezone.local_time_to_julian_day(Date(year=2020, month=1, day=1))
+  jd2 = jd1 + 60
+  for anga_type in [AngaType.TITHI, AngaType.NAKSHATRA, AngaType.YOGA, AngaType.SIDEREAL_MONTH]:
+    expected = AngaSpanFinder.get_cached(anga_type=anga_type, ayanaamsha_id=Ayanamsha.CHITRA_AT_180).get_all_angas_in_period(jd1=jd1, jd2=jd2)
+    spans = AngaSpanFinder.get_cached(anga_type=anga_type, ayanaamsha_id=Ayanamsha.CHITRA_AT_180, solver=AngaSpanFinder.NEWTON).get_all_angas_in_period(jd1=jd1, jd2=jd2)
+    assert [span.anga for span in spans] == [span.anga for span in expected]
+    numpy.testing.assert_allclose([default_if_none(span.jd_end, 0) for span in spans], [default_if_none(span.jd_end, 0) for span in expected], rtol=0, atol=1e-8)
+  # The target anga prevailing at jd1 - its next start is sought.
+  for anga_type in [AngaType.TITHI, AngaType.NAKSHATRA]:
+    finder = AngaSpanFinder.get_cached(anga_type=anga_type, ayanaamsha_id=Ayanamsha.CHITRA_AT_180)
+    target_anga = finder._get_anga(jd=jd1)
+    expected = finder.find_anga_start_between(jd1=jd1, jd2=jd2, target_anga=target_anga)
+    assert expected is not None
+    jd_start = AngaSpanFinder.get_cached(anga_type=anga_type, ayanaamsha_id=Ayanamsha.CHITRA_AT_180, solver=AngaSpanFinder.NEWTON).find_anga_start_between(jd1=jd1, jd2=jd2, target_anga=target_anga)
+    assert abs(jd_start - expected) < 1e-8
+
+
+def test_anga_timeline():
+  from jyotisha.panchaanga.temporal.zodiac.timeline import AngaTimeline
+  jd1 = time.ist_timezone.local_time_to_julian_day(Date(year=2020, month=1, day=1))
+  timeline = AngaTimeline(jd_start=jd1 - 1, jd_end=jd1 + 10, ayanaamsha_id=Ayanamsha.CHITRA_AT_180)
+  for anga_type in [AngaType.TITHI, AngaType.NAKSHATRA, AngaType.YOGA]:
+    for day in range(9):
+      expected = AngaSpanFinder.get_cached(anga_type=anga_type, ayanaamsha_id=Ayanamsha.CHITRA_AT_180).get_all_angas_in_period(jd1=jd1 + day + 0.25, jd2=jd1 + day + 1.25)
+      spans = timeline.get_all_angas_in_period(anga_type=anga_type, jd1=jd1 + day + 0.25, jd2=jd1 + day + 1.25)
+      assert [span.anga for span in spans] == [span.anga for span in expected]
+      assert spans[0].jd_start is None and spans[-1].jd_end is None
+      numpy.testing.assert_allclose([span.jd_end for span in spans[:-1]], [span.jd_end for span in expected[:-1]], rtol=0, atol=1e-8)
+
+
+def test_get_derived_angas_in_period():
+  jd1 = time.ist_timezone.local_time_to_julian_day(Date(year=2020, month=1, day=1))
+  for anga_type in [AngaType.KARANA, AngaType.TITHI_PADA, AngaType.NAKSHATRA_PADA]:
+    span_finder = AngaSpanFinder.get_cached(anga_type=anga_type, ayanaamsha_id=Ayanamsha.CHITRA_AT_180)
+    for day in range(5):
+      spans = span_finder.get_all_angas_in_period(jd1=jd1 + day, jd2=jd1 + day + 1)
+      # Compare with a fresh scan for each boundary.
+      assert spans[0].anga == NakshatraDivision(jd1 + day, ayanaamsha_id=Ayanamsha.CHITRA_AT_180).get_anga(anga_type=anga_type)
+      for span in spans[1:]:
+        jd_start = span_finder.find_anga_start_between(jd1=jd1 + day, jd2=jd1 + day + 1, target_anga=span.anga)
+        numpy.testing.assert_allclose(span.jd_start, jd_start, rtol=0, atol=1e-8)
+
+
+def test_sky_state():
+  jd = 2444961.7125
+  sky_state = zodiac.SkyState.get_cached(jd=jd)
+  assert zodiac.SkyState.get_cached(jd=jd) is sky_state
+  hits = zodiac.SkyState.get_cached.cache_info().hits
+  for anga_type in [AngaType.TITHI, AngaType.NAKSHATRA, AngaType.YOGA, AngaType.KARANA, AngaType.SIDEREAL_MONTH]:
+    for ayanaamsha_id in [Ayanamsha.CHITRA_AT_180, Ayanamsha.ASHVINI_STARTING_0]:
+      assert NakshatraDivision(jd, ayanaamsha_id=ayanaamsha_id).get_anga_float(anga_type=anga_type) == zodiac.SkyState(jd=jd).get_anga_float(anga_type=anga_type, ayanaamsha_id=ayanaamsha_id)
+  assert zodiac.SkyState.get_cached.cache_info().hits == hits + 10
+  # Sun and moon longitudes are computed once, regardless of the number of angas derived from them.
+  assert sorted(sky_state.body_to_tropical_longitude.keys()) == ["moon", "sun"]
@@ -92,7 +92,7 @@ setup(
   # for example:
   # $ pip install -e .[dev,test]
   extras_require={
-      'test': ['pytest'],
+      'test': ['pytest', 'astropy'],
   },
 
 